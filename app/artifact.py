@@ -0,0 +1,156 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+ARTIFACT_FORMAT = 'credit-risk-logistic'
+ARTIFACT_VERSION = 1
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ArtifactError(ValueError):
+    """Artifact that cannot be exported or fails its integrity check"""
+
+
+class LogisticParams:
+    """The coef_/intercept_ part of a fitted LogisticRegression, enough to score"""
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=float).reshape(1, -1)
+        self.intercept_ = np.asarray(intercept, dtype=float).reshape(1)
+
+
+class MinMaxParams:
+    """The fitted state of a MinMaxScaler, with the same transform"""
+
+    def __init__(self, min_, scale_, data_min_, data_max_):
+        self.min_ = np.asarray(min_, dtype=float)
+        self.scale_ = np.asarray(scale_, dtype=float)
+        self.data_min_ = np.asarray(data_min_, dtype=float)
+        self.data_max_ = np.asarray(data_max_, dtype=float)
+
+    def transform(self, X):
+        return np.asarray(X, dtype=float) * self.scale_ + self.min_
+
+
+def content_hash(payload):
+    # Canonical JSON, so the hash does not depend on key order or whitespace
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+def export_artifact(model_data, path):
+    """Write model_data as versioned, pickle-free JSON; returns its content hash
+
+    Floats are written with repr precision, so a loaded artifact scores bit-identically.
+    """
+    model, scaler = model_data['model'], model_data['scaler']
+    if not hasattr(model, 'coef_') or np.asarray(model.coef_).shape[0] != 1:
+        raise ArtifactError(f"Only binary linear models can be exported, not {type(model).__name__}")
+
+    payload = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'model': type(model).__name__,
+        'features': [str(col) for col in model_data['features']],
+        'cols_to_scale': [str(col) for col in model_data['cols_to_scale']],
+        'coef': np.asarray(model.coef_, dtype=float).ravel().tolist(),
+        'intercept': np.asarray(model.intercept_, dtype=float).ravel().tolist(),
+        'scaler': {name: np.asarray(getattr(scaler, name), dtype=float).tolist()
+                   for name in ('min_', 'scale_', 'data_min_', 'data_max_')},
+    }
+    if model_data.get('reference'):
+        payload['reference'] = {name: float(value) for name, value in model_data['reference'].items()}
+    return write_payload(payload, path)
+
+
+def export_pickle_reference(model_data, path, pickle_path):
+    """Write an artifact for a model with no JSON form that points at its pickle; returns its content hash
+
+    The serving path stays the same whichever kind of model is trained. The pickle's hash is recorded,
+    so each new pickle changes the artifact and one it does not match is refused.
+    """
+    with open(pickle_path, 'rb') as f:
+        pickle_sha256 = hashlib.sha256(f.read()).hexdigest()
+    payload = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'model': type(model_data['model']).__name__,
+        'pickle': os.path.relpath(pickle_path, os.path.dirname(os.path.abspath(path))),
+        'pickle_sha256': pickle_sha256,
+    }
+    return write_payload(payload, path)
+
+
+def write_payload(payload, path):
+    payload['sha256'] = content_hash(payload)
+    # Written aside and renamed over the served file, so a reader never sees half of it
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp_path, path)
+    return payload['sha256']
+
+
+def load_pickle_reference(path, payload):
+    import joblib
+
+    pickle_path = os.path.join(os.path.dirname(os.path.abspath(path)), payload['pickle'])
+    with open(pickle_path, 'rb') as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != payload['pickle_sha256']:
+        raise ArtifactError(f"{pickle_path} does not match the pickle recorded in {path}")
+    return joblib.load(io.BytesIO(data))
+
+
+def load_artifact(path):
+    """Read an exported artifact into a model_data dict using only NumPy, verifying its hash
+
+    An artifact that only points at a pickle (a model with no JSON form) loads that pickle instead.
+    """
+    with open(path) as f:
+        payload = json.load(f)
+
+    if payload.get('format') != ARTIFACT_FORMAT:
+        raise ArtifactError(f"{path} is not a {ARTIFACT_FORMAT} artifact")
+    if payload.get('version') != ARTIFACT_VERSION:
+        raise ArtifactError(f"{path} has artifact version {payload.get('version')}, expected {ARTIFACT_VERSION}")
+    expected = payload.pop('sha256', None)
+    if content_hash(payload) != expected:
+        raise ArtifactError(f"{path} failed its integrity check")
+    if 'pickle' in payload:
+        return load_pickle_reference(path, payload)
+
+    model_data = {
+        'model': LogisticParams(payload['coef'], payload['intercept']),
+        'features': payload['features'],
+        'scaler': MinMaxParams(**payload['scaler']),
+        'cols_to_scale': payload['cols_to_scale'],
+        'sha256': expected,
+    }
+    if 'reference' in payload:
+        model_data['reference'] = payload['reference']
+    return model_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export model_data.joblib to the pickle-free JSON artifact")
+    parser.add_argument('source', nargs='?', default=os.path.join(PACKAGE_DIR, 'artifacts', 'model_data.joblib'))
+    parser.add_argument('--output', help="Defaults to the source path with a .json extension")
+    args = parser.parse_args()
+
+    import joblib
+
+    output = args.output or os.path.splitext(args.source)[0] + '.json'
+    try:
+        sha256 = export_artifact(joblib.load(args.source), output)
+    except ArtifactError as exc:
+        parser.exit(1, f"error: {exc}\n")
+    print(f"Wrote {output} (sha256 {sha256})")
+
+
+if __name__ == '__main__':
+    main()
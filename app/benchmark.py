@@ -0,0 +1,990 @@
+import argparse
+import collections
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import prediction_helper
+
+
+def check(ok, message):
+    """Exit non-zero when a benchmark's result differs from its reference"""
+    if not ok:
+        sys.exit(f"parity check failed: {message}")
+
+
+def synthetic_applicants(n_rows, seed=42):
+    """Generate random applicants covering the input ranges of the Streamlit form"""
+    rng = np.random.default_rng(seed)
+    return {
+        'age': rng.integers(18, 100, n_rows),
+        'income': rng.integers(100000, 5000000, n_rows),
+        'loan_amount': rng.integers(50000, 10000000, n_rows),
+        'loan_tenure_months': rng.integers(12, 360, n_rows),
+        'avg_dpd_per_delinquency': rng.integers(0, 30, n_rows),
+        'delinquency_ratio': rng.integers(0, 100, n_rows),
+        'credit_utilization_ratio': rng.integers(0, 100, n_rows),
+        'num_open_accounts': rng.integers(1, 5, n_rows),
+        'residence_type': rng.choice(['Owned', 'Mortgage', 'Rented'], n_rows),
+        'loan_purpose': rng.choice(['Education', 'Home', 'Personal', 'Auto'], n_rows),
+        'loan_type': rng.choice(['Secured', 'Unsecured'], n_rows),
+    }
+
+
+def bench_batch(args):
+    """Rows/sec of predict_batch compared with calling predict row by row"""
+    inputs = synthetic_applicants(args.rows)
+    prediction_helper.registry.warm_up()
+
+    start = time.perf_counter()
+    batch = prediction_helper.predict_batch(inputs)
+    batch_elapsed = time.perf_counter() - start
+
+    n_single = min(args.rows, 2000)
+    start = time.perf_counter()
+    single = [prediction_helper.predict(*[inputs[field][i] for field in prediction_helper.INPUT_FIELDS])
+              for i in range(n_single)]
+    single_elapsed = time.perf_counter() - start
+
+    print(f"predict_batch: {args.rows:,} rows in {batch_elapsed:.3f}s ({args.rows / batch_elapsed:,.0f} rows/sec)")
+    print(f"predict:       {n_single:,} rows in {single_elapsed:.3f}s ({n_single / single_elapsed:,.0f} rows/sec)")
+    for j, name in enumerate(['probability', 'score', 'rating']):
+        mismatched = sum(result[j] != value for result, value in zip(single, batch[j][:n_single]))
+        check(not mismatched, f"predict_batch {name} differs from predict on {mismatched} of {n_single} rows")
+
+
+def bench_explain(args):
+    """Overhead of returning contributions and reason codes alongside batch and single scores"""
+    inputs = synthetic_applicants(args.rows)
+    prediction_helper.registry.warm_up()
+
+    timings = {}
+    for explain in (False, True):
+        start = time.perf_counter()
+        prediction_helper.predict_batch(inputs, explain=explain)
+        timings['batch', explain] = time.perf_counter() - start
+
+        rows = [[inputs[field][i].item() for field in prediction_helper.INPUT_FIELDS] for i in range(args.single)]
+        start = time.perf_counter()
+        for row in rows:
+            prediction_helper.predict(*row, explain=explain)
+        timings['single', explain] = (time.perf_counter() - start) / args.single
+
+    print(f"predict_batch: {args.rows / timings['batch', False]:,.0f} rows/sec plain, "
+          f"{args.rows / timings['batch', True]:,.0f} rows/sec with reason codes")
+    print(f"predict:       {timings['single', False] * 1e6:.2f} us plain, "
+          f"{timings['single', True] * 1e6:.2f} us with reason codes")
+
+
+def bench_kernel(args):
+    """Single-applicant latency of the compiled kernel against the pandas/sklearn reference path"""
+    inputs = synthetic_applicants(args.rows)
+    rows = [[inputs[field][i].item() for field in prediction_helper.INPUT_FIELDS] for i in range(args.rows)]
+    prediction_helper.registry.warm_up()
+
+    start = time.perf_counter()
+    kernel_results = [prediction_helper.predict(*row) for row in rows]
+    kernel_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference_results = [prediction_helper.calculate_credit_score(prediction_helper.prepare_input(*row))
+                         for row in rows]
+    reference_elapsed = time.perf_counter() - start
+
+    max_probability_diff = max(abs(k[0] - r[0]) for k, r in zip(kernel_results, reference_results))
+    mismatches = sum(k[1:] != r[1:] for k, r in zip(kernel_results, reference_results))
+
+    print(f"compiled kernel: {kernel_elapsed / args.rows * 1e6:.1f} us/applicant")
+    print(f"reference path:  {reference_elapsed / args.rows * 1e6:.1f} us/applicant")
+    print(f"parity: max probability diff {max_probability_diff:.2e}, score/rating mismatches {mismatches}")
+    check(max_probability_diff < 1e-9 and mismatches == 0, "compiled kernel differs from the sklearn pipeline")
+
+
+COLD_START_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import prediction_helper
+imported = time.perf_counter()
+prediction_helper.predict(32, 1200000, 5000000, 36, 5, 10, 35, 2, 'Owned', 'Home', 'Secured')
+scored = time.perf_counter()
+print(imported - start, scored - imported)
+"""
+
+
+def bench_coldstart(args):
+    """Import and first-prediction time of a fresh worker process, run from outside app/"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    script = COLD_START_SCRIPT.format(app_dir=app_dir)
+
+    import_times, first_predict_times = [], []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c', script], cwd=os.path.dirname(app_dir),
+                                capture_output=True, text=True, check=True).stdout
+        import_seconds, first_predict_seconds = map(float, output.split())
+        import_times.append(import_seconds)
+        first_predict_times.append(first_predict_seconds)
+
+    print(f"import prediction_helper: {np.median(import_times) * 1000:.1f} ms (median of {args.runs})")
+    print(f"first predict (lazy load): {np.median(first_predict_times) * 1000:.1f} ms")
+    print(f"worker ready to score: {np.median(np.add(import_times, first_predict_times)) * 1000:.1f} ms")
+
+
+ARTIFACT_LOAD_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import prediction_helper
+prediction_helper.registry.load({path!r})
+print(time.perf_counter() - start)
+"""
+
+
+def bench_artifact(args):
+    """Cold load of the JSON artifact against the joblib pickle, plus scoring parity between them"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = {'joblib': prediction_helper.JOBLIB_MODEL_PATH, 'json': prediction_helper.JSON_MODEL_PATH}
+
+    for label, path in paths.items():
+        script = ARTIFACT_LOAD_SCRIPT.format(app_dir=app_dir, path=path)
+        times = [float(subprocess.run([sys.executable, '-W', 'ignore', '-c', script], capture_output=True,
+                                      text=True, check=True).stdout) for _ in range(args.runs)]
+        print(f"{label:>6}: import + load + compile {np.median(times) * 1000:7.1f} ms "
+              f"(median of {args.runs}, {os.path.getsize(path):,} bytes)")
+
+    inputs = synthetic_applicants(args.rows)
+    columns = prediction_helper.kernel_inputs(inputs)
+    registry = prediction_helper.ModelRegistry()
+    logits = {label: registry.compiled(path).logit_batch(columns) for label, path in paths.items()}
+    scores = {label: prediction_helper.scores_from_logits(x)[1] for label, x in logits.items()}
+    print(f"parity on {args.rows:,} applicants: max logit diff {np.abs(logits['json'] - logits['joblib']).max():.1e}, "
+          f"score mismatches {int((scores['json'] != scores['joblib']).sum())}")
+    check(np.abs(logits['json'] - logits['joblib']).max() < 1e-9 and np.array_equal(scores['json'], scores['joblib']),
+          "JSON artifact scores differ from the joblib pickle")
+
+
+def bench_reload(args):
+    """Hammer scoring threads while the artifact is swapped back and forth under a ModelWatcher"""
+    import shutil
+    import threading
+
+    import artifact
+    import hot_reload
+
+    columns = prediction_helper.kernel_inputs(synthetic_applicants(args.batch))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        versions = [os.path.join(tmp_dir, 'a.json'), os.path.join(tmp_dir, 'b.json')]
+        shutil.copy(prediction_helper.JSON_MODEL_PATH, versions[0])
+        shifted = artifact.load_artifact(versions[0])
+        shifted['model'].intercept_ = shifted['model'].intercept_ + 0.25
+        artifact.export_artifact(shifted, versions[1])
+
+        path = os.path.join(tmp_dir, 'model_data.json')
+        shutil.copy(versions[0], path)
+        registry = prediction_helper.ModelRegistry(path)
+        expected = [prediction_helper.ModelRegistry(v).compiled().logit_batch(columns) for v in versions]
+
+        watcher = hot_reload.ModelWatcher(registry, interval=args.poll_interval, log=open(os.devnull, 'w')).start()
+        stop = threading.Event()
+        window = 0.1
+        counts = collections.Counter()
+        torn = []
+
+        def hammer():
+            while not stop.is_set():
+                x = registry.compiled().logit_batch(columns)
+                # Every batch must come wholly from one version, never a mix
+                if not any(np.array_equal(x, e) for e in expected):
+                    torn.append(x)
+                counts[int(time.perf_counter() / window)] += len(x)
+
+        threads = [threading.Thread(target=hammer) for _ in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        swaps = 0
+        while time.perf_counter() - start < args.duration:
+            time.sleep(args.swap_every)
+            swaps += 1
+            shutil.copy(versions[swaps % 2], path + '.tmp')
+            os.replace(path + '.tmp', path)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        watcher.stop()
+
+    # Ignore the partial first and last windows
+    per_window = np.array([counts[k] for k in sorted(counts)][1:-1]) / window
+    print(f"{swaps} artifact swaps, {watcher.reloads} reloads, {watcher.rejected} rejected, "
+          f"{len(torn)} batches mixing versions")
+    print(f"throughput per {window * 1000:.0f} ms window: median {np.median(per_window):,.0f} rows/sec, "
+          f"min {per_window.min():,.0f} rows/sec")
+    check(not torn and watcher.rejected == 0, "scoring threads saw a mix of model versions or a rejected swap")
+
+
+def write_portfolio_csv(path, n_rows, seed=42):
+    """Write a synthetic portfolio file with the raw columns score_file expects"""
+    import pandas as pd
+
+    columns = synthetic_applicants(n_rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    total_loan_months = rng.integers(12, 200, n_rows)
+    delinquent_months = (total_loan_months * rng.uniform(0, 0.3, n_rows)).astype(int)
+    pd.DataFrame({
+        'cust_id': [f'C{i:08d}' for i in range(1, n_rows + 1)],
+        'age': columns['age'],
+        'income': columns['income'],
+        'loan_amount': columns['loan_amount'],
+        'loan_tenure_months': columns['loan_tenure_months'],
+        'number_of_open_accounts': columns['num_open_accounts'],
+        'credit_utilization_ratio': columns['credit_utilization_ratio'],
+        'residence_type': columns['residence_type'],
+        'loan_purpose': columns['loan_purpose'],
+        'loan_type': columns['loan_type'],
+        'total_loan_months': total_loan_months,
+        'delinquent_months': delinquent_months,
+        'total_dpd': delinquent_months * rng.integers(0, 30, n_rows),
+    }).to_csv(path, index=False)
+
+
+def bench_parallel(args):
+    """Portfolio scoring throughput of score_file at increasing worker counts"""
+    import score_file
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'portfolio.csv')
+        write_portfolio_csv(input_path, args.rows)
+
+        reference = None
+        for workers in args.workers:
+            output_path = os.path.join(tmp_dir, f'scores_{workers}.csv')
+            with open(os.devnull, 'w') as devnull:
+                start = time.perf_counter()
+                score_file.score_file([input_path], output_path, args.chunk_size, workers=workers, log=devnull)
+                elapsed = time.perf_counter() - start
+
+            with open(output_path, 'rb') as f:
+                output = f.read()
+            reference = reference or output
+            print(f"{workers} worker(s): {args.rows / elapsed:>12,.0f} rows/sec  "
+                  f"(output identical to first run: {output == reference})")
+            check(output == reference, f"{workers} workers wrote different scores than {args.workers[0]}")
+
+    print(f"CPU cores available: {os.cpu_count()}")
+
+
+def bench_store(args):
+    """Reload time of the dataset from CSV versus the memory-mapped feature store"""
+    import pandas as pd
+
+    import feature_store
+
+    tables = [table for table in feature_store.DATASET_TABLES
+              if os.path.exists(os.path.join(feature_store.DATASET_DIR, f'{table}.csv'))]
+    with tempfile.TemporaryDirectory() as store_dir:
+        start = time.perf_counter()
+        feature_store.ingest_dataset(store_dir=store_dir)
+        print(f"one-off ingestion: {time.perf_counter() - start:.3f}s")
+
+        csv_times, open_times, frame_times = [], [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            df = pd.read_csv(os.path.join(feature_store.DATASET_DIR, f'{tables[0]}.csv'))
+            for table in tables[1:]:
+                df = pd.merge(df, pd.read_csv(os.path.join(feature_store.DATASET_DIR, f'{table}.csv')), on='cust_id')
+            csv_times.append(time.perf_counter() - start)
+
+            # Fresh FeatureStore each run so nothing is cached between iterations
+            start = time.perf_counter()
+            store = feature_store.FeatureStore(store_dir)
+            columns = {f'{table}.{name}': store[table][name] for table in tables for name in store[table].columns}
+            sum(float(column[-1]) for column in columns.values() if column.dtype.kind in 'iuf')
+            open_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            store = feature_store.FeatureStore(store_dir)
+            frames = [store[table].to_frame() for table in tables]
+            pd.concat([frames[0]] + [frame.drop(columns='cust_id') for frame in frames[1:]], axis=1)
+            frame_times.append(time.perf_counter() - start)
+
+    rows = len(df)
+    print(f"pd.read_csv + merge:        {np.median(csv_times) * 1000:8.1f} ms ({rows:,} rows)")
+    print(f"store open (memory-mapped): {np.median(open_times) * 1000:8.1f} ms")
+    print(f"store to decoded DataFrame: {np.median(frame_times) * 1000:8.1f} ms")
+
+
+def bench_lookup(args):
+    """cust_id point and bulk lookup latency of the store index versus filtering a merged DataFrame"""
+    import pandas as pd
+
+    import feature_store
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        feature_store.ingest_dataset(store_dir=store_dir)
+        store = feature_store.FeatureStore(store_dir)
+        start = time.perf_counter()
+        view = store.joined()
+        print(f"index + join map build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        df = view.frame()
+        rng = np.random.default_rng(42)
+        ids = df['cust_id'].to_numpy()[rng.integers(0, len(df), args.lookups)]
+
+        start = time.perf_counter()
+        filtered = [df[df['cust_id'] == cust_id] for cust_id in ids]
+        filter_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = [view.index.lookup(cust_id) for cust_id in ids]
+        index_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = [view.get(cust_id) for cust_id in ids]
+        record_elapsed = time.perf_counter() - start
+
+        bulk_ids = df['cust_id'].to_numpy()[rng.integers(0, len(df), args.bulk)]
+        start = time.perf_counter()
+        df[df['cust_id'].isin(bulk_ids)]
+        isin_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk_frame = view.frame(bulk_ids)
+        bulk_elapsed = time.perf_counter() - start
+
+        mismatches = sum(frame.index[0] != row or record['cust_id'] != cust_id
+                         for frame, row, record, cust_id in zip(filtered, rows, records, ids))
+        mismatches += int((bulk_frame['cust_id'].to_numpy() != bulk_ids).sum())
+
+    print(f"DataFrame filter:      {filter_elapsed / args.lookups * 1e6:10.1f} us/lookup ({len(df):,} rows)")
+    print(f"index row lookup:      {index_elapsed / args.lookups * 1e6:10.1f} us/lookup")
+    print(f"joined record lookup:  {record_elapsed / args.lookups * 1e6:10.1f} us/lookup")
+    print(f"bulk {args.bulk:,} ids: isin {isin_elapsed * 1000:.1f} ms, joined frame {bulk_elapsed * 1000:.1f} ms")
+    print(f"mismatches against DataFrame filter: {mismatches}")
+    check(mismatches == 0, f"{mismatches} index lookups differ from the DataFrame filter")
+
+
+def bench_rerun(args):
+    """Server-side script time per Streamlit rerun of the advisor app, measured headlessly with AppTest"""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import script_runner
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest polls the script thread, so wall time around run() is mostly sleep; time the exec itself
+    script_times, fragment_times = [], []
+    run_script = script_runner.exec_func_with_error_handling
+
+    def timed_run_script(func, ctx):
+        start = time.perf_counter()
+        try:
+            return run_script(func, ctx)
+        finally:
+            script_times.append(time.perf_counter() - start)
+
+    # AppTest always reruns the whole page; a fragment-only rerun in the server costs the fragment's own time
+    fragment = getattr(st, 'fragment', None)
+
+    def timed_fragment(func):
+        wrapped = fragment(func)
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return wrapped(*args, **kwargs)
+            finally:
+                fragment_times.append(time.perf_counter() - start)
+        return call
+
+    script_runner.exec_func_with_error_handling = timed_run_script
+    if fragment is not None:
+        st.fragment = timed_fragment
+    try:
+        app = AppTest.from_file(args.app, default_timeout=60)
+        app.run()
+        print(f"first run (cold caches): {script_times[-1] * 1000:.1f} ms")
+
+        app.button(key='analyze_btn').click().run()
+        page_times, slider_times = [], []
+        for i in range(args.runs):
+            app.run()
+            page_times.append(script_times[-1])
+            # The income-increase slider of the scenario tab
+            app.slider[-2].set_value(i % 50 + 1).run()
+            slider_times.append(fragment_times[-1] if fragment_times else script_times[-1])
+    finally:
+        script_runner.exec_func_with_error_handling = run_script
+        if fragment is not None:
+            st.fragment = fragment
+
+    print(f"full page rerun:         {np.median(page_times) * 1000:.2f} ms (median of {args.runs})")
+    print(f"scenario slider move:    {np.median(slider_times) * 1000:.2f} ms "
+          f"({'fragment rerun' if fragment_times else 'full page rerun'})")
+
+
+def bench_scenario(args):
+    """Scenario grid build and per-slider lookup cost against re-running predict for each scenario"""
+    from scenario_engine import ScenarioGrid
+
+    base = dict(zip(prediction_helper.INPUT_FIELDS, (32, 1200000, 5000000, 36, 5, 10, 35, 2, 'Owned', 'Home', 'Secured')))
+    prediction_helper.registry.warm_up()
+
+    start = time.perf_counter()
+    grid = ScenarioGrid(base, loan_amount=np.linspace(1000000, 10000000, args.loan_steps),
+                        loan_tenure_months=np.arange(12, 361, 12))
+    build_elapsed = time.perf_counter() - start
+
+    rng = np.random.default_rng(42)
+    scenarios = [{'income_pct': int(rng.integers(0, 51)), 'credit_utilization_ratio': int(rng.integers(0, 101)),
+                  'loan_amount': float(rng.choice(grid.axes['loan_amount'])),
+                  'loan_tenure_months': float(rng.choice(grid.axes['loan_tenure_months']))}
+                 for _ in range(args.lookups)]
+
+    start = time.perf_counter()
+    grid_scores = [grid.score(**scenario) for scenario in scenarios]
+    lookup_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predict_scores = []
+    for scenario in scenarios:
+        applicant = dict(base, income=base['income'] * (1 + scenario['income_pct'] / 100),
+                         credit_utilization_ratio=scenario['credit_utilization_ratio'],
+                         loan_amount=scenario['loan_amount'], loan_tenure_months=scenario['loan_tenure_months'])
+        predict_scores.append(prediction_helper.predict(**applicant)[1])
+    predict_elapsed = time.perf_counter() - start
+
+    print(f"grid of {grid.scores.size:,} scenarios scored in {build_elapsed * 1000:.1f} ms")
+    print(f"grid lookup: {lookup_elapsed / args.lookups * 1e6:.1f} us/scenario")
+    print(f"predict:     {predict_elapsed / args.lookups * 1e6:.1f} us/scenario")
+    mismatches = sum(g != p for g, p in zip(grid_scores, predict_scores))
+    print(f"score mismatches: {mismatches}")
+    check(mismatches == 0, f"{mismatches} grid scores differ from predict")
+
+
+def bench_tables(args):
+    """Precomputed float32 lookup tables against direct computation, single-row and batch"""
+    inputs = synthetic_applicants(args.rows)
+    compiled = prediction_helper.registry.compiled()
+    columns = prediction_helper.kernel_inputs(inputs)
+
+    start = time.perf_counter()
+    tables = prediction_helper.LookupTables(compiled)
+    print(f"tables built in {(time.perf_counter() - start) * 1000:.2f} ms, {tables.nbytes:,} bytes")
+
+    n_single = min(args.rows, 20000)
+    rows = [{name: columns[name][i].item() for name in columns} for i in range(n_single)]
+    for label, kernel in (('direct', compiled), ('tables', tables)):
+        start = time.perf_counter()
+        for row in rows:
+            kernel.logit(row)
+        single_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kernel.logit_batch(columns)
+        batch_elapsed = time.perf_counter() - start
+        print(f"{label}: {single_elapsed / n_single * 1e6:.2f} us/applicant, "
+              f"batch {args.rows / batch_elapsed:,.0f} rows/sec")
+
+    direct = prediction_helper.scores_from_logits(compiled.logit_batch(columns))
+    tabled = prediction_helper.scores_from_logits(tables.logit_batch(columns))
+    print(f"parity: max probability diff {np.abs(direct[0] - tabled[0]).max():.2e}, "
+          f"score mismatches {int((direct[1] != tabled[1]).sum())} of {args.rows:,}")
+    # float32 weights may move a probability sitting on a score boundary across it, never further
+    check(np.abs(direct[0] - tabled[0]).max() < 1e-5 and np.abs(direct[1] - tabled[1]).max() <= 1,
+          "lookup tables differ from direct computation by more than float32 rounding")
+
+
+def bench_shadow(args):
+    """Latency shadow scoring adds per batch, with a linear and a random forest challenger"""
+    import joblib
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    import artifact
+    import shadow
+
+    registry = prediction_helper.ModelRegistry()
+    champion = registry.model_data()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Challengers share the champion's features and scaler, like the notebook's model variants
+        shifted = artifact.load_artifact(prediction_helper.JSON_MODEL_PATH)
+        shifted['model'].intercept_ = shifted['model'].intercept_ + 0.25
+        artifact.export_artifact(shifted, os.path.join(tmp_dir, 'logistic.json'))
+
+        train = prediction_helper.kernel_inputs(synthetic_applicants(20000, seed=7))
+        X = pd.DataFrame(prediction_helper.EstimatorModel(champion).feature_matrix(train),
+                         columns=list(champion['features']))
+        y = prediction_helper.scores_from_logits(registry.compiled().logit_batch(train))[0] > 0.5
+        forest = RandomForestClassifier(n_estimators=args.trees, max_depth=8, n_jobs=1, random_state=0).fit(X, y)
+        joblib.dump(dict(champion, model=forest), os.path.join(tmp_dir, 'forest.joblib'))
+
+        registry.register('logistic', os.path.join(tmp_dir, 'logistic.json'))
+        registry.register('forest', os.path.join(tmp_dir, 'forest.joblib'))
+        for name in ('logistic', 'forest'):
+            registry.load(name)
+
+        log = shadow.ShadowLog(os.path.join(tmp_dir, 'shadow.jsonl'), maxsize=args.batches)
+        setups = [('champion only', shadow.ShadowScorer(model_registry=registry)),
+                  ('+ logistic', shadow.ShadowScorer(challengers=['logistic'], log=log, model_registry=registry)),
+                  ('+ logistic, forest', shadow.ShadowScorer(challengers=['logistic', 'forest'], log=log,
+                                                             model_registry=registry)),
+                  (f'+ both, {args.budget_ms} ms budget',
+                   shadow.ShadowScorer(challengers=['logistic', 'forest'], log=log, budget_ms=args.budget_ms,
+                                       model_registry=registry))]
+        for batch_size in args.batch_sizes:
+            inputs = synthetic_applicants(batch_size)
+            expected = setups[0][1].predict_batch(inputs)
+            for label, scorer in setups:
+                times = []
+                for _ in range(args.batches):
+                    start = time.perf_counter()
+                    results = scorer.predict_batch(inputs)
+                    times.append(time.perf_counter() - start)
+                check(all(np.array_equal(a, b) for a, b in zip(results, expected)),
+                      f"{label} changed the champion's results at batch size {batch_size}")
+                times = np.array(times) * 1000
+                print(f"batch {batch_size:>5} {label:<28} p50 {np.percentile(times, 50):7.3f} ms  "
+                      f"p99 {np.percentile(times, 99):7.3f} ms  mean {times.mean():7.3f} ms"
+                      + (f"  (shadowed 1 in {scorer.sample_every})" if scorer.budget_ms else ''))
+        log.close()
+        print(f"logged {log.written:,} challenger comparisons, dropped {log.dropped} batches")
+
+
+def bench_woe(args):
+    """Vectorized WOE/IV against the notebook's per-feature pd.cut/groupby loop, with parity"""
+    import pandas as pd
+
+    from train import woe
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({f'num_{j}': rng.normal(size=args.rows) * (j + 1) for j in range(args.numeric)})
+    for j in range(args.categorical):
+        X[f'cat_{j}'] = rng.choice([f'level_{k}' for k in range(3 + j)], args.rows).astype(object)
+    y = pd.Series((rng.random(args.rows) < 1 / (1 + np.exp(-X['num_0'] / 2))).astype(int), name='default')
+
+    start = time.perf_counter()
+    reference = {}
+    for feature in X.columns:
+        # As in the notebook: the whole frame is concatenated with the target for every feature
+        if not pd.api.types.is_numeric_dtype(X[feature]):
+            _, reference[feature] = woe.calculate_woe_iv(pd.concat([X, y], axis=1), feature, 'default')
+        else:
+            X_binned = pd.cut(X[feature], bins=args.bins, labels=False)
+            _, reference[feature] = woe.calculate_woe_iv(pd.concat([X_binned, y], axis=1), feature, 'default')
+    loop_elapsed = time.perf_counter() - start
+    print(f"notebook loop: {loop_elapsed:.2f}s for {X.shape[1]} features x {args.rows:,} rows")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        iv_values = woe.information_values(X, y, bins=args.bins, workers=workers)
+        elapsed = time.perf_counter() - start
+        diff = max(abs(iv_values[feature] - reference[feature]) for feature in X.columns)
+        print(f"vectorized, {workers} workers: {elapsed:.2f}s ({loop_elapsed / elapsed:.1f}x), max IV diff {diff:.1e}")
+        check(diff < 1e-9, f"vectorized IVs differ from the notebook loop by up to {diff:.1e}")
+
+
+def bench_vif(args):
+    """All-at-once and incremental VIF against statsmodels' one regression per column"""
+    import pandas as pd
+
+    from train import vif
+
+    # Columns mixing a few shared factors, so some of them are strongly collinear
+    rng = np.random.default_rng(42)
+    factors = rng.normal(size=(args.rows, args.factors))
+    values = factors @ rng.normal(size=(args.factors, args.features))
+    values += rng.normal(size=values.shape) * rng.uniform(0.05, 3, args.features)
+    X = pd.DataFrame(values, columns=[f'x{j}' for j in range(args.features)], copy=False)
+
+    start = time.perf_counter()
+    all_vif = vif.variance_inflation(X)
+    elapsed = time.perf_counter() - start
+    print(f"all {args.features} VIFs from the inverse correlation matrix: {elapsed:.2f}s "
+          f"({args.rows:,} rows)")
+
+    try:
+        from statsmodels.stats.outliers_influence import variance_inflation_factor
+    except ImportError:
+        print("statsmodels: not installed (pip install -r ../requirements-train.txt), comparison skipped")
+    else:
+        # statsmodels copies the matrix several times, so it is timed on a row sample and scaled up
+        sample = values[:args.reference_rows]
+        start = time.perf_counter()
+        reference = [variance_inflation_factor(sample, j) for j in range(args.reference_columns)]
+        per_column = (time.perf_counter() - start) / args.reference_columns * args.rows / len(sample)
+        sample_vif = vif.variance_inflation(X.iloc[:args.reference_rows]).iloc[:args.reference_columns]
+        reference_diff = np.max(np.abs(sample_vif / reference - 1))
+        print(f"statsmodels: ~{per_column:.2f}s per column, ~{per_column * args.features:.0f}s for all "
+              f"{args.features} (timed on {args.reference_columns} columns of {len(sample):,} rows); "
+              f"max relative diff {reference_diff:.1e}")
+        check(reference_diff < 1e-6, "VIFs differ from statsmodels")
+
+    start = time.perf_counter()
+    correlation, varying = vif.correlation_matrix(X)
+    correlation_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    kept, dropped = vif.eliminate(correlation, X.columns[varying], args.threshold)
+    incremental = time.perf_counter() - start
+
+    # The same elimination with the inverse recomputed after every drop
+    start = time.perf_counter()
+    remaining = list(range(args.features))
+    while True:
+        current = np.diag(np.linalg.inv(correlation[np.ix_(remaining, remaining)]))
+        if current.max() <= args.threshold:
+            break
+        remaining.pop(int(current.argmax()))
+    recomputed = time.perf_counter() - start
+    same_columns = list(kept.index) == [f'x{j}' for j in remaining]
+    vif_diff = np.max(np.abs(kept.to_numpy() / current - 1)) if same_columns else np.inf
+    print(f"drop above VIF {args.threshold:g}: {len(dropped)} dropped, {len(kept)} kept; eliminations take "
+          f"{incremental:.3f}s downdating the inverse, {recomputed:.3f}s re-inverting after every drop "
+          f"(plus {correlation_elapsed:.2f}s for the correlation matrix)")
+    print(f"same columns kept: {same_columns}, max relative VIF diff {vif_diff:.1e}")
+    check(same_columns and vif_diff < 1e-6, "downdated elimination differs from re-inverting after every drop")
+
+
+def bench_tune(args):
+    """Pruned, parallel, resumable tuning harness against the notebook's serial Optuna loop"""
+    try:
+        import optuna
+    except ImportError:
+        # Both sides of the comparison run Optuna studies, so there is nothing to time without it
+        sys.exit("optuna is not installed (pip install -r ../requirements-train.txt); tune benchmark skipped")
+    from sklearn.datasets import make_classification
+    from sklearn.metrics import f1_score, make_scorer
+    from sklearn.model_selection import cross_val_score
+
+    from train import tuning
+
+    X, y = make_classification(n_samples=args.rows, n_features=args.features, n_informative=6, random_state=42)
+
+    # As in the notebook: an in-memory study, every trial cross-validated to the end
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    f1_scorer = make_scorer(f1_score, average='macro')
+    start = time.perf_counter()
+    study = optuna.create_study(direction='maximize', sampler=optuna.samplers.TPESampler(seed=42))
+    study.optimize(lambda trial: np.mean(cross_val_score(tuning.build_estimator('logistic', tuning.logistic_params(trial),
+                                                                                search=True),
+                                                         X, y, cv=3, scoring=f1_scorer)), n_trials=args.trials)
+    serial = time.perf_counter() - start
+    print(f"notebook loop: {args.trials} trials in {serial:.1f}s, best macro F1 {study.best_value:.4f}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for workers in args.workers:
+            storage = os.path.join(tmp_dir, f'study-{workers}.db')
+            start = time.perf_counter()
+            result = tuning.tune(X, y, n_trials=args.trials, workers=workers, storage=storage, directory=tmp_dir)
+            elapsed = time.perf_counter() - start
+            print(f"harness, {workers} workers: {elapsed:.1f}s ({serial / elapsed:.1f}x), best macro F1 "
+                  f"{result['f1_macro']:.4f}, {result['pruned']} of {args.trials} trials pruned")
+
+        start = time.perf_counter()
+        tuning.tune(X, y, n_trials=args.trials, workers=1, storage=storage, directory=tmp_dir)
+        print(f"resuming the finished study: {time.perf_counter() - start:.2f}s")
+
+
+def bench_rebalance(args):
+    """Wall time, peak memory and test KS/AUC of each rebalancing method against SMOTETomek"""
+    import tracemalloc
+
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import roc_auc_score, roc_curve
+
+    import train
+    from train import rebalance
+
+    # The pipeline's own cached encode stage, i.e. the notebook's data right before SMOTETomek
+    pipeline = train.build_pipeline(args.dataset or train.DATASET_DIR, args.cache or train.CACHE_DIR,
+                                    log=open(os.devnull, 'w'))
+    encoded, scaled = pipeline.run('encode'), pipeline.run('scale')
+    X, y = encoded['X_train'], scaled['y_train']
+    if args.scale > 1:
+        # Larger training sets: jittered copies of the real rows
+        rng = np.random.default_rng(42)
+        numeric = X.select_dtypes('number').columns
+        copies = []
+        for _ in range(args.scale):
+            copy = X.copy()
+            copy[numeric] += rng.normal(scale=0.01, size=(len(X), len(numeric)))
+            copies.append(copy)
+        X, y = pd.concat(copies, ignore_index=True), pd.concat([y] * args.scale, ignore_index=True)
+    print(f"{len(X):,} training rows, {X.shape[1]} features, event rate {y.mean():.3f}")
+
+    for method in args.methods:
+        tracemalloc.start()
+        start = time.perf_counter()
+        X_res, y_res, balanced = rebalance.rebalance(X, y, method)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        model = LogisticRegression(max_iter=1000, class_weight='balanced' if balanced else None).fit(X_res, y_res)
+        probabilities = model.predict_proba(encoded['X_test'])[:, 1]
+        fpr, tpr, _ = roc_curve(scaled['y_test'], probabilities)
+        print(f"{method:<12} {elapsed:7.2f}s  peak {peak / 2 ** 20:7.1f} MiB  {len(X_res):>9,} rows  "
+              f"AUC {roc_auc_score(scaled['y_test'], probabilities):.4f}  KS {np.max(tpr - fpr) * 100:.2f}")
+
+
+def bench_stream(args):
+    """Peak memory and time of out-of-core training from the store against the in-memory stages"""
+    import tracemalloc
+
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import roc_auc_score
+
+    from feature_store import STORE_DIR, FeatureStore
+    from train import stages, streaming
+
+    store_dir = args.store or STORE_DIR
+
+    def in_memory():
+        # The same rows and split as the streaming trainer, through the pipeline's stage functions
+        df = FeatureStore(store_dir).joined().frame()
+        df['default'] = df['default'].astype(int)
+        test = streaming.holdout_mask(np.arange(len(df)))
+        scaled = stages.scale(stages.derive(stages.clean((df[~test], df[test]))))
+        encoded = stages.encode(stages.woe_iv(stages.vif(scaled), scaled), scaled)
+        model = LogisticRegression(class_weight='balanced', max_iter=1000).fit(encoded['X_train'], scaled['y_train'])
+        auc = roc_auc_score(scaled['y_test'], model.decision_function(encoded['X_test']))
+        return model.coef_, {'rows': len(encoded['X_train']), 'auc': auc}
+
+    def out_of_core(solver):
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = streaming.train_streaming(store_dir, os.path.join(output_dir, 'model_data.joblib'),
+                                               solver=solver, chunk_size=args.chunk_size, epochs=args.epochs, log=None)
+            return joblib.load(result['joblib'])['model'].coef_, result
+
+    reference = None
+    for name, run in (('in-memory', in_memory), ('lbfgs', lambda: out_of_core('lbfgs')),
+                      ('sgd', lambda: out_of_core('sgd'))):
+        tracemalloc.start()
+        start = time.perf_counter()
+        coef, result = run()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        reference = coef if reference is None else reference
+        print(f"{name:<10} {elapsed:7.2f}s  peak {peak / 2 ** 20:7.1f} MiB  {result['rows']:>9,} rows  "
+              f"AUC {result['auc']:.4f}  max |coef diff| {np.abs(coef - reference).max():.2e}")
+        # L-BFGS minimizes the same objective as the in-memory fit; SGD only approximates it
+        if name == 'lbfgs':
+            check(np.abs(coef - reference).max() < 1e-4,
+                  "out-of-core L-BFGS coefficients differ from the in-memory fit")
+
+
+def bench_report(args):
+    """Notebook's qcut/groupby-apply decile table plus roc_curve against evaluation.evaluate"""
+    import pandas as pd
+    from sklearn.metrics import auc, roc_curve
+
+    import evaluation
+
+    rng = np.random.default_rng(42)
+    probabilities = rng.beta(1, 5, args.rows)
+    labels = (rng.random(args.rows) < probabilities).astype(np.int8)
+
+    def notebook():
+        fpr, tpr, _ = roc_curve(labels, probabilities)
+        area = auc(fpr, tpr)
+        df_eval = pd.DataFrame({'Default Truth': labels, 'Default Probability': probabilities})
+        df_eval['Decile'] = pd.qcut(df_eval['Default Probability'], 10, labels=False, duplicates='drop')
+        df_decile = df_eval.groupby('Decile').apply(lambda x: pd.Series({
+            'Minimum Probability': x['Default Probability'].min(),
+            'Maximum Probability': x['Default Probability'].max(),
+            'Events': x['Default Truth'].sum(),
+            'Non-events': x['Default Truth'].count() - x['Default Truth'].sum(),
+        }), include_groups=False).reset_index()
+        df_decile = df_decile.sort_values(by='Decile', ascending=False).reset_index(drop=True)
+        df_decile['Cum Event Rate'] = df_decile['Events'].cumsum() * 100 / df_decile['Events'].sum()
+        df_decile['Cum Non-event Rate'] = df_decile['Non-events'].cumsum() * 100 / df_decile['Non-events'].sum()
+        return area, (df_decile['Cum Event Rate'] - df_decile['Cum Non-event Rate']).abs().max()
+
+    timings, metrics = {}, {}
+    for name, run in (('notebook', notebook), ('evaluate', lambda: evaluation.evaluate(probabilities, labels))):
+        start = time.perf_counter()
+        result = run()
+        timings[name] = time.perf_counter() - start
+        metrics[name] = result if name == 'notebook' else (result['auc'], result['ks_decile'])
+        print(f"{name:<9} {timings[name]:7.2f}s  AUC {metrics[name][0]:.6f}  decile KS {metrics[name][1]:.4f}")
+    print(f"{args.rows:,} rows: {timings['notebook'] / timings['evaluate']:.1f}x faster")
+    check(np.allclose(metrics['evaluate'], metrics['notebook'], rtol=1e-9, atol=0),
+          "AUC or decile KS differs from the notebook's")
+
+
+def bench_drift(args):
+    """Cost of the PSI/CSI drift monitor on predict_batch and predict, against scoring without it"""
+    import drift
+
+    inputs = synthetic_applicants(args.rows)
+    rows = [[inputs[field][i].item() for field in prediction_helper.INPUT_FIELDS] for i in range(args.single)]
+    prediction_helper.registry.warm_up()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        portfolio = os.path.join(tmp_dir, 'portfolio.csv')
+        write_portfolio_csv(portfolio, args.baseline_rows, seed=7)
+        baseline = drift.build_baseline([portfolio])
+
+    timings, results = {}, {}
+    for monitored in (False, True):
+        monitor = drift.install(drift.DriftMonitor(baseline, interval=3600, stream=open(os.devnull, 'w'))) \
+            if monitored else None
+        try:
+            start = time.perf_counter()
+            results[monitored] = prediction_helper.predict_batch(inputs)
+            timings['batch', monitored] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for row in rows:
+                prediction_helper.predict(*row)
+            timings['single', monitored] = (time.perf_counter() - start) / args.single
+        finally:
+            drift.disable()
+        if monitor is not None:
+            counted = monitor.snapshot()['total']['rows']
+            check(counted == args.rows + args.single,
+                  f"monitor counted {counted:,} applicants, {args.rows + args.single:,} were scored")
+    check(all(np.array_equal(a, b) for a, b in zip(results[False], results[True])),
+          "predict_batch results change with the drift monitor enabled")
+
+    print(f"predict_batch: {args.rows / timings['batch', False]:,.0f} rows/sec plain, "
+          f"{args.rows / timings['batch', True]:,.0f} rows/sec monitored")
+    print(f"predict:       {timings['single', False] * 1e6:.2f} us plain, "
+          f"{timings['single', True] * 1e6:.2f} us monitored")
+    check(timings['batch', True] <= args.max_batch_overhead * timings['batch', False],
+          f"monitored predict_batch takes over {args.max_batch_overhead:g}x the plain time")
+    check(timings['single', True] - timings['single', False] <= args.max_single_overhead * 1e-6,
+          f"the monitor adds over {args.max_single_overhead:g} us to predict")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring performance benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    batch = subparsers.add_parser('batch', help=bench_batch.__doc__)
+    batch.add_argument('--rows', type=int, default=1000000)
+    batch.set_defaults(func=bench_batch)
+
+    explain = subparsers.add_parser('explain', help=bench_explain.__doc__)
+    explain.add_argument('--rows', type=int, default=1000000)
+    explain.add_argument('--single', type=int, default=20000)
+    explain.set_defaults(func=bench_explain)
+
+    kernel = subparsers.add_parser('kernel', help=bench_kernel.__doc__)
+    kernel.add_argument('--rows', type=int, default=2000)
+    kernel.set_defaults(func=bench_kernel)
+
+    coldstart = subparsers.add_parser('coldstart', help=bench_coldstart.__doc__)
+    coldstart.add_argument('--runs', type=int, default=5)
+    coldstart.set_defaults(func=bench_coldstart)
+
+    artifact = subparsers.add_parser('artifact', help=bench_artifact.__doc__)
+    artifact.add_argument('--runs', type=int, default=5)
+    artifact.add_argument('--rows', type=int, default=1000000)
+    artifact.set_defaults(func=bench_artifact)
+
+    reload = subparsers.add_parser('reload', help=bench_reload.__doc__)
+    reload.add_argument('--duration', type=float, default=10.0)
+    reload.add_argument('--threads', type=int, default=4)
+    reload.add_argument('--batch', type=int, default=1000)
+    reload.add_argument('--swap-every', type=float, default=0.5)
+    reload.add_argument('--poll-interval', type=float, default=0.05)
+    reload.set_defaults(func=bench_reload)
+
+    parallel = subparsers.add_parser('parallel', help=bench_parallel.__doc__)
+    parallel.add_argument('--rows', type=int, default=2000000)
+    parallel.add_argument('--chunk-size', type=int, default=100000)
+    parallel.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parallel.set_defaults(func=bench_parallel)
+
+    store = subparsers.add_parser('store', help=bench_store.__doc__)
+    store.add_argument('--runs', type=int, default=5)
+    store.set_defaults(func=bench_store)
+
+    lookup = subparsers.add_parser('lookup', help=bench_lookup.__doc__)
+    lookup.add_argument('--lookups', type=int, default=2000)
+    lookup.add_argument('--bulk', type=int, default=10000)
+    lookup.set_defaults(func=bench_lookup)
+
+    scenario = subparsers.add_parser('scenario', help=bench_scenario.__doc__)
+    scenario.add_argument('--loan-steps', type=int, default=10)
+    scenario.add_argument('--lookups', type=int, default=10000)
+    scenario.set_defaults(func=bench_scenario)
+
+    tables = subparsers.add_parser('tables', help=bench_tables.__doc__)
+    tables.add_argument('--rows', type=int, default=1000000)
+    tables.set_defaults(func=bench_tables)
+
+    shadow = subparsers.add_parser('shadow', help=bench_shadow.__doc__)
+    shadow.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 512])
+    shadow.add_argument('--batches', type=int, default=500)
+    shadow.add_argument('--trees', type=int, default=100)
+    shadow.add_argument('--budget-ms', type=float, default=1.0)
+    shadow.set_defaults(func=bench_shadow)
+
+    woe = subparsers.add_parser('woe', help=bench_woe.__doc__)
+    woe.add_argument('--rows', type=int, default=1000000)
+    woe.add_argument('--numeric', type=int, default=30)
+    woe.add_argument('--categorical', type=int, default=10)
+    woe.add_argument('--bins', type=int, default=10)
+    woe.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    woe.set_defaults(func=bench_woe)
+
+    vif = subparsers.add_parser('vif', help=bench_vif.__doc__)
+    vif.add_argument('--rows', type=int, default=1000000)
+    vif.add_argument('--features', type=int, default=200)
+    vif.add_argument('--factors', type=int, default=20)
+    vif.add_argument('--threshold', type=float, default=10.0)
+    vif.add_argument('--reference-columns', type=int, default=2)
+    vif.add_argument('--reference-rows', type=int, default=200000)
+    vif.set_defaults(func=bench_vif)
+
+    tune = subparsers.add_parser('tune', help=bench_tune.__doc__)
+    tune.add_argument('--rows', type=int, default=200000)
+    tune.add_argument('--features', type=int, default=12)
+    tune.add_argument('--trials', type=int, default=30)
+    tune.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}))
+    tune.set_defaults(func=bench_tune)
+
+    rebalance = subparsers.add_parser('rebalance', help=bench_rebalance.__doc__)
+    rebalance.add_argument('--dataset', help="Dataset directory for the training pipeline (default dataset/)")
+    rebalance.add_argument('--cache', help="Pipeline cache directory (default dataset/train_cache/)")
+    rebalance.add_argument('--scale', type=int, default=1, help="Train on this many jittered copies of the data")
+    rebalance.add_argument('--methods', nargs='+', default=['smote_tomek', 'smote', 'undersample', 'weight'])
+    rebalance.set_defaults(func=bench_rebalance)
+
+    stream = subparsers.add_parser('stream', help=bench_stream.__doc__)
+    stream.add_argument('--store', help="Feature store to train from (default dataset/store)")
+    stream.add_argument('--chunk-size', type=int, default=200000)
+    stream.add_argument('--epochs', type=int, default=5, help="SGD passes over the training rows")
+    stream.set_defaults(func=bench_stream)
+
+    report = subparsers.add_parser('report', help=bench_report.__doc__)
+    report.add_argument('--rows', type=int, default=5000000)
+    report.set_defaults(func=bench_report)
+
+    drift = subparsers.add_parser('drift', help=bench_drift.__doc__)
+    drift.add_argument('--rows', type=int, default=1000000)
+    drift.add_argument('--single', type=int, default=20000)
+    drift.add_argument('--baseline-rows', type=int, default=100000)
+    drift.add_argument('--max-batch-overhead', type=float, default=2.5,
+                       help="Largest allowed ratio of monitored to plain predict_batch time")
+    drift.add_argument('--max-single-overhead', type=float, default=5.0,
+                       help="Largest allowed microseconds the monitor adds to one predict call")
+    drift.set_defaults(func=bench_drift)
+
+    rerun = subparsers.add_parser('rerun', help=bench_rerun.__doc__)
+    rerun.add_argument('--app', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py'),
+                       help="Streamlit script to measure, e.g. an older checkout of main.py")
+    rerun.add_argument('--runs', type=int, default=20)
+    rerun.set_defaults(func=bench_rerun)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+import prediction_helper
+from hot_reload import file_sha256
+from prediction_helper import INPUT_FIELDS, registry, scorer, scores_from_logits
+
+BASELINE_FORMAT = 'credit-risk-drift-baseline'
+BASELINE_VERSION = 1
+
+# Inputs tracked for CSI: the ones the model reads. income and loan_amount only reach it through
+# loan_to_income, so binning them as well would only add cost
+DRIFT_INPUTS = [name for name in INPUT_FIELDS if name not in ('income', 'loan_amount')] + ['loan_to_income']
+CATEGORICAL_INPUTS = ['residence_type', 'loan_purpose', 'loan_type']
+
+# Quantile bins per numeric feature in the baseline
+DRIFT_BINS = 10
+
+# Rows sampled uniformly from the baseline data to place the quantile bin edges
+SAMPLE_ROWS = 200000
+
+# Bin shares are floored at this before taking logs, so an empty bin gives a large but finite PSI
+PSI_FLOOR = 1e-4
+
+# Usual PSI reading: below 0.1 stable, up to 0.25 a moderate shift, above that significant
+PSI_LEVELS = ((0.25, 'significant'), (0.1, 'moderate'))
+
+# Single applicants passed to add() are buffered and binned together once this many are pending
+PENDING_ROWS = 1024
+
+# Integer columns spanning at most this many values are counted per value, then the values per bin
+DENSE_RANGE = 1 << 16
+
+
+def baseline_path(model_path=None):
+    """Where the drift baseline of a model artifact lives: next to it, as <name>.drift.json"""
+    return os.path.splitext(registry.resolve(model_path) if model_path else registry.default_path)[0] + '.drift.json'
+
+
+def drift_columns(columns, credit_scores):
+    # The monitored columns out of kernel_inputs-style columns and the credit scores
+    monitored = {name: np.asarray(columns[name]) for name in DRIFT_INPUTS}
+    monitored['credit_score'] = np.asarray(credit_scores)
+    return monitored
+
+
+def psi(expected, actual, floor=PSI_FLOOR):
+    """Population stability index of two histograms over the same bins: sum of (a - e) * ln(a / e)"""
+    expected = np.maximum(np.asarray(expected, dtype=float) / max(np.sum(expected), 1), floor)
+    actual = np.maximum(np.asarray(actual, dtype=float) / max(np.sum(actual), 1), floor)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def psi_level(value):
+    for threshold, level in PSI_LEVELS:
+        if value > threshold:
+            return level
+    return 'stable'
+
+
+def _file_columns(inputs, chunk_size, defaults, compiled):
+    # Monitored columns of each chunk of row-aligned input files, scored with compiled
+    from score_file import derive_features, joined_chunks
+
+    for df in joined_chunks(inputs, chunk_size):
+        columns = derive_features(df, defaults)
+        columns['income'] = df['income'].to_numpy()
+        columns['loan_amount'] = df['loan_amount'].to_numpy()
+        yield drift_columns(columns, scores_from_logits(scorer(compiled).logit_batch(columns))[1])
+
+
+def build_baseline(inputs, model_path=None, bins=DRIFT_BINS, chunk_size=100000, defaults=None,
+                   sample_rows=SAMPLE_ROWS, seed=42):
+    """Baseline histograms of every monitored column over the rows of the input files
+
+    Two streaming passes: the first keeps a uniform sample of sample_rows rows (the rows with the
+    smallest random keys) to place quantile bin edges and collects the category labels; the second
+    counts every row into those bins.
+    """
+    compiled = registry.compiled(model_path)
+    rng = np.random.default_rng(seed)
+    numeric = [name for name in DRIFT_INPUTS + ['credit_score'] if name not in CATEGORICAL_INPUTS]
+    keys, sample = np.empty(0), {name: np.empty(0) for name in numeric}
+    levels = {name: set() for name in CATEGORICAL_INPUTS}
+    for columns in _file_columns(inputs, chunk_size, defaults, compiled):
+        keys = np.concatenate([keys, rng.random(len(columns['age']))])
+        sample = {name: np.concatenate([sample[name], columns[name].astype(float)]) for name in numeric}
+        if len(keys) > sample_rows:
+            keep = np.argpartition(keys, sample_rows)[:sample_rows]
+            keys, sample = keys[keep], {name: values[keep] for name, values in sample.items()}
+        for name in CATEGORICAL_INPUTS:
+            levels[name].update(str(label) for label in np.unique(columns[name].astype(str)))
+
+    features = {}
+    for name in DRIFT_INPUTS + ['credit_score']:
+        if name in CATEGORICAL_INPUTS:
+            features[name] = {'kind': 'categorical', 'levels': sorted(levels[name])}
+        else:
+            values = sample[name][~np.isnan(sample[name])]
+            interior = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]) if len(values) else np.empty(0)
+            features[name] = {'kind': 'numeric', 'edges': np.unique(interior).tolist()}
+    monitor = DriftMonitor({'features': features})
+    for columns in _file_columns(inputs, chunk_size, defaults, compiled):
+        monitor.update_columns(columns)
+    for name, counts in monitor.counts(monitor.total).items():
+        features[name]['counts'] = counts.tolist()
+    path = registry.resolve(model_path) if model_path else registry.default_path
+    return {'format': BASELINE_FORMAT, 'version': BASELINE_VERSION, 'model': os.path.basename(path),
+            'model_sha256': file_sha256(path), 'rows': monitor.rows, 'features': features}
+
+
+def write_baseline(baseline, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(baseline, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get('format') != BASELINE_FORMAT:
+        raise ValueError(f"{path} is not a drift baseline")
+    if baseline.get('version', 0) > BASELINE_VERSION:
+        raise ValueError(f"{path} has baseline version {baseline['version']}, newer than {BASELINE_VERSION}")
+    return baseline
+
+
+class BaselineBins:
+    """Bin layout of a baseline: every monitored column's bins in one index space, by per-column offsets
+
+    Numbers get the baseline's quantile bins with open ends, categories one bin per baseline label
+    plus one for unseen labels. Columns a baseline has but DRIFT_INPUTS no longer lists are ignored.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        monitored = set(DRIFT_INPUTS + ['credit_score'])
+        self.names = [name for name in baseline['features'] if name in monitored]
+        self.edges, self.levels, sizes = {}, {}, []
+        for name in self.names:
+            feature = baseline['features'][name]
+            if feature['kind'] == 'categorical':
+                self.levels[name] = np.asarray(feature['levels'], dtype=str)
+                sizes.append(len(feature['levels']) + 1)
+            else:
+                self.edges[name] = np.asarray(feature['edges'], dtype=float)
+                sizes.append(len(feature['edges']) + 1)
+        self.offsets = dict(zip(self.names, np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int).tolist()))
+        self.sizes = dict(zip(self.names, sizes))
+        self.n_bins = int(np.sum(sizes))
+
+    def bincount(self, monitored, n_rows):
+        """Counts per bin of n_rows rows of monitored columns, one np.bincount per column"""
+        counts = np.empty(self.n_bins, dtype=np.int64)
+        for name in self.names:
+            offset = self.offsets[name]
+            counts[offset:offset + self.sizes[name]] = self._column_counts(name, np.asarray(monitored[name]))
+        return counts
+
+    def _column_counts(self, name, values):
+        size = self.sizes[name]
+        if name in self.levels:
+            # Labels compare as strings, as build_baseline collected them. Counting matches of each of
+            # the few baseline labels beats mapping every row to a code; the rest are unseen
+            labels = values if values.dtype.kind == 'U' else values.astype(str)
+            counts = np.empty(size, dtype=np.int64)
+            for i, level in enumerate(self.levels[name]):
+                counts[i] = np.count_nonzero(labels == level)
+            counts[-1] = len(labels) - counts[:-1].sum()
+            return counts
+
+        edges = self.edges[name]
+        if values.dtype.kind in 'iu' and len(values):
+            lowest, highest = int(values.min()), int(values.max())
+            if highest - lowest < DENSE_RANGE:
+                # One pass counting each value, then a lookup of each distinct value's bin: far cheaper
+                # than a binary search per row for the small integer domains of most inputs
+                per_value = np.bincount(values - lowest)
+                bins = np.searchsorted(edges, np.arange(lowest, highest + 1), side='right')
+                return np.bincount(bins, weights=per_value, minlength=size).astype(np.int64)
+        # Right-closed at each edge; NaN sorts past every edge into the top bin
+        return np.bincount(np.searchsorted(edges, values, side='right'), minlength=size)
+
+    def split(self, counts):
+        return {name: counts[self.offsets[name]:self.offsets[name] + self.sizes[name]] for name in self.names}
+
+
+class DriftMonitor:
+    """Fixed-bin histograms of live model inputs and credit scores, compared with a baseline by PSI
+
+    Every monitored column has the bins of its baseline (see BaselineBins), and the counts of all
+    columns live in one array, so memory is fixed by the number of bins however many applicants are
+    scored. Two sets of counts are kept: since start, and since the last report. A background thread
+    (start) reports PSI of the credit score and CSI of each input every interval seconds as a JSON
+    line, then starts a new window. After a model hot reload, model_swapped starts over against the
+    new artifact's baseline.
+    """
+
+    def __init__(self, baseline, interval=60.0, log=None, stream=sys.stdout, pending_rows=PENDING_ROWS,
+                 model_sha256=None):
+        self.interval = interval
+        self.log = log
+        self.stream = stream
+        self.pending_rows = pending_rows
+        self.reports = 0
+        self.rebases = 0
+        self.last_report = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._reset(baseline, model_sha256)
+
+    def _reset(self, baseline, model_sha256):
+        # Everything tied to one baseline, replaced together under the lock by rebase()
+        self.bins = BaselineBins(baseline)
+        self.baseline = baseline
+        # False when the baseline records a different artifact than the one served; None if unknown
+        recorded = baseline.get('model_sha256')
+        self.baseline_matches_model = None if recorded is None or model_sha256 is None else recorded == model_sha256
+        self.total = np.zeros(self.bins.n_bins, dtype=np.int64)
+        self.window = np.zeros(self.bins.n_bins, dtype=np.int64)
+        self.rows = 0
+        self.window_rows = 0
+        self.window_started = time.time()
+        self._pending = []  # (applicant, credit_score) of single applicants not yet binned
+
+    def rebase(self, baseline, model_sha256=None):
+        """Compare against baseline from now on, dropping everything counted so far"""
+        with self._lock:
+            self._reset(baseline, model_sha256)
+            self.rebases += 1
+
+    def model_swapped(self, path, sha256):
+        """ModelWatcher callback: report the old model's window, then start over on the new one's baseline"""
+        self.report()
+        try:
+            baseline = load_baseline(baseline_path(path))
+        except (OSError, ValueError) as exc:
+            print(f"Drift baseline of the new model unavailable ({exc}); keeping the previous one",
+                  file=sys.stderr)
+            baseline = self.baseline
+        self.rebase(baseline, sha256)
+        if self.baseline_matches_model is False:
+            print(f"Drift baseline {baseline_path(path)} was built for another model version; "
+                  "rebuild it with `python drift.py baseline`", file=sys.stderr)
+
+    def update(self, columns, credit_scores):
+        """Count a scored batch: kernel_inputs columns and the credit scores predict_batch returned"""
+        self.update_columns(drift_columns(columns, credit_scores))
+
+    def update_columns(self, monitored):
+        n_rows = len(monitored['credit_score'])
+        if not n_rows:
+            return
+        bins = self.bins
+        counts = bins.bincount(monitored, n_rows)
+        with self._lock:
+            # A batch binned against a baseline that was replaced meanwhile is dropped
+            if bins is not self.bins:
+                return
+            self.total += counts
+            self.window += counts
+            self.rows += n_rows
+            self.window_rows += n_rows
+
+    def add(self, applicant, credit_score):
+        """Count one applicant (a mapping with the monitored inputs, not changed afterwards) in a later group"""
+        # Only a reference is kept, so a call costs one append; columns are built once per group in flush
+        with self._lock:
+            self._pending.append((applicant, credit_score))
+            full = len(self._pending) >= self.pending_rows
+        if full:
+            self.flush()
+
+    def flush(self):
+        # Appends happen under the same lock, so no applicant is lost in the swap
+        with self._lock:
+            pending, self._pending = self._pending, []
+            bins = self.bins
+        if not pending:
+            return
+        monitored = {'credit_score': np.array([credit_score for _, credit_score in pending], dtype=float)}
+        for name in bins.names:
+            if name != 'credit_score':
+                values = [applicant[name] for applicant, _ in pending]
+                # Labels come out as a str array when they are all strings, so they are not converted again
+                monitored[name] = np.asarray(values) if name in bins.levels else np.asarray(values, dtype=float)
+        self.update_columns(monitored)
+
+    def counts(self, counts):
+        return self.bins.split(counts)
+
+    @staticmethod
+    def _summary(bins, counts, rows):
+        features = bins.baseline['features']
+        live = bins.split(counts)
+        csi = {name: psi(features[name]['counts'], live[name]) for name in bins.names if name != 'credit_score'}
+        score_psi = psi(features['credit_score']['counts'], live['credit_score'])
+        return {'rows': rows, 'psi': score_psi, 'level': psi_level(score_psi), 'csi': csi,
+                'drifted': sorted((name for name, value in csi.items() if value > PSI_LEVELS[-1][0]),
+                                  key=csi.get, reverse=True)}
+
+    def snapshot(self, reset_window=False):
+        """PSI of the credit score and CSI per input, since the last report ('window') and since start"""
+        self.flush()
+        with self._lock:
+            bins, total, window = self.bins, self.total.copy(), self.window.copy()
+            rows, window_rows, window_started = self.rows, self.window_rows, self.window_started
+            matches = self.baseline_matches_model
+            if reset_window:
+                self.window[:] = 0
+                self.window_rows = 0
+                self.window_started = time.time()
+        snapshot = {'ts': time.time(), 'window_seconds': time.time() - window_started,
+                    'baseline_model': bins.baseline.get('model'), 'baseline_matches_model': matches,
+                    'rebases': self.rebases, 'total': self._summary(bins, total, rows)}
+        if window_rows:
+            snapshot['window'] = self._summary(bins, window, window_rows)
+        return snapshot
+
+    def report(self):
+        """Write a snapshot to the log and start a new window"""
+        snapshot = self.snapshot(reset_window=True)
+        self.last_report = snapshot
+        self.reports += 1
+        out = open(self.log, 'a') if self.log else self.stream
+        try:
+            out.write(json.dumps(snapshot) + '\n')
+            out.flush()
+        finally:
+            if self.log:
+                out.close()
+        return snapshot
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='drift-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+
+def enable(model_path=None, interval=60.0, log=None):
+    """Start monitoring everything predict and predict_batch score, against the model's stored baseline"""
+    path = registry.resolve(model_path) if model_path else registry.default_path
+    return install(DriftMonitor(load_baseline(baseline_path(path)), interval=interval, log=log,
+                                model_sha256=file_sha256(path)))
+
+
+def install(monitor):
+    """Start monitor and feed it from predict and predict_batch"""
+    prediction_helper.drift_monitor = monitor.start()
+    return monitor
+
+
+def disable():
+    monitor, prediction_helper.drift_monitor = prediction_helper.drift_monitor, None
+    if monitor is not None:
+        monitor.stop()
+    return monitor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Population stability (PSI/CSI) of model inputs and credit scores")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command, help_text in (('baseline', "Write the baseline histograms next to the model artifact"),
+                               ('check', "PSI/CSI of a population of files against the stored baseline")):
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument('inputs', nargs='+',
+                         help="Row-aligned CSV/Parquet files or store tables (customers, loans, bureau)")
+        sub.add_argument('--model', help="Model artifact (default: the served one)")
+        sub.add_argument('--chunk-size', type=int, default=100000)
+        sub.add_argument('--set', dest='defaults', action='append', metavar='NAME=VALUE',
+                         help="Fill a column missing from the inputs (repeatable)")
+    subparsers.choices['baseline'].add_argument('--bins', type=int, default=DRIFT_BINS)
+    args = parser.parse_args()
+
+    from score_file import parse_defaults
+
+    defaults = parse_defaults(args.defaults)
+    start = time.perf_counter()
+    if args.command == 'baseline':
+        baseline = build_baseline(args.inputs, args.model, bins=args.bins, chunk_size=args.chunk_size,
+                                  defaults=defaults)
+        path = baseline_path(args.model)
+        write_baseline(baseline, path)
+        print(f"Wrote {path} from {baseline['rows']:,} rows in {time.perf_counter() - start:.2f}s")
+        return
+
+    monitor = DriftMonitor(load_baseline(baseline_path(args.model)))
+    for columns in _file_columns(args.inputs, args.chunk_size, defaults, registry.compiled(args.model)):
+        monitor.update_columns(columns)
+    summary = monitor.snapshot()['total']
+    print(f"{summary['rows']:,} rows in {time.perf_counter() - start:.2f}s")
+    print(f"credit_score PSI {summary['psi']:.4f} ({summary['level']})")
+    for name, value in sorted(summary['csi'].items(), key=lambda item: -item[1]):
+        print(f"  {name:<26} CSI {value:.4f} ({psi_level(value)})")
+
+
+if __name__ == '__main__':
+    main()
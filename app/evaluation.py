@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from feature_store import Table, is_table
+
+# Rank-ordering table of the notebook: ten quantile bins of the predicted probability
+DECILES = 10
+
+# Equal-width probability bins of the calibration table
+CALIBRATION_BINS = 10
+
+# ROC points kept in the report, spread evenly over the false positive rate
+ROC_POINTS = 101
+
+# Sorted rows per block when walking the ROC curve, bounding its temporary arrays
+ROC_BLOCK = 1 << 20
+
+DECILE_COLUMNS = ['Decile', 'Minimum Probability', 'Maximum Probability', 'Events', 'Non-events', 'Event Rate',
+                  'Non-event Rate', 'Cum Events', 'Cum Non-events', 'Cum Event Rate', 'Cum Non-event Rate', 'KS']
+
+
+def load_column(path, column=None):
+    """One column as an array: .npy files and store tables are memory-mapped, CSV/Parquet read that column only"""
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if is_table(path):
+        return Table(path)[column]
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=[column])[column].to_numpy()
+    return pd.read_csv(path, usecols=[column])[column].to_numpy()
+
+
+def events_before(sorted_scores, sorted_events, bounds):
+    """Events among sorted_scores[:b] for each boundary b between runs of equal scores
+
+    sorted_events holds the sorted scores of the event rows alone, so the count is how many of them
+    are at most the score just before b; no permutation of the labels is needed.
+    """
+    bounds = np.asarray(bounds)
+    counts = np.zeros(len(bounds), dtype=np.int64)
+    inner = bounds > 0
+    counts[inner] = np.searchsorted(sorted_events, sorted_scores[bounds[inner] - 1], side='right')
+    return counts
+
+
+def quantile_edges(sorted_scores, bins=DECILES):
+    """The bin edges pandas.qcut(scores, bins, duplicates='drop') uses, read off already sorted scores"""
+    # np.quantile's default linear interpolation, without another partition of the array
+    position = np.linspace(0, 1, bins + 1) * (len(sorted_scores) - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(sorted_scores) - 1)
+    low, high = np.asarray(sorted_scores[lower], dtype=float), np.asarray(sorted_scores[upper], dtype=float)
+    return np.unique(low + (high - low) * (position - lower))
+
+
+def decile_table(sorted_scores, sorted_events, bins=DECILES):
+    """The notebook's decile table from the sorted scores of all rows and of the event rows
+
+    Bins are right-closed like pd.qcut, so each one ends at the last score not above its upper edge and
+    its events are a difference of events_before at its bounds. Rows run from the top decile down.
+    """
+    n = len(sorted_scores)
+    edges = quantile_edges(sorted_scores, bins)
+    bounds = np.concatenate([[0], np.searchsorted(sorted_scores, edges[1:-1], side='right'), [n]])
+    starts, ends = bounds[:-1], bounds[1:]
+    # Edges that fall between no two scores leave empty bins, which groupby would not list
+    labels = np.flatnonzero(ends > starts)
+    starts, ends = starts[labels], ends[labels]
+
+    events = events_before(sorted_scores, sorted_events, ends) - events_before(sorted_scores, sorted_events, starts)
+    totals = ends - starts
+    non_events = totals - events
+    table = {
+        'Decile': labels,
+        'Minimum Probability': np.asarray(sorted_scores[starts], dtype=float),
+        'Maximum Probability': np.asarray(sorted_scores[ends - 1], dtype=float),
+        'Events': events,
+        'Non-events': non_events,
+        'Event Rate': events * 100 / totals,
+        'Non-event Rate': non_events * 100 / totals,
+    }
+    table = {name: values[::-1] for name, values in table.items()}
+    table['Cum Events'] = np.cumsum(table['Events'])
+    table['Cum Non-events'] = np.cumsum(table['Non-events'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['Cum Event Rate'] = table['Cum Events'] * 100 / table['Events'].sum()
+        table['Cum Non-event Rate'] = table['Cum Non-events'] * 100 / table['Non-events'].sum()
+    table['KS'] = np.abs(table['Cum Event Rate'] - table['Cum Non-event Rate'])
+    return [{name: table[name][i].item() for name in DECILE_COLUMNS} for i in range(len(starts))]
+
+
+def roc_summary(sorted_scores, sorted_events, roc_points=ROC_POINTS, block_rows=ROC_BLOCK):
+    """AUC, KS and sampled points of the ROC curve over the distinct scores, as sklearn.metrics.roc_curve
+
+    Thresholds descend; a threshold counts every row scoring at or above it, so tied scores enter
+    together. The curve is walked down block_rows sorted rows at a time, keeping the trapezoid sum,
+    the largest TPR - FPR gap and the first point at or past each of roc_points even FPR steps.
+    """
+    n, positives = len(sorted_scores), len(sorted_events)
+    negatives = n - positives
+    grid = np.linspace(0, 1, roc_points)
+    points = {'fpr': [0.0], 'tpr': [0.0], 'threshold': [None]}
+    auc, ks, ks_threshold = 0.0, 0.0, None
+    last_fpr, last_tpr = 0.0, 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for end in range(n, 0, -block_rows):
+            start = max(end - block_rows, 0)
+            # First row of each run of equal scores in sorted_scores[start:end], from the highest down
+            segment = sorted_scores[start:end]
+            block = np.flatnonzero(segment[1:] != segment[:-1]) + 1 + start
+            if start == 0 or sorted_scores[start] != sorted_scores[start - 1]:
+                block = np.concatenate([[start], block])
+            if not len(block):
+                continue
+            block = block[::-1]
+            tps = positives - events_before(sorted_scores, sorted_events, block)
+            tpr = tps / positives
+            fpr = (n - block - tps) / negatives
+            auc += np.sum(np.diff(fpr, prepend=last_fpr) * (tpr + np.concatenate([[last_tpr], tpr[:-1]]))) / 2
+            gap = np.abs(tpr - fpr)
+            best = int(np.nanargmax(gap)) if not np.isnan(gap).all() else 0
+            if gap[best] > ks:
+                ks, ks_threshold = float(gap[best]), float(sorted_scores[block[best]])
+            steps = grid[(grid > last_fpr) & (grid <= fpr[-1])]
+            for i in np.unique(np.searchsorted(fpr, steps)):
+                points['fpr'].append(float(fpr[i]))
+                points['tpr'].append(float(tpr[i]))
+                points['threshold'].append(float(sorted_scores[block[i]]))
+            last_fpr, last_tpr = fpr[-1], tpr[-1]
+    if points['fpr'][-1] != last_fpr or points['tpr'][-1] != last_tpr:
+        points['fpr'].append(float(last_fpr))
+        points['tpr'].append(float(last_tpr))
+        points['threshold'].append(float(sorted_scores[0]))
+    return float(auc), ks, ks_threshold, points
+
+
+def calibration_table(sorted_scores, sorted_events, bins=CALIBRATION_BINS):
+    """Rows, mean predicted probability and observed event rate of equal-width probability bins on [0, 1]"""
+    n = len(sorted_scores)
+    edges = np.linspace(0, 1, bins + 1)
+    bounds = np.concatenate([[0], np.searchsorted(sorted_scores, edges[1:-1], side='left'), [n]])
+    starts, ends = bounds[:-1], bounds[1:]
+    # Starts of the non-empty bins increase strictly, so reduceat sums exactly each bin's rows
+    sums = np.zeros(bins)
+    sums[ends > starts] = np.add.reduceat(sorted_scores, starts[ends > starts], dtype=float)
+    events = events_before(sorted_scores, sorted_events, ends) - events_before(sorted_scores, sorted_events, starts)
+    rows = []
+    for i, count in enumerate((ends - starts).tolist()):
+        rows.append({'Bin': i, 'Lower': float(edges[i]), 'Upper': float(edges[i + 1]), 'Rows': count,
+                     'Mean Probability': float(sums[i] / count) if count else None,
+                     'Event Rate': float(events[i] / count) if count else None})
+    return rows
+
+
+def evaluate(scores, labels, deciles=DECILES, calibration_bins=CALIBRATION_BINS, roc_points=ROC_POINTS):
+    """Decile table, KS, AUC/Gini, ROC points and calibration bins of one scored population
+
+    Everything is read off two sorts, of all scores and of the event rows' scores: each table's counts
+    come from np.searchsorted of its bin boundaries in the sorted event scores. scores and labels can be
+    memory-mapped; the two sorted copies are the only full-size arrays.
+    """
+    scores = np.asarray(scores)
+    labels = np.asarray(labels)
+    if len(scores) != len(labels):
+        raise ValueError(f"{len(scores):,} scores but {len(labels):,} labels")
+    if not len(scores):
+        raise ValueError("No scores to evaluate")
+    sorted_scores = np.sort(scores)
+    sorted_events = np.sort(scores[labels.astype(bool)])
+
+    auc, ks, ks_threshold, points = roc_summary(sorted_scores, sorted_events, roc_points)
+    decile_rows = decile_table(sorted_scores, sorted_events, deciles)
+    return {
+        'rows': len(scores),
+        'events': len(sorted_events),
+        'auc': auc,
+        'gini': 2 * auc - 1,
+        'ks': ks * 100,
+        'ks_threshold': ks_threshold,
+        'ks_decile': max(row['KS'] for row in decile_rows),
+        'deciles': decile_rows,
+        'roc': points,
+        'calibration': calibration_table(sorted_scores, sorted_events, calibration_bins),
+    }
+
+
+def build_report(populations, **kwargs):
+    """evaluate() for every {name: (scores, labels)} population"""
+    return {name: evaluate(scores, labels, **kwargs) for name, (scores, labels) in populations.items()}
+
+
+def write_report(report, path):
+    """Write the report as JSON, or as CSV tables: path (summary), and .deciles/.roc/.calibration next to it"""
+    if not path.endswith('.csv'):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=1)
+        os.replace(tmp_path, path)
+        return [path]
+
+    import pandas as pd
+
+    stem = path[:-len('.csv')]
+    tables = {
+        path: pd.DataFrame([{'population': name, **{key: value for key, value in result.items()
+                                                    if not isinstance(value, (list, dict))}}
+                            for name, result in report.items()]),
+        f'{stem}.deciles.csv': pd.DataFrame([{'population': name, **row} for name, result in report.items()
+                                             for row in result['deciles']]),
+        f'{stem}.roc.csv': pd.concat([pd.DataFrame(result['roc']).assign(population=name)
+                                      for name, result in report.items()])[['population', 'fpr', 'tpr', 'threshold']],
+        f'{stem}.calibration.csv': pd.DataFrame([{'population': name, **row} for name, result in report.items()
+                                                 for row in result['calibration']]),
+    }
+    for table_path, table in tables.items():
+        table.to_csv(table_path, index=False)
+    return list(tables)
+
+
+def parse_population(spec, score_column, label_column):
+    # NAME=SCORES[:LABELS]; without LABELS both columns come from the scores file
+    name, sep, paths = spec.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=SCORES[:LABELS], got {spec!r}")
+    scores_path, _, labels_path = paths.partition(':')
+    return name, (load_column(scores_path, score_column), load_column(labels_path or scores_path, label_column))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decile, KS, Gini/AUC, ROC and calibration report of scored populations")
+    parser.add_argument('populations', nargs='+', metavar='NAME=SCORES[:LABELS]',
+                        help="Scores and labels as .npy files, store tables, or CSV/Parquet files, "
+                             "e.g. test=scores.csv:../dataset/store/loans")
+    parser.add_argument('-o', '--output', required=True, help="report.json, or report.csv for CSV tables")
+    parser.add_argument('--score-column', default='default_probability',
+                        help="Score column of CSV/Parquet/store inputs (score_file.py writes default_probability)")
+    parser.add_argument('--label-column', default='default', help="Label column of CSV/Parquet/store inputs")
+    parser.add_argument('--deciles', type=int, default=DECILES)
+    parser.add_argument('--calibration-bins', type=int, default=CALIBRATION_BINS)
+    parser.add_argument('--roc-points', type=int, default=ROC_POINTS)
+    args = parser.parse_args()
+
+    populations = dict(parse_population(spec, args.score_column, args.label_column) for spec in args.populations)
+    start = time.perf_counter()
+    report = build_report(populations, deciles=args.deciles, calibration_bins=args.calibration_bins,
+                          roc_points=args.roc_points)
+    print(f"Evaluated {sum(result['rows'] for result in report.values()):,} rows in "
+          f"{time.perf_counter() - start:.2f}s", file=sys.stderr)
+    for name, result in report.items():
+        print(f"{name}: AUC {result['auc']:.4f}, Gini {result['gini']:.4f}, KS {result['ks']:.2f} "
+              f"(decile KS {result['ks_decile']:.2f})")
+    print(f"Wrote {', '.join(write_report(report, args.output))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,435 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+# Raw datasets live next to the app; the store is built under dataset/store
+DATASET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset')
+STORE_DIR = os.path.join(DATASET_DIR, 'store')
+
+# Tables ingested by default, in the order the notebook merges them
+DATASET_TABLES = ['customers', 'loans', 'bureau_data']
+
+# Text columns with at most this many distinct values are dictionary-encoded, the rest stored fixed-width
+MAX_CATEGORIES = 1024
+
+# Bumped when the persisted index layout changes, so older index files are rebuilt
+INDEX_VERSION = 2
+
+
+class _ColumnWriter:
+    """Appends one column to a raw binary file, widening the stored dtype when a later chunk needs it"""
+
+    def __init__(self, path):
+        self.path = path
+        self.dtype = None
+        self.rows = 0
+        self.categories = None  # list of labels when dictionary-encoded
+        self._codes = None
+        open(path, 'wb').close()
+
+    def append(self, series):
+        if self.dtype is None:
+            self._choose_encoding(series)
+
+        if self.categories is not None:
+            new_labels = [label for label in series.dropna().unique() if label not in self._codes]
+            if len(self.categories) + len(new_labels) > MAX_CATEGORIES:
+                # An id-like column that only looked low-cardinality in its first chunk
+                self._store_as_strings()
+        if self.categories is not None:
+            values = self._encode(new_labels, series)
+            n_categories = len(self.categories)
+            target = np.dtype(np.int8 if n_categories < 2 ** 7 else np.int16 if n_categories < 2 ** 15 else np.int32)
+        elif self.dtype.kind == 'S':
+            values = series.fillna('').astype(str).str.encode('utf-8').to_numpy().astype(bytes)
+            target = np.dtype(f'S{max(self.dtype.itemsize, values.dtype.itemsize)}')
+        elif series.dtype.kind in 'biuf':
+            values = series.to_numpy()
+            target = np.result_type(self.dtype, values.dtype)
+        else:
+            raise ValueError(f"Column {os.path.basename(self.path)[:-4]} mixes numbers and text")
+
+        self._widen(np.promote_types(self.dtype, target))
+        with open(self.path, 'ab') as f:
+            f.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.rows += len(values)
+
+    def _choose_encoding(self, series):
+        if series.dtype.kind in 'biuf':
+            self.dtype = series.dtype
+        elif series.nunique(dropna=True) <= MAX_CATEGORIES:
+            self.categories = []
+            self._codes = {}
+            self.dtype = np.dtype(np.int8)
+        else:
+            self.dtype = np.dtype('S1')
+
+    def _encode(self, new_labels, series):
+        # Codes follow first appearance so earlier chunks never need re-encoding; -1 marks missing
+        for label in new_labels:
+            self._codes[label] = len(self.categories)
+            self.categories.append(label)
+        return series.map(self._codes).fillna(-1).to_numpy(dtype=np.int32)
+
+    def _store_as_strings(self):
+        # Rewrite the codes written so far as fixed-width bytes, missing values as b'' like the string path
+        labels = np.array([str(label).encode('utf-8') for label in self.categories] + [b''])
+        if self.rows:
+            codes = np.fromfile(self.path, dtype=self.dtype, count=self.rows)
+            labels[codes].tofile(self.path)
+        self.dtype = labels.dtype
+        self.categories = self._codes = None
+
+    def _widen(self, dtype):
+        if dtype == self.dtype:
+            return
+        if self.rows:
+            existing = np.fromfile(self.path, dtype=self.dtype, count=self.rows)
+            existing.astype(dtype).tofile(self.path)
+        self.dtype = dtype
+
+    def meta(self):
+        meta = {'dtype': self.dtype.str, 'kind': 'categorical' if self.categories is not None else
+                ('string' if self.dtype.kind == 'S' else 'numeric')}
+        if self.categories is not None:
+            meta['categories'] = [str(label) for label in self.categories]
+        return meta
+
+
+def ingest_csv(csv_path, table_dir, chunk_size=500000):
+    """Convert one CSV into a columnar table directory in a single streaming pass; returns the row count"""
+    import pandas as pd
+
+    os.makedirs(table_dir, exist_ok=True)
+    writers = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        for name in chunk.columns:
+            if name not in writers:
+                writers[name] = _ColumnWriter(os.path.join(table_dir, f'{name}.bin'))
+            writers[name].append(chunk[name])
+
+    rows = next(iter(writers.values())).rows if writers else 0
+    meta = {'rows': rows, 'source': os.path.abspath(csv_path),
+            'columns': {name: writer.meta() for name, writer in writers.items()}}
+    with open(os.path.join(table_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return rows
+
+
+def ingest_dataset(dataset_dir=DATASET_DIR, store_dir=STORE_DIR, chunk_size=500000):
+    """Ingest every dataset CSV that exists; returns {table: rows}"""
+    ingested = {}
+    for table in DATASET_TABLES:
+        csv_path = os.path.join(dataset_dir, f'{table}.csv')
+        if os.path.exists(csv_path):
+            ingested[table] = ingest_csv(csv_path, os.path.join(store_dir, table), chunk_size)
+    return ingested
+
+
+class Table:
+    """One ingested table; columns are memory-mapped on first access and never copied"""
+
+    def __init__(self, table_dir):
+        self.table_dir = table_dir
+        with open(os.path.join(table_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.rows = self.meta['rows']
+        self.columns = list(self.meta['columns'])
+        self._mapped = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __contains__(self, name):
+        return name in self.meta['columns']
+
+    def __getitem__(self, name):
+        """Raw stored values: numbers, fixed-width bytes, or int codes for categorical columns"""
+        if name not in self._mapped:
+            column = self.meta['columns'][name]
+            path = os.path.join(self.table_dir, f'{name}.bin')
+            # np.memmap rejects empty files, so zero-row columns are plain empty arrays
+            self._mapped[name] = (np.memmap(path, dtype=np.dtype(column['dtype']), mode='r', shape=(self.rows,))
+                                  if self.rows else np.empty(0, dtype=np.dtype(column['dtype'])))
+        return self._mapped[name]
+
+    def categories(self, name):
+        return np.array(self.meta['columns'][name].get('categories', []), dtype=object)
+
+    def column(self, name, rows=slice(None)):
+        """Decoded values for a row selection: labels for categoricals (None when missing), str for strings"""
+        kind = self.meta['columns'][name]['kind']
+        values = self[name][rows]
+        if kind == 'categorical':
+            labels = np.append(self.categories(name), None)
+            return labels[values]  # code -1 picks the trailing None
+        if kind == 'string':
+            try:
+                return values.astype('U').astype(object)  # fast path for ASCII ids
+            except UnicodeDecodeError:
+                return np.char.decode(values, 'utf-8').astype(object)
+        return values
+
+    def to_frame(self, columns=None, rows=slice(None)):
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name, rows) for name in columns or self.columns})
+
+    def iter_frames(self, chunk_size, columns=None, start=0):
+        for offset in range(start, self.rows, chunk_size):
+            yield self.to_frame(columns, slice(offset, offset + chunk_size))
+
+
+class FeatureStore:
+    """Directory of ingested tables opened lazily by name"""
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self._tables = {}
+        self._indexes = {}
+
+    @property
+    def tables(self):
+        return sorted(name for name in os.listdir(self.store_dir)
+                      if os.path.exists(os.path.join(self.store_dir, name, 'meta.json')))
+
+    def __contains__(self, name):
+        return os.path.exists(os.path.join(self.store_dir, name, 'meta.json'))
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            self._tables[name] = Table(os.path.join(self.store_dir, name))
+        return self._tables[name]
+
+    def index(self, table, key='cust_id'):
+        if (table, key) not in self._indexes:
+            self._indexes[table, key] = KeyIndex(self[table], key)
+        return self._indexes[table, key]
+
+    def joined(self, base='customers'):
+        return JoinedView(self, base)
+
+
+def _parse_numeric_ids(raw, prefix_len, digits):
+    # Vectorized int parse of fixed-width ids such as b'C00042': digit bytes dotted with powers of ten
+    matrix = raw.view(np.uint8).reshape(len(raw), raw.dtype.itemsize)[:, prefix_len:prefix_len + digits]
+    return (matrix.astype(np.int64) - ord('0')) @ (10 ** np.arange(digits - 1, -1, -1, dtype=np.int64))
+
+
+def key_bytes(table, key='cust_id'):
+    """A key column as fixed-width bytes: stored strings as they are, categorical codes decoded to labels"""
+    if table.meta['columns'][key]['kind'] != 'categorical':
+        return np.ascontiguousarray(table[key])
+    # Code -1 (missing) picks the trailing b'', as the string path stores a missing id
+    labels = np.array([str(label).encode('utf-8') for label in table.meta['columns'][key]['categories']] + [b''])
+    return labels[table[key]]
+
+
+def build_index(table, key='cust_id'):
+    """Sort a table's key column once and persist key -> row offset arrays next to its columns"""
+    raw = key_bytes(table, key)
+    meta = {'key': key, 'rows': table.rows, 'table_mtime_ns': _meta_mtime(table), 'version': INDEX_VERSION}
+
+    # Ids of the form <prefix><digits> with a common prefix and width are indexed by their number
+    first = bytes(raw[0]) if table.rows else b''
+    prefix = first[:len(first) - len(first.lstrip(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_-'))]
+    digits = raw.dtype.itemsize - len(prefix)
+    matrix = raw.view(np.uint8).reshape(len(raw), raw.dtype.itemsize)
+    if (table.rows and 0 < digits <= 18 and (matrix[:, :len(prefix)] == np.frombuffer(prefix, np.uint8)).all()
+            and ((matrix[:, len(prefix):] >= ord('0')) & (matrix[:, len(prefix):] <= ord('9'))).all()):
+        keys = _parse_numeric_ids(raw, len(prefix), digits)
+        meta.update(kind='numeric', prefix=prefix.decode(), digits=digits)
+    else:
+        keys = raw
+        meta.update(kind='bytes')
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    meta['unique'] = bool(table.rows < 2 or (sorted_keys[1:] != sorted_keys[:-1]).all())
+    # Contiguous ids already in row order (C00001, C00002, ...) need no search at all
+    meta['dense_start'] = (int(sorted_keys[0]) if meta['kind'] == 'numeric' and meta['unique'] and table.rows
+                           and sorted_keys[-1] - sorted_keys[0] == table.rows - 1
+                           and (order == np.arange(table.rows)).all() else None)
+    meta['dtype'] = sorted_keys.dtype.str
+
+    sorted_keys.tofile(os.path.join(table.table_dir, f'{key}.index.keys.bin'))
+    order.astype(np.int64).tofile(os.path.join(table.table_dir, f'{key}.index.rows.bin'))
+    with open(os.path.join(table.table_dir, f'{key}.index.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _meta_mtime(table):
+    return os.stat(os.path.join(table.table_dir, 'meta.json')).st_mtime_ns
+
+
+class KeyIndex:
+    """Persistent cust_id -> row offset index; built on first use and rebuilt when the table is re-ingested"""
+
+    def __init__(self, table, key='cust_id'):
+        self.table = table
+        self.key = key
+        meta_path = os.path.join(table.table_dir, f'{key}.index.json')
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        if (meta is None or meta.get('version') != INDEX_VERSION or meta['table_mtime_ns'] != _meta_mtime(table)
+                or meta['rows'] != table.rows):
+            meta = build_index(table, key)
+        self.meta = meta
+
+        self.prefix = meta.get('prefix', '')
+        self.dense_start = meta['dense_start']
+        dtype = np.dtype(meta['dtype'])
+        if table.rows:
+            self.keys = np.memmap(os.path.join(table.table_dir, f'{key}.index.keys.bin'), dtype=dtype, mode='r',
+                                  shape=(table.rows,))
+            self.rows = np.memmap(os.path.join(table.table_dir, f'{key}.index.rows.bin'), dtype=np.int64, mode='r',
+                                  shape=(table.rows,))
+        else:
+            self.keys, self.rows = np.empty(0, dtype=dtype), np.empty(0, dtype=np.int64)
+
+    def lookup(self, cust_id):
+        """Row offset of one id, or -1 if it is not in the table"""
+        if self.meta['kind'] == 'numeric':
+            number = cust_id[len(self.prefix):]
+            if (not cust_id.startswith(self.prefix) or len(number) != self.meta['digits']
+                    or not number.isdigit()):
+                return -1
+            number = int(number)
+            if self.dense_start is not None:
+                row = number - self.dense_start
+                return row if 0 <= row < self.table.rows else -1
+        else:
+            number = cust_id.encode()
+
+        position = int(np.searchsorted(self.keys, number))
+        if position < len(self.keys) and self.keys[position] == number:
+            return int(self.rows[position])
+        return -1
+
+    def lookup_many(self, cust_ids):
+        """Row offsets for an array of ids, -1 where an id is missing"""
+        ids = np.asarray(cust_ids).astype('S')
+        if self.meta['kind'] == 'numeric':
+            width = len(self.prefix) + self.meta['digits']
+            if ids.dtype.itemsize != width:
+                # Mixed widths cannot be parsed as one byte matrix; fall back to scalar lookups
+                return np.array([self.lookup(cust_id.decode()) for cust_id in ids], dtype=np.int64)
+            matrix = ids.view(np.uint8).reshape(len(ids), width)
+            valid = ((matrix[:, :len(self.prefix)] == np.frombuffer(self.prefix.encode(), np.uint8)).all(axis=1)
+                     & ((matrix[:, len(self.prefix):] >= ord('0'))
+                        & (matrix[:, len(self.prefix):] <= ord('9'))).all(axis=1))
+            keys = _parse_numeric_ids(ids, len(self.prefix), self.meta['digits'])
+            if self.dense_start is not None:
+                rows = keys - self.dense_start
+                return np.where(valid & (rows >= 0) & (rows < self.table.rows), rows, -1)
+        else:
+            keys = ids
+            valid = np.ones(len(ids), dtype=bool)
+
+        positions = np.minimum(np.searchsorted(self.keys, keys), max(len(self.keys) - 1, 0))
+        if not len(self.keys):
+            return np.full(len(ids), -1, dtype=np.int64)
+        found = valid & (self.keys[positions] == keys)
+        return np.where(found, self.rows[positions], -1)
+
+
+class JoinedView:
+    """Customers pre-joined with the other tables on cust_id through persisted row maps"""
+
+    def __init__(self, store, base='customers', others=('loans', 'bureau_data'), key='cust_id'):
+        self.store = store
+        self.base = store[base]
+        self.index = store.index(base, key)
+        self.others = {name: store[name] for name in others if name in store}
+        self.row_maps = {name: self._row_map(name, key) for name in self.others}
+
+    def _row_map(self, name, key):
+        # base row -> row in the other table (-1 if absent), rebuilt when either table is re-ingested
+        other = self.others[name]
+        path = os.path.join(self.base.table_dir, f'join.{name}.rows.bin')
+        stamp_path = path[:-4] + '.json'
+        stamp = {'base_mtime_ns': _meta_mtime(self.base), 'other_mtime_ns': _meta_mtime(other),
+                 'version': INDEX_VERSION}
+        if os.path.exists(stamp_path):
+            with open(stamp_path) as f:
+                if json.load(f) == stamp and self.base.rows:
+                    return np.memmap(path, dtype=np.int64, mode='r', shape=(self.base.rows,))
+
+        row_map = self.store.index(name, key).lookup_many(key_bytes(self.base, key))
+        row_map.astype(np.int64).tofile(path)
+        with open(stamp_path, 'w') as f:
+            json.dump(stamp, f)
+        return row_map
+
+    def get(self, cust_id):
+        """All joined columns of one customer as a dict, or None if unknown"""
+        row = self.index.lookup(cust_id)
+        if row < 0:
+            return None
+        record = {name: self.base.column(name, slice(row, row + 1))[0] for name in self.base.columns}
+        for name, table in self.others.items():
+            other_row = int(self.row_maps[name][row])
+            for column in table.columns:
+                if column not in record:
+                    record[column] = table.column(column, slice(other_row, other_row + 1))[0] if other_row >= 0 else None
+        return record
+
+    def frame(self, cust_ids=None):
+        """Joined DataFrame for the given ids (all customers when None); unknown ids are dropped"""
+        if cust_ids is None:
+            rows = np.arange(self.base.rows)
+        else:
+            rows = self.index.lookup_many(cust_ids)
+            rows = rows[rows >= 0]
+        return self._frame_rows(rows)
+
+    def iter_frames(self, chunk_size, start=0):
+        """Joined DataFrames of consecutive base rows, chunk_size at a time, for passes over all customers"""
+        for offset in range(start, self.base.rows, chunk_size):
+            yield self._frame_rows(np.arange(offset, min(offset + chunk_size, self.base.rows)))
+
+    def _frame_rows(self, rows):
+        import pandas as pd
+
+        df = self.base.to_frame(rows=rows)
+        for name, table in self.others.items():
+            other_rows = np.asarray(self.row_maps[name])[rows]
+            present = other_rows >= 0
+            for column in table.columns:
+                if column in df:
+                    continue
+                values = table.column(column, np.where(present, other_rows, 0))
+                df[column] = values if present.all() else pd.Series(values).where(present).to_numpy()
+        return df
+
+
+def is_table(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, 'meta.json'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped columnar store from the dataset CSVs")
+    parser.add_argument('--dataset-dir', default=DATASET_DIR)
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--chunk-size', type=int, default=500000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for table, rows in ingest_dataset(args.dataset_dir, args.store_dir, args.chunk_size).items():
+        print(f"{table}: {rows:,} rows")
+    print(f"Ingested into {args.store_dir} in {time.perf_counter() - start:.2f}s")
+
+    # Build the cust_id indexes and the customer join maps up front rather than on first lookup
+    start = time.perf_counter()
+    FeatureStore(args.store_dir).joined()
+    print(f"Indexed cust_id in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import hashlib
+import sys
+import threading
+import time
+
+import numpy as np
+
+from prediction_helper import CompiledModel, compile_model, kernel_inputs, read_model_data, registry, scores_from_logits
+
+# Applicants every new model version must score sensibly before it is swapped in: the Streamlit
+# defaults plus the extremes of each input
+GOLDEN_APPLICANTS = {
+    'age': [32, 18, 100, 45, 60, 25],
+    'income': [1200000, 100000, 50000000, 800000, 2500000, 0],
+    'loan_amount': [5000000, 10000000, 50000, 2500000, 0, 1000000],
+    'loan_tenure_months': [36, 360, 12, 120, 60, 24],
+    'avg_dpd_per_delinquency': [5, 365, 0, 20, 0, 10],
+    'delinquency_ratio': [10, 100, 0, 40, 0, 25],
+    'credit_utilization_ratio': [35, 100, 0, 70, 10, 50],
+    'num_open_accounts': [2, 4, 1, 3, 1, 2],
+    'residence_type': ['Owned', 'Rented', 'Mortgage', 'Owned', 'With Family', 'Rented'],
+    'loan_purpose': ['Home', 'Personal', 'Education', 'Auto', 'Home', 'Personal'],
+    'loan_type': ['Secured', 'Unsecured', 'Secured', 'Unsecured', 'Secured', 'Unsecured'],
+}
+
+
+class ReloadError(RuntimeError):
+    """New artifact version rejected by validation"""
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def validate(compiled, golden=GOLDEN_APPLICANTS, current=None, max_score_shift=None):
+    """Raise ReloadError unless compiled is a scorecard scoring the golden set with finite, in-range results
+
+    Non-linear models have no reason codes or counterfactuals for the app to show, so they are only
+    served as challengers. With max_score_shift and the current CompiledModel, also reject a version
+    that moves any golden score by more than that many points.
+    """
+    if not isinstance(compiled, CompiledModel):
+        raise ReloadError(f"{type(compiled).__name__} cannot be served as the champion, only as a challenger")
+    columns = kernel_inputs(golden)
+    probabilities, scores, ratings = scores_from_logits(compiled.logit_batch(columns))
+    if not np.isfinite(probabilities).all():
+        raise ReloadError("Model produces non-finite probabilities on the golden set")
+    if (ratings == 'Undefined').any():
+        raise ReloadError("Model produces scores outside 300-900 on the golden set")
+    if current is not None and max_score_shift is not None:
+        shift = np.abs(scores - scores_from_logits(current.logit_batch(columns))[1]).max()
+        if shift > max_score_shift:
+            raise ReloadError(f"Golden scores moved by up to {shift} points (limit {max_score_shift})")
+    return scores
+
+
+class ModelWatcher:
+    """Polls an artifact and hot-swaps validated new versions into the registry from a background thread
+
+    A change is noticed by (mtime, size) and confirmed by content hash, so touching the file does not
+    reload it. Loading, compiling and validation all happen off the scoring path; scoring threads only
+    ever see the old or the new CompiledModel. A rejected version keeps the old model serving.
+    Callables in on_swap are called with the artifact path and content hash after each swap.
+    """
+
+    def __init__(self, model_registry=registry, path=None, interval=1.0, golden=GOLDEN_APPLICANTS,
+                 max_score_shift=None, log=sys.stderr):
+        self.registry = model_registry
+        self.path = model_registry.resolve(path)
+        self.interval = interval
+        self.golden = golden
+        self.max_score_shift = max_score_shift
+        self.log = log
+        self.reloads = 0
+        self.rejected = 0
+        self.last_error = None
+        self.on_swap = []
+        self._version = None
+        self._sha256 = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # Make sure the current version is loaded so the first poll has something to compare with
+        self.registry.load(self.path)
+        self._version = self.registry.version(self.path)
+        self._sha256 = file_sha256(self.path)
+        self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except OSError as exc:
+                # Artifact briefly missing mid-replace; try again on the next poll
+                self.last_error = str(exc)
+            except Exception as exc:
+                # Never let one bad poll end the thread: later deploys would be ignored silently
+                self.last_error = str(exc)
+                print(f"Model watcher error: {exc!r}", file=self.log)
+
+    def check(self):
+        """Poll once; returns True if a new model version was swapped in"""
+        version = self.registry.version(self.path)
+        if version == self._version:
+            return False
+
+        sha256 = file_sha256(self.path)
+        if sha256 == self._sha256:
+            # Same bytes under a new mtime: re-key the loaded model instead of reloading it
+            self.registry.install(version, *self.registry.get(self.path))
+            self._version = version
+            return False
+
+        start = time.perf_counter()
+        try:
+            model_data = read_model_data(self.path)
+            compiled = compile_model(model_data)
+            validate(compiled, self.golden, self.registry.compiled(self.path), self.max_score_shift)
+        except OSError:
+            raise
+        except Exception as exc:
+            # A truncated or foreign pickle can raise almost anything (EOFError, ModuleNotFoundError, ...)
+            self.rejected += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            # Remember the rejected version so it is not retried on every poll
+            self._version, self._sha256 = version, sha256
+            print(f"Rejected new model version {sha256[:12]}: {self.last_error}", file=self.log)
+            return False
+
+        if self.registry.version(self.path) != version:
+            # Replaced again while loading; pick up the newest version on the next poll
+            return False
+        self.registry.install(version, model_data, compiled)
+        self._version, self._sha256 = version, sha256
+        self.reloads += 1
+        print(f"Swapped in model version {sha256[:12]} in {(time.perf_counter() - start) * 1000:.1f} ms",
+              file=self.log)
+        for callback in self.on_swap:
+            callback(self.path, sha256)
+        return True
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmark import synthetic_applicants
+from prediction_helper import INPUT_FIELDS
+
+
+def applicant_payloads(n_rows):
+    """Pre-encode JSON request bodies so the client measures the server, not json.dumps"""
+    columns = synthetic_applicants(n_rows)
+    return [json.dumps({field: columns[field][i].item() for field in INPUT_FIELDS}).encode()
+            for i in range(n_rows)]
+
+
+async def request(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(host, port, payloads, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await request(reader, writer, host, '/score', payloads[i % len(payloads)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+async def run(args):
+    payloads = applicant_payloads(args.payloads)
+    latencies, errors = [], []
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*[client(args.host, args.port, payloads, deadline, latencies, errors)
+                           for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"{len(latencies):,} requests over {args.concurrency} connections in {elapsed:.1f}s, "
+          f"{len(errors)} errors")
+    print(f"client throughput: {len(latencies) / elapsed:,.0f} req/sec")
+    print(f"client latency: p50 {np.percentile(latencies_ms, 50):.2f} ms, "
+          f"p99 {np.percentile(latencies_ms, 99):.2f} ms")
+
+    stats = await fetch_stats(args.host, args.port)
+    print(f"server latency: p50 {stats['latency_p50_ms']:.2f} ms, p99 {stats['latency_p99_ms']:.2f} ms, "
+          f"avg micro-batch {stats['avg_batch_size']:.1f} applicants")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running scoring_service on localhost")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run")
+    parser.add_argument('--payloads', type=int, default=10000, help="Distinct applicants to cycle through")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
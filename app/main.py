@@ -1,10 +1,17 @@
+import os
+import re
+
 import streamlit as st
-from prediction_helper import predict
+from prediction_helper import REASON_DESCRIPTIONS, CompiledModel, counterfactuals, registry
+from scenario_engine import ScenarioGrid
+from score_cache import artifact_version, cached_predict, figure_cache
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
 # --- PAGE CONFIG ---
 st.set_page_config(
     page_title="EliteCredit Advisor Portal",
@@ -13,722 +20,43 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# --- VIBRANT JEWEL-TONE FINANCIAL CSS ---
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    @import url('https://fonts.googleapis.com/css2?family=Outfit:wght@400;500;600;700;800&display=swap');
-
-    /* === VIBRANT MESH GRADIENT BACKGROUND === */
-    .stApp {
-        background: linear-gradient(135deg, 
-            #EEF2FF 0%, 
-            #E0E7FF 25%, 
-            #FDF2F8 50%, 
-            #F0F9FF 75%, 
-            #F0FDF4 100%) !important;
-        background-attachment: fixed !important;
-        min-height: 100vh;
-    }
-
-    /* === TYPOGRAPHY - DEEP NAVY FOR MAXIMUM READABILITY === */
-    html, body, [class*="css"], .stMarkdown, p, div, span, label {
-        color: #1E1B4B !important;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        font-weight: 400 !important;
-    }
-
-    h1, h2, h3, h4, h5, h6, .section-title {
-        font-family: 'Outfit', sans-serif !important;
-        font-weight: 700 !important;
-        color: #1E1B4B !important;
-        letter-spacing: -0.02em !important;
-    }
-
-    /* === PREMIUM GLASSMORPHISM CONTAINER === */
-    .premium-container {
-        background: rgba(255, 255, 255, 0.75) !important;
-        backdrop-filter: blur(24px) saturate(180%) !important;
-        -webkit-backdrop-filter: blur(24px) saturate(180%) !important;
-        border-radius: 32px !important;
-        padding: 48px !important;
-        border: 2px solid rgba(255, 255, 255, 0.3) !important;
-        box-shadow: 
-            0 40px 80px -20px rgba(67, 56, 202, 0.15),
-            0 20px 40px -20px rgba(99, 102, 241, 0.1),
-            inset 0 1px 0 0 rgba(255, 255, 255, 0.2) !important;
-        margin: 40px auto !important;
-        max-width: 1400px !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    /* VIBRANT ACCENT BORDER - ROYAL BLUE */
-    .premium-container::before {
-        content: '' !important;
-        position: absolute !important;
-        top: 0 !important;
-        left: 0 !important;
-        right: 0 !important;
-        height: 6px !important;
-        background: linear-gradient(90deg, #4338CA, #6366F1, #06B6D4) !important;
-        border-radius: 32px 32px 0 0 !important;
-    }
-
-    /* === COLOR-CODED FORM CARDS === */
-    .form-card {
-        background: rgba(255, 255, 255, 0.8) !important;
-        backdrop-filter: blur(12px) !important;
-        padding: 32px !important;
-        border-radius: 24px !important;
-        margin-bottom: 28px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    /* PERSONAL INFO CARD - BLUE THEME */
-    .form-card.personal {
-        border: 2px solid rgba(67, 56, 202, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(67, 56, 202, 0.08) !important;
-    }
-
-    .form-card.personal:hover {
-        border-color: rgba(67, 56, 202, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(67, 56, 202, 0.15) !important;
-        transform: translateY(-4px) !important;
-    }
-
-    /* FINANCIAL CAPACITY CARD - PURPLE THEME */
-    .form-card.financial {
-        border: 2px solid rgba(139, 92, 246, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(139, 92, 246, 0.08) !important;
-    }
-
-    .form-card.financial:hover {
-        border-color: rgba(139, 92, 246, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(139, 92, 246, 0.15) !important;
-        transform: translateY(-4px) !important;
-    }
-
-    /* CREDIT HISTORY CARD - EMERALD THEME */
-    .form-card.credit {
-        border: 2px solid rgba(16, 185, 129, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(16, 185, 129, 0.08) !important;
-    }
-
-    .form-card.credit:hover {
-        border-color: rgba(16, 185, 129, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(16, 185, 129, 0.15) !important;
-        transform: translateY(-4px) !important;
-    }
-
-    /* FORM HEADERS WITH COLOR-CODED ACCENTS */
-    .form-header {
-        color: #1E1B4B !important;
-        font-weight: 700 !important;
-        font-size: 1.3rem !important;
-        margin-bottom: 28px !important;
-        font-family: 'Outfit', sans-serif !important;
-        display: flex !important;
-        align-items: center !important;
-        gap: 16px !important;
-        padding-bottom: 16px !important;
-        border-bottom: 2px solid !important;
-    }
-
-    .form-header.personal { border-bottom-color: rgba(67, 56, 202, 0.2) !important; }
-    .form-header.financial { border-bottom-color: rgba(139, 92, 246, 0.2) !important; }
-    .form-header.credit { border-bottom-color: rgba(16, 185, 129, 0.2) !important; }
-
-    /* === VIBRANT INPUT FIELDS === */
-    .stNumberInput > div > div > input,
-    .stSelectbox > div > div > div {
-        background: rgba(255, 255, 255, 0.9) !important;
-        backdrop-filter: blur(8px) !important;
-        border: 2px solid rgba(203, 213, 225, 0.5) !important;
-        color: #1E1B4B !important;
-        border-radius: 14px !important;
-        height: 58px !important;
-        padding: 18px 20px !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: 1.1rem !important;
-        font-weight: 500 !important;
-        min-height: 58px !important;
-        transition: all 0.3s ease !important;
-    }
-
-    .stNumberInput > div > div > input:focus,
-    .stSelectbox > div > div > div:focus {
-        border-color: #4338CA !important;
-        box-shadow: 0 0 0 4px rgba(67, 56, 202, 0.1) !important;
-        outline: none !important;
-        background: rgba(255, 255, 255, 0.95) !important;
-        transform: translateY(-2px) !important;
-    }
-
-    .stSlider > div > div > div > div {
-        padding: 24px 0 !important;
-    }
-
-    /* === COLORFUL METRIC CARDS WITH UNIQUE IDENTITIES === */
-    .metric-card {
-        background: rgba(255, 255, 255, 0.85) !important;
-        backdrop-filter: blur(12px) !important;
-        padding: 28px !important;
-        border-radius: 20px !important;
-        text-align: center !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    .metric-card::before {
-        content: '' !important;
-        position: absolute !important;
-        top: 0 !important;
-        left: 0 !important;
-        right: 0 !important;
-        height: 4px !important;
-    }
-
-    /* LTI METRIC - INDIGO THEME */
-    .metric-card.lti {
-        border: 2px solid rgba(79, 70, 229, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(79, 70, 229, 0.1) !important;
-    }
-
-    .metric-card.lti::before {
-        background: linear-gradient(90deg, #4338CA, #6366F1) !important;
-    }
-
-    .metric-card.lti:hover {
-        border-color: rgba(79, 70, 229, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(79, 70, 229, 0.2) !important;
-        transform: translateY(-6px) !important;
-    }
-
-    /* DTI METRIC - VIOLET THEME */
-    .metric-card.dti {
-        border: 2px solid rgba(139, 92, 246, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(139, 92, 246, 0.1) !important;
-    }
-
-    .metric-card.dti::before {
-        background: linear-gradient(90deg, #7C3AED, #8B5CF6) !important;
-    }
-
-    .metric-card.dti:hover {
-        border-color: rgba(139, 92, 246, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(139, 92, 246, 0.2) !important;
-        transform: translateY(-6px) !important;
-    }
-
-    /* EMI METRIC - TEAL THEME */
-    .metric-card.emi {
-        border: 2px solid rgba(6, 182, 212, 0.3) !important;
-        box-shadow: 0 12px 32px -8px rgba(6, 182, 212, 0.1) !important;
-    }
-
-    .metric-card.emi::before {
-        background: linear-gradient(90deg, #0891B2, #06B6D4) !important;
-    }
-
-    .metric-card.emi:hover {
-        border-color: rgba(6, 182, 212, 0.5) !important;
-        box-shadow: 0 20px 50px -12px rgba(6, 182, 212, 0.2) !important;
-        transform: translateY(-6px) !important;
-    }
-
-    .metric-value {
-        font-family: 'Outfit', sans-serif !important;
-        font-size: 2.5rem !important;
-        font-weight: 800 !important;
-        margin: 16px 0 8px !important;
-        letter-spacing: -0.02em !important;
-        background: linear-gradient(135deg, #1E1B4B, #4338CA) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        background-clip: text !important;
-    }
-
-    .metric-label {
-        font-size: 0.9rem !important;
-        color: #4B5563 !important;
-        font-weight: 600 !important;
-        text-transform: uppercase !important;
-        letter-spacing: 0.1em !important;
-    }
-
-    .metric-subtitle {
-        font-size: 0.85rem !important;
-        color: #6B7280 !important;
-        margin-top: 6px !important;
-        font-weight: 500 !important;
-    }
-
-    /* === ANIMATED SCORE SPOTLIGHT === */
-    .score-spotlight {
-        text-align: center !important;
-        padding: 40px 0 !important;
-        position: relative !important;
-    }
-
-    .score-circle {
-        width: 220px !important;
-        height: 220px !important;
-        border-radius: 50% !important;
-        margin: 0 auto 32px !important;
-        background: rgba(255, 255, 255, 0.9) !important;
-        backdrop-filter: blur(12px) !important;
-        display: flex !important;
-        flex-direction: column !important;
-        align-items: center !important;
-        justify-content: center !important;
-        border: 16px solid !important;
-        box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15) !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    @keyframes pulse-sapphire {
-        0% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(67, 56, 202, 0.4); }
-        70% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 25px rgba(67, 56, 202, 0); }
-        100% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(67, 56, 202, 0); }
-    }
-
-    @keyframes pulse-emerald {
-        0% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(16, 185, 129, 0.4); }
-        70% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 25px rgba(16, 185, 129, 0); }
-        100% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(16, 185, 129, 0); }
-    }
-
-    @keyframes pulse-ruby {
-        0% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(239, 68, 68, 0.4); }
-        70% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 25px rgba(239, 68, 68, 0); }
-        100% { box-shadow: 0 20px 60px -20px rgba(0, 0, 0, 0.15), 0 0 0 0px rgba(239, 68, 68, 0); }
-    }
-
-    .score-excellent { 
-        border-color: #4338CA !important; 
-        animation: pulse-sapphire 3s infinite !important;
-    }
-
-    .score-good { 
-        border-color: #10B981 !important; 
-        animation: pulse-emerald 3s infinite !important;
-    }
-
-    .score-poor { 
-        border-color: #EF4444 !important; 
-        animation: pulse-ruby 3s infinite !important;
-    }
-
-    .score-circle:hover {
-        transform: scale(1.08) rotate(5deg) !important;
-        box-shadow: 0 30px 80px -25px rgba(0, 0, 0, 0.2) !important;
-    }
-
-    /* === CLIENT BANNER === */
-    .client-banner {
-        background: linear-gradient(90deg, 
-            rgba(255, 255, 255, 0.85) 0%, 
-            rgba(255, 255, 255, 0.7) 100%) !important;
-        backdrop-filter: blur(16px) !important;
-        border: 2px solid rgba(255, 255, 255, 0.4) !important;
-        border-radius: 24px !important;
-        padding: 28px 36px !important;
-        margin: 32px 0 !important;
-        display: flex !important;
-        align-items: center !important;
-        gap: 24px !important;
-        box-shadow: 0 20px 60px -30px rgba(67, 56, 202, 0.2) !important;
-        position: relative !important;
-        overflow: hidden !important;
-        transition: all 0.4s ease !important;
-    }
-
-    .client-banner:hover {
-        transform: translateY(-4px) !important;
-        box-shadow: 0 30px 80px -25px rgba(67, 56, 202, 0.3) !important;
-        border-color: rgba(255, 255, 255, 0.6) !important;
-    }
-
-    /* === ADVISOR NOTES === */
-    .advisor-note {
-        background: linear-gradient(135deg, 
-            rgba(219, 234, 254, 0.7) 0%, 
-            rgba(255, 255, 255, 0.85) 100%) !important;
-        backdrop-filter: blur(16px) !important;
-        border: 2px solid rgba(219, 234, 254, 0.4) !important;
-        border-radius: 24px !important;
-        padding: 32px !important;
-        margin: 32px 0 !important;
-        box-shadow: 0 20px 60px -30px rgba(59, 130, 246, 0.15) !important;
-    }
-
-    /* === SCENARIO PLANNING === */
-    .scenario-card {
-        background: linear-gradient(135deg, 
-            rgba(254, 249, 195, 0.7) 0%, 
-            rgba(255, 255, 255, 0.85) 100%) !important;
-        backdrop-filter: blur(16px) !important;
-        border: 2px solid rgba(254, 249, 195, 0.4) !important;
-        border-radius: 24px !important;
-        padding: 36px !important;
-        margin: 36px 0 !important;
-        box-shadow: 0 20px 60px -30px rgba(245, 158, 11, 0.15) !important;
-    }
-
-    /* === VIBRANT ACTION BUTTON === */
-    .stButton > button {
-        height: 64px !important;
-        font-size: 1.2rem !important;
-        background: linear-gradient(135deg, #4338CA 0%, #6366F1 50%, #06B6D4 100%) !important;
-        color: #FFFFFF !important;
-        border-radius: 16px !important;
-        box-shadow: 0 20px 40px -15px rgba(67, 56, 202, 0.4) !important;
-        font-family: 'Outfit', sans-serif !important;
-        font-weight: 700 !important;
-        letter-spacing: 0.5px !important;
-        border: none !important;
-        padding: 0 48px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        width: 100% !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    .stButton > button::before {
-        content: '' !important;
-        position: absolute !important;
-        top: 0 !important;
-        left: -100% !important;
-        width: 100% !important;
-        height: 100% !important;
-        background: linear-gradient(90deg, 
-            transparent, 
-            rgba(255, 255, 255, 0.2), 
-            transparent) !important;
-        transition: left 0.7s ease !important;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-6px) scale(1.02) !important;
-        box-shadow: 0 30px 60px -20px rgba(67, 56, 202, 0.5) !important;
-        background: linear-gradient(135deg, #3730A3 0%, #4F46E5 50%, #0891B2 100%) !important;
-    }
-
-    .stButton > button:hover::before {
-        left: 100% !important;
-    }
-
-    /* === CUSTOM TABS === */
-    .custom-tabs {
-        display: flex !important;
-        gap: 8px !important;
-        background: rgba(255, 255, 255, 0.6) !important;
-        backdrop-filter: blur(12px) !important;
-        padding: 8px !important;
-        border-radius: 20px !important;
-        margin: 40px 0 32px !important;
-        border: 2px solid rgba(255, 255, 255, 0.3) !important;
-        box-shadow: 0 12px 32px -12px rgba(0, 0, 0, 0.05) !important;
-    }
-
-    .custom-tab {
-        flex: 1 !important;
-        padding: 20px 32px !important;
-        text-align: center !important;
-        border-radius: 16px !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        font-weight: 600 !important;
-        color: #6B7280 !important;
-        font-family: 'Outfit', sans-serif !important;
-        background: transparent !important;
-        font-size: 1.05rem !important;
-    }
-
-    .custom-tab:hover {
-        background: rgba(255, 255, 255, 0.8) !important;
-        color: #4338CA !important;
-        transform: translateY(-2px) !important;
-    }
-
-    .custom-tab.active {
-        background: rgba(255, 255, 255, 0.95) !important;
-        color: #4338CA !important;
-        font-weight: 700 !important;
-        box-shadow: 0 8px 24px rgba(67, 56, 202, 0.1) !important;
-        border: 2px solid rgba(67, 56, 202, 0.2) !important;
-    }
-
-    /* === STATUS BADGES === */
-    .status-badge {
-        display: inline-flex !important;
-        align-items: center !important;
-        padding: 10px 20px !important;
-        border-radius: 20px !important;
-        font-size: 0.95rem !important;
-        font-weight: 700 !important;
-        margin-left: 12px !important;
-        font-family: 'Outfit', sans-serif !important;
-        backdrop-filter: blur(8px) !important;
-        border: 2px solid !important;
-        transition: all 0.3s ease !important;
-    }
-
-    .badge-excellent { 
-        background: rgba(67, 56, 202, 0.15) !important; 
-        color: #4338CA !important; 
-        border-color: rgba(67, 56, 202, 0.3) !important; 
-    }
-
-    .badge-good { 
-        background: rgba(16, 185, 129, 0.15) !important; 
-        color: #10B981 !important; 
-        border-color: rgba(16, 185, 129, 0.3) !important; 
-    }
-
-    .badge-poor { 
-        background: rgba(239, 68, 68, 0.15) !important; 
-        color: #EF4444 !important; 
-        border-color: rgba(239, 68, 68, 0.3) !important; 
-    }
-
-    /* === SECTION TITLES === */
-    .section-title {
-        font-size: 1.8rem !important;
-        margin-bottom: 40px !important;
-        padding-bottom: 20px !important;
-        border-bottom: 2px solid rgba(30, 27, 75, 0.1) !important;
-        position: relative !important;
-    }
-
-    .section-title::after {
-        content: '' !important;
-        position: absolute !important;
-        bottom: -2px !important;
-        left: 0 !important;
-        width: 120px !important;
-        height: 4px !important;
-        background: linear-gradient(90deg, #4338CA, #6366F1, #06B6D4) !important;
-        border-radius: 2px !important;
-    }
-
-    /* === RISK METER === */
-    .risk-meter {
-        height: 12px !important;
-        background: rgba(203, 213, 225, 0.3) !important;
-        border-radius: 6px !important;
-        margin: 24px 0 !important;
-        overflow: hidden !important;
-        position: relative !important;
-        backdrop-filter: blur(4px) !important;
-    }
-
-    .risk-fill {
-        height: 100% !important;
-        border-radius: 6px !important;
-        transition: width 1s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    /* === COLORED ICON WRAPPERS === */
-    .icon-wrapper {
-        display: inline-flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        width: 48px !important;
-        height: 48px !important;
-        border-radius: 14px !important;
-        font-size: 1.5rem !important;
-        margin-right: 20px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        backdrop-filter: blur(8px) !important;
-    }
-
-    .icon-wrapper.personal {
-        background: rgba(67, 56, 202, 0.15) !important;
-        color: #4338CA !important;
-        border: 2px solid rgba(67, 56, 202, 0.2) !important;
-    }
-
-    .icon-wrapper.financial {
-        background: rgba(139, 92, 246, 0.15) !important;
-        color: #7C3AED !important;
-        border: 2px solid rgba(139, 92, 246, 0.2) !important;
-    }
-
-    .icon-wrapper.credit {
-        background: rgba(16, 185, 129, 0.15) !important;
-        color: #10B981 !important;
-        border: 2px solid rgba(16, 185, 129, 0.2) !important;
-    }
-
-    .icon-wrapper:hover {
-        transform: rotate(15deg) scale(1.1) !important;
-        box-shadow: 0 12px 32px -8px rgba(0, 0, 0, 0.1) !important;
-    }
+# --- STATIC ASSETS (built once per server process) ---
+@st.cache_resource
+def load_model():
+    """Load and warm the scoring model once per server process rather than on a user's first click"""
+    registry.warm_up()
+    return registry
 
-    /* === RESULTS REVEAL ANIMATION === */
-    @keyframes fadeInUp {
-        from {
-            opacity: 0;
-            transform: translateY(40px) scale(0.95);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0) scale(1);
-        }
-    }
 
-    .results-section {
-        animation: fadeInUp 0.8s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
+@st.cache_data
+def static_asset(name):
+    with open(os.path.join(STATIC_DIR, name), encoding='utf-8') as f:
+        return f.read()
 
-    /* === SCROLLBAR STYLING === */
-    ::-webkit-scrollbar {
-        width: 10px;
-    }
 
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-    }
+@st.cache_resource
+def page_css():
+    """Minified <style> payload; comments and whitespace are a fifth of the stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', static_asset('style.css'), flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return f'<style>{css.strip()}</style>'
 
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(to bottom, #4338CA, #6366F1);
-        border-radius: 10px;
-    }
 
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(to bottom, #3730A3, #4F46E5);
-    }
-
-    /* === STYLISH PREMIUM HEADER === */
-    .premium-header {
-        background: linear-gradient(135deg, 
-            rgba(255, 255, 255, 0.85) 0%, 
-            rgba(255, 255, 255, 0.75) 100%) !important;
-        backdrop-filter: blur(32px) saturate(200%) !important;
-        -webkit-backdrop-filter: blur(32px) saturate(200%) !important;
-        border-radius: 32px !important;
-        padding: 40px 48px !important;
-        border: 2px solid rgba(255, 255, 255, 0.4) !important;
-        box-shadow: 
-            0 40px 100px -40px rgba(67, 56, 202, 0.25),
-            0 20px 40px -20px rgba(99, 102, 241, 0.15),
-            inset 0 1px 0 0 rgba(255, 255, 255, 0.3) !important;
-        margin: 0 0 48px 0 !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-
-    .premium-header::before {
-        content: '' !important;
-        position: absolute !important;
-        top: 0 !important;
-        left: 0 !important;
-        right: 0 !important;
-        height: 8px !important;
-        background: linear-gradient(90deg, 
-            #4338CA 0%, 
-            #6366F1 25%, 
-            #06B6D4 50%, 
-            #10B981 75%, 
-            #8B5CF6 100%) !important;
-        border-radius: 32px 32px 0 0 !important;
-    }
-
-    .logo-icon {
-        font-size: 3.5rem !important;
-        background: linear-gradient(135deg, #4338CA, #6366F1, #06B6D4) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        background-clip: text !important;
-        filter: drop-shadow(0 8px 16px rgba(67, 56, 202, 0.3)) !important;
-        animation: float 6s ease-in-out infinite !important;
-    }
+load_model()
+if not isinstance(registry.compiled(), CompiledModel):
+    # Reason codes and counterfactuals need the scorecard's folded weights; tree models are challengers only
+    st.error(f"The served model ({type(registry.model_data()['model']).__name__}) is not a logistic scorecard. "
+             "Retrain with tune.model=logistic to serve it here.")
+    st.stop()
 
-    @keyframes float {
-        0%, 100% { transform: translateY(0px) rotate(0deg); }
-        50% { transform: translateY(-8px) rotate(2deg); }
-    }
-
-    .floating-element {
-        position: absolute !important;
-        width: 80px !important;
-        height: 80px !important;
-        background: rgba(255, 255, 255, 0.2) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: 50% !important;
-        border: 2px solid rgba(255, 255, 255, 0.3) !important;
-        animation: float-random 15s ease-in-out infinite !important;
-    }
-
-    @keyframes float-random {
-        0%, 100% { transform: translate(0, 0) rotate(0deg); }
-        25% { transform: translate(20px, -15px) rotate(90deg); }
-        50% { transform: translate(-15px, 10px) rotate(180deg); }
-        75% { transform: translate(10px, 20px) rotate(270deg); }
-    }
-
-    .floating-element:nth-child(1) {
-        top: 20% !important;
-        left: 5% !important;
-        background: radial-gradient(circle, rgba(67, 56, 202, 0.15), transparent 70%) !important;
-    }
-
-    .floating-element:nth-child(2) {
-        bottom: 30% !important;
-        right: 10% !important;
-        width: 60px !important;
-        height: 60px !important;
-        background: radial-gradient(circle, rgba(6, 182, 212, 0.15), transparent 70%) !important;
-        animation-delay: -5s !important;
-    }
-
-    .floating-element:nth-child(3) {
-        top: 40% !important;
-        right: 8% !important;
-        width: 40px !important;
-        height: 40px !important;
-        background: radial-gradient(circle, rgba(139, 92, 246, 0.15), transparent 70%) !important;
-        animation-delay: -10s !important;
-    }
-
-    /* Subtle Model Accuracy Indicator */
-    .model-accuracy-indicator {
-        position: absolute;
-        top: 24px;
-        right: 32px;
-        font-size: 0.85rem;
-        color: #6B7280;
-        font-weight: 600;
-        display: flex;
-        align-items: center;
-        gap: 6px;
-        padding: 6px 12px;
-        background: rgba(255, 255, 255, 0.8);
-        border-radius: 16px;
-        border: 1px solid rgba(203, 213, 225, 0.4);
-        backdrop-filter: blur(8px);
-    }
-
-    .model-accuracy-value {
-        color: #7C3AED;
-        font-weight: 800;
-        font-size: 0.9rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# --- VIBRANT JEWEL-TONE FINANCIAL CSS ---
+st.markdown(page_css(), unsafe_allow_html=True)
 
 
 # --- HELPER FUNCTIONS ---
+@figure_cache.memoize
 def create_score_gauge(score):
     """Create a vibrant gauge chart for credit score visualization"""
     if score >= 750:
@@ -787,20 +115,19 @@ def create_score_gauge(score):
     return fig
 
 
-def create_radar_chart(utilization, delinquency, loan_to_income, age, income_score):
-    """Create a vibrant radar chart with violet-to-blue gradient"""
-    categories = ['Credit Utilization', 'Payment History', 'Loan-to-Income', 'Age Factor', 'Income Level']
+@figure_cache.memoize
+def create_radar_chart(utilization, delinquency, loan_to_income, tenure, accounts):
+    """Create a vibrant radar chart of the model's per-factor logit contributions"""
+    categories = ['Credit Utilization', 'Payment History', 'Loan-to-Income', 'Loan Tenure', 'Open Accounts']
 
-    # Normalize values to 0-100 scale with minimum 10
-    util_score = max(10, 100 - utilization * 0.8)
-    delinq_score = max(10, 100 - delinquency * 1.2)
-    lti_score = max(10, 100 - min(loan_to_income * 0.8, 90))
-    age_score = max(10, min(age * 1.5, 90)) if age < 65 else max(10, 100 - (age - 65) * 2)
-    inc_score = max(10, min(income_score, 90))
+    # Map each contribution onto 0-100: 50 is the reference applicant, higher means lower risk
+    util_score, delinq_score, lti_score, tenure_score, accounts_score = (
+        100 / (1 + np.exp(np.clip(contribution, -50, 50)))
+        for contribution in (utilization, delinquency, loan_to_income, tenure, accounts))
 
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
-        r=[util_score, delinq_score, lti_score, age_score, inc_score],
+        r=[util_score, delinq_score, lti_score, tenure_score, accounts_score],
         theta=categories,
         fill='toself',
         line_color='#7C3AED',
@@ -810,16 +137,16 @@ def create_radar_chart(utilization, delinquency, loan_to_income, age, income_sco
         line=dict(width=3, color='#7C3AED')
     ))
 
-    # Add benchmark with vibrant gradient
+    # Add the reference applicant with vibrant gradient
     fig.add_trace(go.Scatterpolar(
-        r=[80, 80, 80, 80, 80],
+        r=[50, 50, 50, 50, 50],
         theta=categories,
         fill='toself',
         line_color='#06B6D4',
         fillcolor='rgba(6, 182, 212, 0.15)',
-        name='Industry Benchmark',
+        name='Reference Applicant',
         line=dict(width=2, dash='dash', color='#06B6D4'),
-        hovertemplate='Benchmark: 80/100<extra></extra>'
+        hovertemplate='Reference: 50/100<extra></extra>'
     ))
 
     fig.update_layout(
@@ -862,36 +189,195 @@ def create_radar_chart(utilization, delinquency, loan_to_income, age, income_sco
         'utilization': util_score,
         'delinquency': delinq_score,
         'loan_to_income': lti_score,
-        'age': age_score,
-        'income': inc_score
+        'tenure': tenure_score,
+        'accounts': accounts_score
     }
 
 
-def calculate_potential_score(current_score, changes):
-    """Calculate potential score improvement based on scenario changes"""
-    potential = current_score
+NEXT_RATING = {'Poor': 'Average', 'Average': 'Good', 'Good': 'Excellent'}
 
-    # Income improvement
-    income_impact = min(changes.get('income_pct', 0) * 0.8, 40)
-    potential += income_impact
+TARGET_LABELS = [
+    ('credit_utilization_ratio', 'Credit utilization at or below', lambda v: f"{v:.0f}%"),
+    ('income', 'Annual income of at least', lambda v: f"₹{v:,.0f}"),
+    ('loan_amount', 'Loan amount at or below', lambda v: f"₹{v:,.0f}"),
+    ('delinquency_ratio', 'Delinquency ratio at or below', lambda v: f"{v:.0f}%"),
+    ('avg_dpd_per_delinquency', 'Average days past due at or below', lambda v: f"{v:.0f} days"),
+]
 
-    # Utilization improvement
-    util_change = max(changes.get('utilization_current', 30) - changes.get('utilization_target', 30), 0)
-    util_impact = min(util_change * 1.2, 60)
-    potential += util_impact
 
-    # Loan amount adjustment
-    loan_impact = min(max(changes.get('loan_adjustment', 0), -30), 0)
-    potential += loan_impact
+@st.cache_resource(max_entries=64)
+def scenario_grid(applicant_items, model_version):
+    """Every income/utilization scenario of one applicant, scored by the model in one vectorized call
 
-    return min(potential, 850), {
-        'income_impact': income_impact,
-        'util_impact': util_impact,
-        'loan_impact': loan_impact,
-        'total_improvement': income_impact + util_impact + loan_impact
+    model_version only keys the cache, so a reloaded artifact builds fresh grids.
+    """
+    return ScenarioGrid(dict(applicant_items))
+
+
+def calculate_potential_score(grid, changes):
+    """Model score of the scenario and the change attributable to each adjustment"""
+    impacts = grid.impacts(income_pct=changes.get('income_pct', 0),
+                           credit_utilization_ratio=changes.get('utilization_target'))
+    return grid.score() + impacts['total'], {
+        'income_impact': impacts['income_pct'],
+        'util_impact': impacts['credit_utilization_ratio'],
+        'loan_impact': 0,
+        'total_improvement': impacts['total']
     }
 
 
+@st.fragment
+def scenario_planner(results, credit_utilization, loan_amount, loan_tenure):
+    """Scenario sliders and their impact panel; moving a slider reruns only this fragment"""
+    grid = scenario_grid(tuple(results['applicant'].items()), artifact_version())
+    best_utilization, _ = grid.best('credit_utilization_ratio')
+
+    scenario_col1, scenario_col2 = st.columns(2)
+
+    with scenario_col1:
+        st.markdown('<div class="form-card results-section">', unsafe_allow_html=True)
+        st.markdown('<div class="form-header"><span class="icon-wrapper">📈</span> Improvement Scenarios</div>',
+                    unsafe_allow_html=True)
+
+        income_increase = st.slider(
+            'Income Increase (%)',
+            min_value=0,
+            max_value=50,
+            value=0,
+            help="Demonstrate the impact of potential salary growth or additional income"
+        )
+
+        utilization_target = st.slider(
+            'Target Credit Utilization (%)',
+            min_value=0,
+            max_value=100,
+            value=min(credit_utilization, 25),
+            help="Show benefits of reducing credit card usage"
+        )
+
+        st.markdown(
+            "<div style='margin-top: 24px; padding: 20px; background: rgba(255, 251, 235, 0.5); border-radius: 16px; border: 2px dashed #FDE68A;'>",
+            unsafe_allow_html=True)
+        st.markdown("<p style='margin: 0; color: #92400E !important; font-size: 0.95rem; font-weight: 600;'>",
+                    unsafe_allow_html=True)
+        st.markdown(
+            f"💡 <strong>Quick Optimization:</strong> Set utilization to {best_utilization:.0f}% to show maximum potential improvement.",
+            unsafe_allow_html=True)
+        st.markdown("</p>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with scenario_col2:
+        st.markdown('<div class="form-card results-section">', unsafe_allow_html=True)
+        st.markdown('<div class="form-header"><span class="icon-wrapper">🎯</span> Potential Impact</div>',
+                    unsafe_allow_html=True)
+
+        # Look up the scenario in the pre-scored grid
+        current_score = results['credit_score']
+        changes = {
+            'income_pct': income_increase,
+            'utilization_target': utilization_target
+        }
+
+        potential_score, impacts = calculate_potential_score(grid, changes)
+        score_improvement = impacts['total_improvement']
+
+        # Display current vs potential with vibrant styling
+        col_current, col_potential = st.columns(2)
+        with col_current:
+            st.markdown(f"""
+            <div style='text-align: center; padding: 24px; background: linear-gradient(135deg, rgba(219, 234, 254, 0.5), rgba(255, 255, 255, 0.8)); border-radius: 20px; border: 3px solid rgba(67, 56, 202, 0.3);'>
+                <div style='font-size: 1rem; color: #4338CA !important; margin-bottom: 12px; font-weight: 700;'>CURRENT SCORE</div>
+                <div style='font-size: 2.4rem; font-weight: 800; color: #4338CA !important;'>{current_score}</div>
+                <div style='font-size: 0.9rem; color: #6B7280 !important; margin-top: 8px; font-weight: 600;'>As-Is Profile</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col_potential:
+            improvement_color = "#4338CA" if score_improvement > 30 else "#10B981" if score_improvement > 15 else "#6B7280"
+            st.markdown(f"""
+            <div style='text-align: center; padding: 24px; background: linear-gradient(135deg, rgba(219, 250, 254, 0.5), rgba(255, 255, 255, 0.8)); border-radius: 20px; border: 3px solid rgba(6, 182, 212, 0.3);'>
+                <div style='font-size: 1rem; color: #06B6D4 !important; margin-bottom: 12px; font-weight: 700;'>POTENTIAL SCORE</div>
+                <div style='font-size: 2.4rem; font-weight: 800; color: #06B6D4 !important;'>{potential_score:.0f}</div>
+                <div style='font-size: 0.9rem; color: #06B6D4 !important; margin-top: 8px; font-weight: 600;'>Optimized Profile</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # IMPROVEMENT METER - Key Persuasive Element
+        improvement_percentage = max(score_improvement, 0) / 850 * 100
+        st.markdown(f"""
+        <div style='margin: 32px 0; padding: 28px; background: linear-gradient(135deg, rgba(255, 251, 235, 0.6), rgba(255, 255, 255, 0.8)); border-radius: 24px; border: 2px solid #FDE68A; text-align: center; box-shadow: 0 20px 60px -30px rgba(245, 158, 11, 0.2);'>
+            <div style='font-size: 1.1rem; color: #92400E !important; margin-bottom: 16px; font-weight: 700;'>POTENTIAL SCORE IMPROVEMENT</div>
+            <div style='font-size: 3.2rem; font-weight: 800; color: #F59E0B !important; margin: 16px 0; text-shadow: 0 4px 12px rgba(245, 158, 11, 0.2);'>{score_improvement:+.0f} POINTS</div>
+            <div style='height: 14px; background: rgba(245, 158, 11, 0.2); border-radius: 7px; margin: 24px 0; overflow: hidden;'>
+                <div style='height: 100%; width: {improvement_percentage}%; background: linear-gradient(90deg, #F59E0B, #D97706); border-radius: 7px; transition: width 0.6s ease;'></div>
+            </div>
+            <div style='font-size: 1.2rem; color: #92400E !important; font-weight: 700;'>
+                {score_improvement:.0f} points could unlock better interest rates and terms
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("**Impact Breakdown:**")
+        col_imp1, col_imp2, col_imp3 = st.columns(3)
+        with col_imp1:
+            st.metric("Income Impact", f"{impacts['income_impact']:+.0f} pts",
+                      delta="Significant" if impacts['income_impact'] > 20 else "Moderate" if impacts[
+                                                                                                  'income_impact'] > 10 else "Minimal",
+                      delta_color="normal")
+        with col_imp2:
+            st.metric("Utilization Impact", f"{impacts['util_impact']:+.0f} pts",
+                      delta="High Impact" if impacts['util_impact'] > 30 else "Moderate" if impacts[
+                                                                                                'util_impact'] > 15 else "Low",
+                      delta_color="normal")
+        with col_imp3:
+            st.metric("Loan Terms", f"{impacts['loan_impact']:.0f} pts",
+                      delta="Neutral" if impacts['loan_impact'] == 0 else "Negative",
+                      delta_color="inverse" if impacts['loan_impact'] < 0 else "normal")
+
+        # Exact single-input targets for the next rating band, solved from the model
+        next_rating = NEXT_RATING.get(results['rating'])
+        if next_rating:
+            targets = counterfactuals(results['applicant'], target_rating=next_rating)
+            lines = [f"- {label}: **{format_value(targets[name]['value'])}**"
+                     for name, label, format_value in TARGET_LABELS if targets[name]['feasible']]
+            if lines:
+                st.markdown(f"**Precise targets to reach {next_rating}** (one change at a time):\n" + "\n".join(lines))
+
+        st.markdown("---")
+
+        if score_improvement > 0:
+            interest_rate_improvement = min(score_improvement * 0.05, 2.5)
+            st.success(f"""
+            **🎯 Client Meeting Talking Points:**
+
+            "Based on our analysis, if we work together to reduce your credit utilization from **{credit_utilization}%** to **{utilization_target}%**, your credit score could improve by **{score_improvement:.0f} points**.
+
+            This improvement could potentially:
+            - **Reduce your interest rate** by up to **{interest_rate_improvement:.1f}%**
+            - **Save approximately ₹{(loan_amount * interest_rate_improvement / 100 * loan_tenure / 12):,.0f}** in interest over the loan term
+            - **Improve loan approval chances** for future applications
+
+            Would you like to discuss a specific action plan to achieve these improvements?"
+            """)
+        else:
+            st.info("""
+            **📊 Relationship Manager Insight:**
+
+            While there's limited immediate improvement potential, focusing on long-term financial discipline is key. 
+            Consider discussing:
+            - Credit utilization management strategies
+            - Income diversification opportunities
+            - Regular credit monitoring services
+
+            Building a strong financial foundation now will unlock better opportunities in the future.
+            """)
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+
 # --- SESSION STATE ---
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
@@ -1075,11 +561,20 @@ with st.container():
         debt_to_income = (monthly_emi * 12 / annual_income * 100) if annual_income > 0 else 0
 
         # Get prediction
-        prob, score, rating = predict(
-            age, annual_income, loan_amount, loan_tenure,
-            avg_dpd, delinquency_ratio, credit_utilization,
-            2, residence_type, "Home", "Secured"
-        )
+        applicant = {
+            'age': age,
+            'income': annual_income,
+            'loan_amount': loan_amount,
+            'loan_tenure_months': loan_tenure,
+            'avg_dpd_per_delinquency': avg_dpd,
+            'delinquency_ratio': delinquency_ratio,
+            'credit_utilization_ratio': credit_utilization,
+            'num_open_accounts': 2,
+            'residence_type': residence_type,
+            'loan_purpose': "Home",
+            'loan_type': "Secured"
+        }
+        prob, score, rating, explanation = cached_predict(**applicant, explain=True)
 
         # Store in session state
         st.session_state.prediction_results = {
@@ -1089,6 +584,9 @@ with st.container():
             'loan_to_income': loan_to_income,
             'debt_to_income': debt_to_income,
             'monthly_emi': monthly_emi,
+            'applicant': applicant,
+            'contributions': explanation['contributions'],
+            'reasons': explanation['reasons'],
             'raw_inputs': {
                 'age': age,
                 'annual_income': annual_income,
@@ -1260,16 +758,14 @@ with st.container():
                 "<h4 style='color: #1E1B4B !important; margin-bottom: 24px; font-size: 1.4rem;'>📊 Risk Factor Analysis</h4>",
                 unsafe_allow_html=True)
 
-            # Calculate income score
-            income_score = max(10, min(annual_income / 5000000 * 100, 90))
-
-            # Create vibrant radar chart
+            # Create vibrant radar chart from the model's factor contributions
+            contributions = results['contributions']
             radar_fig, radar_scores = create_radar_chart(
-                credit_utilization,
-                delinquency_ratio,
-                results['loan_to_income'],
-                age,
-                income_score
+                contributions['credit_utilization_ratio'],
+                contributions['delinquency_ratio'] + contributions['avg_dpd_per_delinquency'],
+                contributions['loan_to_income'],
+                contributions['loan_tenure_months'],
+                contributions['num_open_accounts']
             )
 
             st.plotly_chart(radar_fig, use_container_width=True)
@@ -1296,6 +792,12 @@ with st.container():
                     "<span style='color: #6B7280 !important; font-weight: 500;'>Overall profile is promising. Focus on maintaining financial discipline while optimizing key areas.</span>",
                     unsafe_allow_html=True)
 
+            if results['reasons']:
+                st.markdown(
+                    "<p style='margin: 16px 0 0 0; color: #6B7280 !important; font-weight: 500;'><strong>Reason codes:</strong> "
+                    + "; ".join(REASON_DESCRIPTIONS[reason] for reason in results['reasons']) + "</p>",
+                    unsafe_allow_html=True)
+
             st.markdown("</div>", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1368,161 +870,9 @@ with st.container():
         </div>
         """, unsafe_allow_html=True)
 
-        scenario_col1, scenario_col2 = st.columns(2)
-
-        with scenario_col1:
-            st.markdown('<div class="form-card results-section">', unsafe_allow_html=True)
-            st.markdown('<div class="form-header"><span class="icon-wrapper">📈</span> Improvement Scenarios</div>',
-                        unsafe_allow_html=True)
-
-            income_increase = st.slider(
-                'Income Increase (%)',
-                min_value=0,
-                max_value=50,
-                value=0,
-                help="Demonstrate the impact of potential salary growth or additional income"
-            )
-
-            utilization_target = st.slider(
-                'Target Credit Utilization (%)',
-                min_value=0,
-                max_value=100,
-                value=min(credit_utilization, 25),
-                help="Show benefits of reducing credit card usage"
-            )
-
-            st.markdown(
-                "<div style='margin-top: 24px; padding: 20px; background: rgba(255, 251, 235, 0.5); border-radius: 16px; border: 2px dashed #FDE68A;'>",
-                unsafe_allow_html=True)
-            st.markdown("<p style='margin: 0; color: #92400E !important; font-size: 0.95rem; font-weight: 600;'>",
-                        unsafe_allow_html=True)
-            st.markdown(
-                "💡 <strong>Quick Optimization:</strong> Set utilization to 20% to show maximum potential improvement.",
-                unsafe_allow_html=True)
-            st.markdown("</p>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        with scenario_col2:
-            st.markdown('<div class="form-card results-section">', unsafe_allow_html=True)
-            st.markdown('<div class="form-header"><span class="icon-wrapper">🎯</span> Potential Impact</div>',
-                        unsafe_allow_html=True)
-
-            # Calculate potential improvements
-            current_score = results['credit_score']
-            changes = {
-                'income_pct': income_increase,
-                'utilization_current': credit_utilization,
-                'utilization_target': utilization_target,
-                'loan_adjustment': 0
-            }
-
-            potential_score, impacts = calculate_potential_score(current_score, changes)
-            score_improvement = impacts['total_improvement']
-
-            # Display current vs potential with vibrant styling
-            col_current, col_potential = st.columns(2)
-            with col_current:
-                st.markdown(f"""
-                <div style='text-align: center; padding: 24px; background: linear-gradient(135deg, rgba(219, 234, 254, 0.5), rgba(255, 255, 255, 0.8)); border-radius: 20px; border: 3px solid rgba(67, 56, 202, 0.3);'>
-                    <div style='font-size: 1rem; color: #4338CA !important; margin-bottom: 12px; font-weight: 700;'>CURRENT SCORE</div>
-                    <div style='font-size: 2.4rem; font-weight: 800; color: #4338CA !important;'>{current_score}</div>
-                    <div style='font-size: 0.9rem; color: #6B7280 !important; margin-top: 8px; font-weight: 600;'>As-Is Profile</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_potential:
-                improvement_color = "#4338CA" if score_improvement > 30 else "#10B981" if score_improvement > 15 else "#6B7280"
-                st.markdown(f"""
-                <div style='text-align: center; padding: 24px; background: linear-gradient(135deg, rgba(219, 250, 254, 0.5), rgba(255, 255, 255, 0.8)); border-radius: 20px; border: 3px solid rgba(6, 182, 212, 0.3);'>
-                    <div style='font-size: 1rem; color: #06B6D4 !important; margin-bottom: 12px; font-weight: 700;'>POTENTIAL SCORE</div>
-                    <div style='font-size: 2.4rem; font-weight: 800; color: #06B6D4 !important;'>{potential_score:.0f}</div>
-                    <div style='font-size: 0.9rem; color: #06B6D4 !important; margin-top: 8px; font-weight: 600;'>Optimized Profile</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            # IMPROVEMENT METER - Key Persuasive Element
-            improvement_percentage = (score_improvement / 850) * 100
-            st.markdown(f"""
-            <div style='margin: 32px 0; padding: 28px; background: linear-gradient(135deg, rgba(255, 251, 235, 0.6), rgba(255, 255, 255, 0.8)); border-radius: 24px; border: 2px solid #FDE68A; text-align: center; box-shadow: 0 20px 60px -30px rgba(245, 158, 11, 0.2);'>
-                <div style='font-size: 1.1rem; color: #92400E !important; margin-bottom: 16px; font-weight: 700;'>POTENTIAL SCORE IMPROVEMENT</div>
-                <div style='font-size: 3.2rem; font-weight: 800; color: #F59E0B !important; margin: 16px 0; text-shadow: 0 4px 12px rgba(245, 158, 11, 0.2);'>+{score_improvement:.0f} POINTS</div>
-                <div style='height: 14px; background: rgba(245, 158, 11, 0.2); border-radius: 7px; margin: 24px 0; overflow: hidden;'>
-                    <div style='height: 100%; width: {improvement_percentage}%; background: linear-gradient(90deg, #F59E0B, #D97706); border-radius: 7px; transition: width 0.6s ease;'></div>
-                </div>
-                <div style='font-size: 1.2rem; color: #92400E !important; font-weight: 700;'>
-                    {score_improvement:.0f} points could unlock better interest rates and terms
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("**Impact Breakdown:**")
-            col_imp1, col_imp2, col_imp3 = st.columns(3)
-            with col_imp1:
-                st.metric("Income Impact", f"+{impacts['income_impact']:.0f} pts",
-                          delta="Significant" if impacts['income_impact'] > 20 else "Moderate" if impacts[
-                                                                                                      'income_impact'] > 10 else "Minimal",
-                          delta_color="normal")
-            with col_imp2:
-                st.metric("Utilization Impact", f"+{impacts['util_impact']:.0f} pts",
-                          delta="High Impact" if impacts['util_impact'] > 30 else "Moderate" if impacts[
-                                                                                                    'util_impact'] > 15 else "Low",
-                          delta_color="normal")
-            with col_imp3:
-                st.metric("Loan Terms", f"{impacts['loan_impact']:.0f} pts",
-                          delta="Neutral" if impacts['loan_impact'] == 0 else "Negative",
-                          delta_color="inverse" if impacts['loan_impact'] < 0 else "normal")
-
-            st.markdown("---")
-
-            if score_improvement > 0:
-                interest_rate_improvement = min(score_improvement * 0.05, 2.5)
-                st.success(f"""
-                **🎯 Client Meeting Talking Points:**
-
-                "Based on our analysis, if we work together to reduce your credit utilization from **{credit_utilization}%** to **{utilization_target}%**, your credit score could improve by **{score_improvement:.0f} points**.
-
-                This improvement could potentially:
-                - **Reduce your interest rate** by up to **{interest_rate_improvement:.1f}%**
-                - **Save approximately ₹{(loan_amount * interest_rate_improvement / 100 * loan_tenure / 12):,.0f}** in interest over the loan term
-                - **Improve loan approval chances** for future applications
-
-                Would you like to discuss a specific action plan to achieve these improvements?"
-                """)
-            else:
-                st.info("""
-                **📊 Relationship Manager Insight:**
-
-                While there's limited immediate improvement potential, focusing on long-term financial discipline is key. 
-                Consider discussing:
-                - Credit utilization management strategies
-                - Income diversification opportunities
-                - Regular credit monitoring services
-
-                Building a strong financial foundation now will unlock better opportunities in the future.
-                """)
-
-            st.markdown('</div>', unsafe_allow_html=True)
+        scenario_planner(results, credit_utilization, loan_amount, loan_tenure)
 
     st.markdown('</div>', unsafe_allow_html=True)
 
 # VIBRANT FOOTER
-st.markdown("""
-<div style="text-align: center; margin-top: 80px; padding: 40px; color: #6B7280 !important; font-size: 0.95rem; background: rgba(255, 255, 255, 0.8) !important; backdrop-filter: blur(20px); border-radius: 28px; border: 2px solid rgba(255, 255, 255, 0.4) !important; box-shadow: 0 30px 80px -20px rgba(67, 56, 202, 0.1);">
-    <p style="margin: 0 0 16px 0; font-family: 'Outfit', sans-serif; font-weight: 700; font-size: 1.2rem; color: #1E1B4B !important;">
-        EliteCredit Advisor Portal v4.4 | <span style="background: linear-gradient(90deg, #4338CA, #6366F1, #06B6D4); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 800;">Jewel-Tone Professional</span>
-    </p>
-    <p style="margin: 0; font-size: 0.9rem; color: #6B7280 !important; max-width: 900px; margin: 12px auto; line-height: 1.7; font-weight: 500;">
-        This vibrant interface combines deep navy readability with jewel-tone aesthetics to create a high-end, 
-        professional fintech experience designed for modern relationship management and client consultations.
-    </p>
-    <div style="margin-top: 28px; display: flex; justify-content: center; gap: 40px; font-size: 0.85rem; color: #9CA3AF !important; font-weight: 600;">
-        <span style="color: #4338CA !important;">🔐 ISO 27001 Certified</span>
-        <span style="color: #10B981 !important;">📊 Real-time Analytics</span>
-        <span style="color: #6366F1 !important;">🤖 AI-Powered Insights</span>
-        <span style="color: #06B6D4 !important;">👥 Client-Centric Design</span>
-        <span style="color: #8B5CF6 !important;">🎨 Vibrant Professional UI</span>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(static_asset('footer.html'), unsafe_allow_html=True)
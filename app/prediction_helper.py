@@ -1,17 +1,412 @@
-import joblib
+import os
+import threading
+import time
+
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
-# Path to the saved model and its components
-MODEL_PATH = 'artifacts/model_data.joblib'
+# Artifact paths are resolved next to this module so the CWD does not matter
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Path to the saved model and its components; the pickle-free JSON export (see artifact.py) is
+# preferred because it loads with NumPy alone
+JOBLIB_MODEL_PATH = os.path.join(PACKAGE_DIR, 'artifacts', 'model_data.joblib')
+JSON_MODEL_PATH = os.path.join(PACKAGE_DIR, 'artifacts', 'model_data.json')
+MODEL_PATH = JSON_MODEL_PATH if os.path.exists(JSON_MODEL_PATH) else JOBLIB_MODEL_PATH
+
+# Optional precompute mode: score through per-input float32 lookup tables instead of multiplications
+PRECOMPUTE_TABLES = os.environ.get('CREDIT_RISK_PRECOMPUTE_TABLES', '') == '1'
+
+# drift.DriftMonitor counting every applicant predict and predict_batch score; set by drift.enable()
+drift_monitor = None
+
+# Legacy module globals, now served lazily from the registry
+_MODEL_DATA_ATTRIBUTES = {'model': 'model', 'scaler': 'scaler', 'features': 'features',
+                          'cols_to_scale': 'cols_to_scale'}
+
+# Raw applicant fields accepted by predict and predict_batch, in call order
+INPUT_FIELDS = ['age', 'income', 'loan_amount', 'loan_tenure_months', 'avg_dpd_per_delinquency',
+                'delinquency_ratio', 'credit_utilization_ratio', 'num_open_accounts', 'residence_type',
+                'loan_purpose', 'loan_type']
+
+# Lower bounds of the Poor/Average/Good/Excellent bands used by calculate_credit_score
+RATING_BOUNDS = np.array([300, 500, 650, 750])
+RATING_LABELS = np.array(['Undefined', 'Poor', 'Average', 'Good', 'Excellent', 'Undefined'], dtype=object)
+
+# Model columns fed straight from a numeric input (predict argument name on the right)
+NUMERIC_FEATURES = {
+    'age': 'age',
+    'loan_tenure_months': 'loan_tenure_months',
+    'number_of_open_accounts': 'num_open_accounts',
+    'credit_utilization_ratio': 'credit_utilization_ratio',
+    'loan_to_income': 'loan_to_income',
+    'delinquency_ratio': 'delinquency_ratio',
+    'avg_dpd_per_delinquency': 'avg_dpd_per_delinquency',
+}
+
+# Categorical inputs one-hot encoded as '<field>_<level>' model columns
+CATEGORICAL_FIELDS = ['residence_type', 'loan_purpose', 'loan_type']
+
+# Adverse-action wording for each factor returned as a reason code
+REASON_DESCRIPTIONS = {
+    'age': "Applicant age",
+    'loan_tenure_months': "Long loan tenure",
+    'num_open_accounts': "Number of open credit accounts",
+    'credit_utilization_ratio': "High credit utilization",
+    'loan_to_income': "Loan amount high relative to income",
+    'delinquency_ratio': "Share of delinquent months",
+    'avg_dpd_per_delinquency': "Days past due per delinquency",
+    'residence_type': "Residence type",
+    'loan_purpose': "Loan purpose",
+    'loan_type': "Unsecured loan",
+}
+
+# Integer domains of the Streamlit inputs tabulated by LookupTables: input -> (first, last)
+TABLE_DOMAINS = {
+    'age': (18, 100),
+    'loan_tenure_months': (12, 360),
+    'num_open_accounts': (0, 10),
+    'credit_utilization_ratio': (0, 100),
+    'delinquency_ratio': (0, 100),
+    'avg_dpd_per_delinquency': (0, 365),
+}
+
+# Fields prepare_input fills with the constant 1 just for scaling purpose
+DUMMY_FIELDS = ['number_of_dependants', 'years_at_current_address', 'zipcode', 'sanction_amount',
+                'processing_fee', 'gst', 'net_disbursement', 'principal_outstanding',
+                'bank_balance_at_application', 'number_of_closed_accounts', 'enquiry_count']
+
+
+class CompiledModel:
+    """Logistic scorecard folded into one weight per raw input plus a bias
+
+    reference holds the kernel input values of the reference applicant that contributions are
+    measured against; categorical fields are referenced to their base (all-zero dummy) level.
+    """
+
+    def __init__(self, numeric_inputs, numeric_weights, categorical_weights, bias, reference=None):
+        self.numeric_inputs = tuple(numeric_inputs)
+        self.numeric_weights = np.asarray(numeric_weights, dtype=float)
+        self.categorical_weights = categorical_weights
+        self.bias = float(bias)
+        # Plain Python floats keep the single-row path free of NumPy scalar overhead
+        self._numeric_pairs = tuple(zip(self.numeric_inputs, self.numeric_weights.tolist()))
+        self._tables = None
+        self.reference = {name: float((reference or {}).get(name, 0.0)) for name in self.numeric_inputs}
+        self.factors = self.numeric_inputs + tuple(self.categorical_weights)
+        self._reference_pairs = tuple((name, weight, self.reference[name]) for name, weight in self._numeric_pairs)
+
+    def logit(self, values):
+        """Log-odds of default for one applicant given a mapping of kernel inputs"""
+        x = self.bias
+        for name, weight in self._numeric_pairs:
+            x += weight * values[name]
+        for field, levels in self.categorical_weights.items():
+            x += levels.get(values[field], 0.0)
+        return x
+
+    def logit_batch(self, columns, contributions=None):
+        """Vectorized logit over a mapping of kernel inputs to equal-length arrays
+
+        If contributions is a (len(factors), n_rows) array it is filled with each factor's contribution
+        on the way, leaving the logit bit-identical to the plain call.
+        """
+        n_rows = len(columns[self.numeric_inputs[0]])
+        x = np.full(n_rows, self.bias)
+        # Accumulate in the same order as logit so both paths agree bit for bit
+        for j, (name, weight) in enumerate(self._numeric_pairs):
+            term = weight * np.asarray(columns[name], dtype=float)
+            x += term
+            if contributions is not None:
+                np.subtract(term, weight * self.reference[name], out=contributions[j])
+        for j, (field, levels) in enumerate(self.categorical_weights.items(), start=len(self.numeric_inputs)):
+            column = np.asarray(columns[field])
+            if contributions is not None:
+                contributions[j] = 0.0
+            for level, weight in levels.items():
+                term = np.where(column == level, weight, 0.0)
+                x += term
+                if contributions is not None:
+                    contributions[j] += term
+        return x
+
+    def contributions(self, values):
+        """Logit contribution of each factor relative to the reference applicant; positive raises risk"""
+        result = {name: weight * (values[name] - reference) for name, weight, reference in self._reference_pairs}
+        for field, levels in self.categorical_weights.items():
+            result[field] = levels.get(values[field], 0.0)
+        return result
+
+    def contributions_batch(self, columns):
+        """(len(factors), n_rows) matrix of contributions, rows ordered as self.factors"""
+        contributions = np.empty((len(self.factors), len(columns[self.numeric_inputs[0]])))
+        self.logit_batch(columns, contributions)
+        return contributions
+
+    def tables(self):
+        """LookupTables for this model, built on first use; a reloaded artifact compiles a fresh model"""
+        if self._tables is None:
+            self._tables = LookupTables(self)
+        return self._tables
+
+
+class LookupTables:
+    """Logit contribution of every value in TABLE_DOMAINS, so a score is a few table reads and a sum
+
+    Only loan_to_income, a ratio of two free amounts, is still multiplied. Values outside a domain,
+    with a fractional part or not finite fall back to weight * value, as CompiledModel computes them.
+    """
+
+    def __init__(self, compiled, domains=TABLE_DOMAINS):
+        self.bias = compiled.bias
+        self.weights = dict(compiled._numeric_pairs)
+        self.offsets, self.tables = {}, {}
+        for name, weight in compiled._numeric_pairs:
+            if name in domains:
+                first, last = domains[name]
+                self.offsets[name] = first
+                self.tables[name] = (weight * np.arange(first, last + 1)).astype(np.float32)
+        self.categorical_weights = {field: {level: float(np.float32(weight)) for level, weight in levels.items()}
+                                    for field, levels in compiled.categorical_weights.items()}
+        self.multiplied = tuple((name, weight) for name, weight in compiled._numeric_pairs if name not in self.tables)
+        # Python float copies of the float32 tables keep the single-row path free of NumPy scalars
+        self._rows = {name: (self.offsets[name], table.tolist()) for name, table in self.tables.items()}
+
+    @property
+    def nbytes(self):
+        return sum(table.nbytes for table in self.tables.values())
+
+    def logit(self, values):
+        x = self.bias
+        for name, (first, row) in self._rows.items():
+            value = values[name]
+            i = value - first
+            # Range first: NaN fails it and infinities never reach int()
+            if 0 <= i < len(row) and i == int(i):
+                x += row[int(i)]
+            else:
+                x += self.weights[name] * value
+        for name, weight in self.multiplied:
+            x += weight * values[name]
+        for field, levels in self.categorical_weights.items():
+            x += levels.get(values[field], 0.0)
+        return x
+
+    def logit_batch(self, columns):
+        n_rows = len(columns[next(iter(self.weights))])
+        x = np.full(n_rows, self.bias)
+        for name, table in self.tables.items():
+            column = np.asarray(columns[name], dtype=float)
+            # Casting NaN or infinities gives an arbitrary index, which the exact mask then rejects
+            with np.errstate(invalid='ignore'):
+                index = column.astype(np.int64) - self.offsets[name]
+            exact = (index + self.offsets[name] == column) & (index >= 0) & (index < len(table))
+            if exact.all():
+                x += table[index]
+            else:
+                x += np.where(exact, table[np.where(exact, index, 0)], self.weights[name] * column)
+        for name, weight in self.multiplied:
+            x += weight * np.asarray(columns[name], dtype=float)
+        for field, levels in self.categorical_weights.items():
+            column = np.asarray(columns[field])
+            for level, weight in levels.items():
+                x += np.where(column == level, weight, 0.0)
+        return x
+
+
+class EstimatorModel:
+    """Non-linear model (random forest, XGBoost, ...) scored through its own predict_proba
+
+    The scaled one-hot feature matrix prepare_input would build is assembled for a whole batch at
+    once. Used for challengers; it has no folded weights, so no contributions or lookup tables.
+    """
+
+    def __init__(self, model_data):
+        self.model = model_data['model']
+        self.features = list(model_data['features'])
+        scaler = model_data['scaler']
+        positions = {col: i for i, col in enumerate(model_data['cols_to_scale'])}
+        self.scale = np.array([scaler.scale_[positions[col]] if col in positions else 1.0 for col in self.features])
+        self.offset = np.array([scaler.min_[positions[col]] if col in positions else 0.0 for col in self.features])
+
+    def feature_matrix(self, columns):
+        n_rows = len(columns['age'])
+        matrix = np.ones((n_rows, len(self.features)))
+        for j, col in enumerate(self.features):
+            if col in NUMERIC_FEATURES:
+                matrix[:, j] = columns[NUMERIC_FEATURES[col]]
+            elif col not in DUMMY_FIELDS:
+                field = next((f for f in CATEGORICAL_FIELDS if col.startswith(f + '_')), None)
+                if field is None:
+                    raise ValueError(f"Cannot score unknown model feature: {col}")
+                matrix[:, j] = np.asarray(columns[field]) == col[len(field) + 1:]
+        return matrix * self.scale + self.offset
+
+    def logit_batch(self, columns):
+        import pandas as pd
+
+        X = pd.DataFrame(self.feature_matrix(columns), columns=self.features)
+        probability = np.clip(self.model.predict_proba(X)[:, 1], 1e-15, 1 - 1e-15)
+        return np.log(probability / (1 - probability))
+
+    def logit(self, values):
+        return float(self.logit_batch({name: [value] for name, value in values.items()})[0])
+
+
+def scorer(compiled):
+    """What scores come from: compiled's LookupTables when CREDIT_RISK_PRECOMPUTE_TABLES=1, else compiled
+
+    Every serving path picks its scorer here, so single, batch, explained and shadowed scores agree.
+    Estimator models have no tables and are returned as they are.
+    """
+    return compiled.tables() if PRECOMPUTE_TABLES and isinstance(compiled, CompiledModel) else compiled
+
+
+def compile_model(model_data):
+    """Fold the MinMax scaler and logistic coefficients of model_data into a CompiledModel
+
+    The contribution reference is model_data['reference'] (kernel input -> value), the training-population
+    mean that train stores at export. Artifacts written before that fall back to the midpoint of each
+    input's training range from the scaler. Models without coefficients are wrapped in an EstimatorModel.
+    """
+    model = model_data['model']
+    if not hasattr(model, 'coef_'):
+        return EstimatorModel(model_data)
+    scaler = model_data['scaler']
+    scaled_positions = {col: i for i, col in enumerate(model_data['cols_to_scale'])}
+
+    coefficients = model.coef_.ravel()
+    bias = float(model.intercept_[0])
+    numeric_inputs, numeric_weights = [], []
+    categorical_weights = {field: {} for field in CATEGORICAL_FIELDS}
+    reference = {}
+
+    for col, coef in zip(model_data['features'], coefficients):
+        # A scaled column contributes coef * (value * scale + min)
+        if col in scaled_positions:
+            scale = scaler.scale_[scaled_positions[col]]
+            offset = scaler.min_[scaled_positions[col]]
+        else:
+            scale, offset = 1.0, 0.0
+
+        if col in NUMERIC_FEATURES:
+            numeric_inputs.append(NUMERIC_FEATURES[col])
+            numeric_weights.append(coef * scale)
+            bias += coef * offset
+            if col in scaled_positions:
+                i = scaled_positions[col]
+                reference[NUMERIC_FEATURES[col]] = (scaler.data_min_[i] + scaler.data_max_[i]) / 2
+        elif col in DUMMY_FIELDS:
+            # Dummy fields are always 1, so their whole contribution is constant
+            bias += coef * (scale + offset)
+        else:
+            field = next((f for f in CATEGORICAL_FIELDS if col.startswith(f + '_')), None)
+            if field is None:
+                raise ValueError(f"Cannot compile unknown model feature: {col}")
+            categorical_weights[field][col[len(field) + 1:]] = coef * scale
+            bias += coef * offset
+
+    reference.update(model_data.get('reference') or {})
+    return CompiledModel(numeric_inputs, numeric_weights, categorical_weights, bias, reference)
+
+
+def read_model_data(path):
+    """model_data dict from a .json artifact (NumPy only) or a legacy joblib pickle"""
+    if path.endswith('.json'):
+        from artifact import load_artifact
+
+        return load_artifact(path)
+    # joblib pulls in sklearn, so it is only imported when a pickle is actually read
+    import joblib
+
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """Loads model artifacts on first use and caches the compiled model per (path, mtime, size)"""
+
+    def __init__(self, default_path=MODEL_PATH):
+        self.default_path = os.path.normpath(os.path.join(PACKAGE_DIR, default_path))
+        self._entries = {}  # (path, mtime_ns, size) -> (model_data, CompiledModel)
+        self._current = {}  # path -> key of the entry served by get()
+        self._lock = threading.RLock()
+        self.load_seconds = {}
+        self.names = {}  # model name -> artifact path, see register()
+
+    def register(self, name, path):
+        """Make an artifact addressable by name wherever a path is accepted"""
+        self.names[name] = self.resolve(path)
+
+    def resolve(self, path=None):
+        # Registered names map to their artifact; relative paths are taken relative to this package
+        path = self.names.get(path, path)
+        return os.path.normpath(os.path.join(PACKAGE_DIR, path or self.default_path))
+
+    def load(self, path=None):
+        """Stat the artifact and return its (model_data, CompiledModel), loading it if it changed"""
+        key = self.version(path)
+
+        with self._lock:
+            if key not in self._entries:
+                start = time.perf_counter()
+                model_data = read_model_data(key[0])
+                self.install(key, model_data, compile_model(model_data))
+                self.load_seconds[key] = time.perf_counter() - start
+            self._current[key[0]] = key
+            return self._entries[key]
 
-# Load the model and its components
-model_data = joblib.load(MODEL_PATH)
-model = model_data['model']
-scaler = model_data['scaler']
-features = model_data['features']
-cols_to_scale = model_data['cols_to_scale']
+    def install(self, key, model_data, compiled):
+        """Serve an already loaded version of an artifact from now on, keyed like version()
+
+        Readers switch on a single dict assignment; anything already holding the old CompiledModel
+        finishes with it.
+        """
+        path = key[0]
+        with self._lock:
+            self._entries[key] = (model_data, compiled)
+            self._current[path] = key
+            # Drop stale versions only once readers point at the new one
+            for old_key in [k for k in self._entries if k[0] == path and k != key]:
+                del self._entries[old_key]
+                self.load_seconds.pop(old_key, None)
+
+    def get(self, path=None):
+        # Fast path for scoring: no stat once the artifact has been loaded
+        key = self._current.get(self.resolve(path) if path else self.default_path)
+        entry = self._entries.get(key) if key else None
+        return entry if entry is not None else self.load(path)
+
+    def version(self, path=None):
+        """(path, mtime_ns, size) of the artifact on disk; changes whenever it is replaced"""
+        path = self.resolve(path)
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def compiled(self, path=None):
+        return self.get(path)[1]
+
+    def model_data(self, path=None):
+        return self.get(path)[0]
+
+    def warm_up(self, path=None):
+        """Load and exercise the model ahead of traffic; returns the elapsed seconds"""
+        start = time.perf_counter()
+        self.load(path)
+        predict(32, 1200000, 5000000, 36, 5, 10, 35, 2, 'Owned', 'Home', 'Secured')
+        return time.perf_counter() - start
+
+
+registry = ModelRegistry()
+
+
+def __getattr__(name):
+    # Keep prediction_helper.model / .scaler / .model_data / .compiled_model working without import-time I/O
+    if name in _MODEL_DATA_ATTRIBUTES:
+        return registry.model_data()[_MODEL_DATA_ATTRIBUTES[name]]
+    if name == 'model_data':
+        return registry.model_data()
+    if name == 'compiled_model':
+        return registry.compiled()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
@@ -46,6 +441,13 @@ def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_deli
         'enquiry_count': 1  # Dummy value
     }
 
+    import pandas as pd
+
+    model_data = registry.model_data()
+    scaler = model_data['scaler']
+    features = model_data['features']
+    cols_to_scale = model_data['cols_to_scale']
+
     # Ensure all columns for features and cols_to_scale are present
     df = pd.DataFrame([input_data])
 
@@ -60,18 +462,122 @@ def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_deli
 
 def predict(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
             delinquency_ratio, credit_utilization_ratio, num_open_accounts,
-            residence_type, loan_purpose, loan_type):
-    # Prepare input data
-    input_df = prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
-                             delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
-                             loan_purpose, loan_type)
+            residence_type, loan_purpose, loan_type, explain=False, top_n=4):
+    """(default probability, credit score, rating); with explain=True an explanation dict is appended
+
+    The explanation holds 'contributions' (factor -> logit contribution versus the reference applicant)
+    and 'reasons', the top_n factors that raise risk the most, largest first.
+    """
+    compiled = registry.compiled()
+    values = {
+        'age': age,
+        'loan_tenure_months': loan_tenure_months,
+        'num_open_accounts': num_open_accounts,
+        'credit_utilization_ratio': credit_utilization_ratio,
+        'loan_to_income': loan_amount / income if income > 0 else 0,
+        'delinquency_ratio': delinquency_ratio,
+        'avg_dpd_per_delinquency': avg_dpd_per_delinquency,
+        'residence_type': residence_type,
+        'loan_purpose': loan_purpose,
+        'loan_type': loan_type,
+    }
+    x = scorer(compiled).logit(values)
+
+    default_probability = 1 / (1 + np.exp(-x))
+    credit_score = 300 + (1 - default_probability) * 600
+    if drift_monitor is not None:
+        drift_monitor.add(values, int(credit_score))
+
+    if not explain:
+        return default_probability, int(credit_score), get_rating(credit_score)
+    contributions = compiled.contributions(values)
+    reasons = sorted((name for name, value in contributions.items() if value > 0),
+                     key=contributions.get, reverse=True)[:top_n]
+    return default_probability, int(credit_score), get_rating(credit_score), {
+        'contributions': contributions, 'reasons': reasons}
+
+
+def kernel_inputs(inputs):
+    # Map a DataFrame or a dict of INPUT_FIELDS arrays onto the columns the compiled model reads
+    columns = {name: np.asarray(inputs[name]) for name in INPUT_FIELDS}
+    income = columns['income'].astype(float)
+    loan_amount = columns['loan_amount'].astype(float)
+    columns['loan_to_income'] = np.divide(loan_amount, income, out=np.zeros(len(income)), where=income > 0)
+    return columns
+
+
+def predict_batch(inputs, explain=False, top_n=4):
+    # Score many applicants at once; returns arrays of probability, credit score and rating, plus
+    # the contribution matrix and reason codes (see reason_codes) when explain is set
+    compiled = registry.compiled()
+    columns = kernel_inputs(inputs)
+    scoring = scorer(compiled)
+    if not explain:
+        results = scores_from_logits(scoring.logit_batch(columns))
+        if drift_monitor is not None:
+            drift_monitor.update(columns, results[1])
+        return results
+    if scoring is compiled:
+        # Contributions are collected during the same pass that scores, not in a second one
+        contributions = np.empty((len(compiled.factors), len(columns['age'])))
+        results = scores_from_logits(compiled.logit_batch(columns, contributions))
+    else:
+        # Scores from the tables, as without explain; contributions come from the exact weights
+        results = scores_from_logits(scoring.logit_batch(columns))
+        contributions = compiled.contributions_batch(columns)
+    if drift_monitor is not None:
+        drift_monitor.update(columns, results[1])
+    return results + (contributions.T, reason_codes(contributions, compiled.factors, top_n))
+
+
+def reason_codes(contributions, factors, top_n=4):
+    """(n_rows, top_n) object array of the factors raising risk the most per row, None once they run out
+
+    contributions is factor-major, shaped (len(factors), n_rows), as filled by logit_batch.
+    """
+    factors = np.asarray(factors + (None,), dtype=object)
+    remaining = contributions.copy()
+    rows = np.arange(remaining.shape[1])
+    top = np.empty((min(top_n, len(remaining)), remaining.shape[1]), dtype=np.intp)
+    # top_n argmax passes beat a full sort; argmax takes the first maximum, so ties rank in factor
+    # order exactly as in predict
+    for k in range(len(top)):
+        best = remaining.argmax(axis=0)
+        top[k] = np.where(remaining[best, rows] > 0, best, len(factors) - 1)
+        remaining[best, rows] = -np.inf
+    return factors[top.T]
 
-    probability, credit_score, rating = calculate_credit_score(input_df)
 
-    return probability, credit_score, rating
+def scores_from_logits(x):
+    # Probability, integer credit score and rating arrays from an array of default log-odds
+    default_probability = 1 / (1 + np.exp(-x))
+    credit_score = 300 + (1 - default_probability) * 600
+
+    return default_probability, credit_score.astype(int), get_ratings(credit_score)
+
+
+def get_rating(score):
+    if 300 <= score < 500:
+        return 'Poor'
+    elif 500 <= score < 650:
+        return 'Average'
+    elif 650 <= score < 750:
+        return 'Good'
+    elif 750 <= score <= 900:
+        return 'Excellent'
+    else:
+        return 'Undefined'  # in case of any unexpected score
+
+
+def get_ratings(scores):
+    # Vectorized get_rating: band lookup by lower bound, anything outside [300, 900] is Undefined
+    band = np.searchsorted(RATING_BOUNDS, scores, side='right')
+    band[~(scores <= 900)] = len(RATING_LABELS) - 1
+    return RATING_LABELS[band]
 
 
 def calculate_credit_score(input_df, base_score=300, scale_length=600):
+    model = registry.model_data()['model']
     x = np.dot(input_df.values, model.coef_.T) + model.intercept_
 
     # Apply the logistic function to calculate the probability
@@ -83,18 +589,113 @@ def calculate_credit_score(input_df, base_score=300, scale_length=600):
     credit_score = base_score + non_default_probability.flatten() * scale_length
 
     # Determine the rating category based on the credit score
-    def get_rating(score):
-        if 300 <= score < 500:
-            return 'Poor'
-        elif 500 <= score < 650:
-            return 'Average'
-        elif 650 <= score < 750:
-            return 'Good'
-        elif 750 <= score <= 900:
-            return 'Excellent'
-        else:
-            return 'Undefined'  # in case of any unexpected score
-
     rating = get_rating(credit_score[0])
 
     return default_probability.flatten()[0], int(credit_score[0]), rating
+
+
+# Inputs an advisor can act on, with the range each may take; the model is linear in all of them
+ACTIONABLE_BOUNDS = {
+    'income': (1, np.inf),
+    'loan_amount': (0, np.inf),
+    'loan_tenure_months': (1, np.inf),
+    'avg_dpd_per_delinquency': (0, np.inf),
+    'delinquency_ratio': (0, 100),
+    'credit_utilization_ratio': (0, 100),
+    'num_open_accounts': (0, np.inf),
+}
+
+
+def _applicant_logit(compiled, applicant):
+    values = dict(applicant)
+    income, loan_amount = applicant['income'], applicant['loan_amount']
+    values['loan_to_income'] = loan_amount / income if income > 0 else 0
+    return compiled.logit(values)
+
+
+def _applicant_score(scoring, applicant):
+    # The credit score predict would return, without counting the applicant in the drift monitor
+    return int(300 + (1 - 1 / (1 + np.exp(-_applicant_logit(scoring, applicant)))) * 600)
+
+
+def score_gradients(applicant):
+    """Change in credit score per unit increase of each actionable input, at the applicant's values
+
+    applicant is a mapping of INPUT_FIELDS. Scores fall as default log-odds rise, so inputs with a
+    positive model weight have negative gradients.
+    """
+    compiled = registry.compiled()
+    weights = dict(compiled._numeric_pairs)
+    probability = 1 / (1 + np.exp(-_applicant_logit(compiled, applicant)))
+    # score = 300 + 600 * (1 - sigmoid(x)), so dscore/dx = -600 * p * (1 - p)
+    dscore_dx = -600 * probability * (1 - probability)
+
+    income, loan_amount = float(applicant['income']), float(applicant['loan_amount'])
+    lti_weight = weights.get('loan_to_income', 0.0)
+    gradients = {name: dscore_dx * weights.get(name, 0.0) for name in ACTIONABLE_BOUNDS}
+    gradients['income'] = dscore_dx * lti_weight * (-loan_amount / income ** 2) if income > 0 else 0.0
+    gradients['loan_amount'] = dscore_dx * lti_weight / income if income > 0 else 0.0
+    return gradients
+
+
+def target_logit(target_score):
+    # Log-odds of default at which 300 + (1 - p) * 600 equals target_score
+    probability = 1 - (target_score - 300) / 600
+    return np.log(probability / (1 - probability))
+
+
+def counterfactuals(applicant, target_score=None, target_rating=None):
+    """Value each actionable input needs, all else equal, for predict to reach a target score
+
+    Pass target_score or target_rating ('Average', 'Good', 'Excellent'; the band's lower bound is
+    used). Returns {input: {'value', 'change', 'feasible'}}: value is the nearest whole number in the
+    improving direction (verified against predict), change is value minus the current input, and
+    feasible is False when the value falls outside ACTIONABLE_BOUNDS or the input has no effect.
+    """
+    if target_rating is not None:
+        target_score = int(RATING_BOUNDS[list(RATING_LABELS[1:5]).index(target_rating)])
+    if target_score is None or not 300 < target_score < 900:
+        raise ValueError("target_score must lie strictly between 300 and 900")
+
+    compiled = registry.compiled()
+    # The model predict scores with, called directly so checked candidates are not seen as traffic
+    scoring = scorer(compiled)
+    weights = dict(compiled._numeric_pairs)
+    x_needed = target_logit(target_score)
+    gap = x_needed - _applicant_logit(scoring, applicant)
+
+    income, loan_amount = float(applicant['income']), float(applicant['loan_amount'])
+    lti = loan_amount / income if income > 0 else 0
+    lti_weight = weights.get('loan_to_income', 0.0)
+
+    results = {}
+    for name, (low, high) in ACTIONABLE_BOUNDS.items():
+        current = float(applicant[name])
+        if gap >= 0:
+            # Already at or above the target
+            results[name] = {'value': current, 'change': 0.0, 'feasible': True}
+            continue
+
+        if name in ('income', 'loan_amount'):
+            lti_needed = lti + gap / lti_weight if lti_weight else np.nan
+            if name == 'loan_amount':
+                exact = lti_needed * income
+            else:
+                exact = loan_amount / lti_needed if lti_needed > 0 else np.inf
+        else:
+            weight = weights.get(name, 0.0)
+            exact = current + gap / weight if weight else np.nan
+
+        if not np.isfinite(exact):
+            results[name] = {'value': exact, 'change': np.nan, 'feasible': False}
+            continue
+
+        # Round in the improving direction, then step once more if truncation to an integer score
+        # leaves predict a point short at the boundary
+        step = 1.0 if exact > current else -1.0
+        value = float(np.ceil(exact) if step > 0 else np.floor(exact))
+        candidate = dict(applicant, **{name: value})
+        if _applicant_score(scoring, candidate) < target_score:
+            value += step
+        results[name] = {'value': value, 'change': value - current, 'feasible': bool(low <= value <= high)}
+    return results
@@ -0,0 +1,87 @@
+import numpy as np
+
+from prediction_helper import INPUT_FIELDS, kernel_inputs, registry, scorer, scores_from_logits
+
+# Default perturbation axes, matching the scenario sliders of the Streamlit app
+INCOME_INCREASE_PCT = np.arange(0, 51)
+UTILIZATION_TARGETS = np.arange(0, 101)
+
+SCENARIO_AXES = ('income_pct', 'credit_utilization_ratio', 'loan_amount', 'loan_tenure_months')
+
+
+class ScenarioGrid:
+    """Model scores for every combination of income, utilization, loan amount and tenure around one applicant
+
+    The whole grid is scored in one vectorized pass when it is built; reading a scenario afterwards is
+    an array lookup, so interactive sliders never go back to the model.
+    """
+
+    def __init__(self, base, income_pct=INCOME_INCREASE_PCT, credit_utilization_ratio=UTILIZATION_TARGETS,
+                 loan_amount=None, loan_tenure_months=None):
+        self.base = {field: base[field] for field in INPUT_FIELDS}
+        self.axes = {
+            'income_pct': np.asarray(income_pct, dtype=float),
+            'credit_utilization_ratio': np.asarray(credit_utilization_ratio, dtype=float),
+            'loan_amount': np.asarray([base['loan_amount']] if loan_amount is None else loan_amount, dtype=float),
+            'loan_tenure_months': np.asarray([base['loan_tenure_months']] if loan_tenure_months is None
+                                             else loan_tenure_months, dtype=float),
+        }
+        shape = tuple(len(self.axes[axis]) for axis in SCENARIO_AXES)
+        grids = np.meshgrid(*(self.axes[axis] for axis in SCENARIO_AXES), indexing='ij', sparse=True)
+        grid = {axis: np.broadcast_to(values, shape).ravel() for axis, values in zip(SCENARIO_AXES, grids)}
+
+        n_rows = grid['income_pct'].size
+        columns = {field: np.full(n_rows, self.base[field], dtype=object if isinstance(self.base[field], str)
+                                  else float) for field in INPUT_FIELDS}
+        columns['income'] = float(self.base['income']) * (1 + grid['income_pct'] / 100)
+        columns['credit_utilization_ratio'] = grid['credit_utilization_ratio']
+        columns['loan_amount'] = grid['loan_amount']
+        columns['loan_tenure_months'] = grid['loan_tenure_months']
+
+        logits = scorer(registry.compiled()).logit_batch(kernel_inputs(columns))
+        probabilities, scores, ratings = scores_from_logits(logits)
+        self.shape = shape
+        self._positions = {axis: {value: i for i, value in enumerate(values.tolist())}
+                           for axis, values in self.axes.items()}
+        self.probabilities = probabilities.reshape(shape)
+        self.scores = scores.reshape(shape)
+        self.ratings = ratings.reshape(shape)
+
+    def index(self, **scenario):
+        """Grid position of a scenario; axes left out stay at the applicant's own values"""
+        position = []
+        for axis in SCENARIO_AXES:
+            values = self.axes[axis]
+            if axis in scenario:
+                value = scenario[axis]
+            elif axis == 'income_pct':
+                value = 0
+            else:
+                value = self.base[axis]
+            i = self._positions[axis].get(value)
+            if i is None:
+                # Nearest grid point, so off-grid slider values still resolve
+                i = int(np.abs(values - value).argmin())
+            position.append(i)
+        return tuple(position)
+
+    def score(self, **scenario):
+        return int(self.scores[self.index(**scenario)])
+
+    def at(self, **scenario):
+        """(probability, credit score, rating) of one scenario"""
+        position = self.index(**scenario)
+        return float(self.probabilities[position]), int(self.scores[position]), self.ratings[position]
+
+    def impacts(self, **scenario):
+        """Score change from each perturbed axis on its own and from all of them together"""
+        base_score = self.score()
+        impacts = {axis: self.score(**{axis: value}) - base_score for axis, value in scenario.items()}
+        impacts['total'] = self.score(**scenario) - base_score
+        return impacts
+
+    def best(self, axis):
+        """Axis value giving the highest score with every other input held at the applicant's own"""
+        others = self.index()
+        line = self.scores[tuple(slice(None) if name == axis else others[i] for i, name in enumerate(SCENARIO_AXES))]
+        return self.axes[axis][int(line.argmax())], int(line.max())
@@ -0,0 +1,123 @@
+import collections
+import functools
+import threading
+import time
+
+from prediction_helper import predict, registry
+
+# Numeric inputs are rounded to this many decimals before they form a cache key, so repeated
+# assessments whose inputs differ only by float noise share one entry
+KEY_DECIMALS = 2
+
+
+class LRUCache:
+    """Bounded LRU cache with optional TTL, hit/miss counters and invalidation on a version change"""
+
+    def __init__(self, maxsize=1024, ttl=None, version=None, check_interval=1.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = version
+        self.check_interval = check_interval
+        self._entries = collections.OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self._current_version = None
+        self._checked_at = float('-inf')
+        # Bumped whenever the entries are thrown away, so a value computed across that is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self, now):
+        # Polled at most every check_interval seconds so a hit stays cheaper than the work it saves
+        if self.version is None or now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = self.version()
+        if version != self._current_version:
+            if self._current_version is not None:
+                self._entries.clear()
+                self._generation += 1
+                self.invalidations += 1
+            self._current_version = version
+
+    def get_or_compute(self, key, compute):
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(now)
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+        with self._lock:
+            # Computed against a model that was swapped out meanwhile: return it, but do not cache it
+            if generation != self._generation:
+                return value
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def memoize(self, func):
+        """Decorator caching func on its quantized positional and keyword arguments"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__, tuple(quantize(arg) for arg in args),
+                   tuple(sorted((name, quantize(value)) for name, value in kwargs.items())))
+            return self.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = self
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+        }
+
+
+def quantize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return round(float(value), KEY_DECIMALS)
+    return value
+
+
+def artifact_version():
+    # Reload alongside the version check so cached scores and the served model change together
+    version = registry.version()
+    registry.load()
+    return version
+
+
+score_cache = LRUCache(maxsize=4096, version=artifact_version)
+figure_cache = LRUCache(maxsize=256, version=artifact_version)
+
+
+def cached_predict(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                   delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
+                   loan_purpose, loan_type, explain=False):
+    """predict() answered from score_cache; the model is run on the quantized inputs so every hit is exact"""
+    inputs = tuple(quantize(value) for value in (
+        age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency, delinquency_ratio,
+        credit_utilization_ratio, num_open_accounts, residence_type, loan_purpose, loan_type))
+    return score_cache.get_or_compute(inputs + (explain,), lambda: predict(*inputs, explain=explain))
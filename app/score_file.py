@@ -0,0 +1,358 @@
+import argparse
+import collections
+import concurrent.futures
+import io
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_store import Table, is_table
+from prediction_helper import registry, scorer, scores_from_logits
+
+# Training-set mode of residence_type, used by the notebook to fill missing values
+RESIDENCE_TYPE_MODE = 'Owned'
+
+# Read size used when scanning CSV files for chunk boundaries
+SCAN_BLOCK_BYTES = 16 * 1024 * 1024
+
+# Derived features written next to the scores
+DERIVED_COLUMNS = ['loan_to_income', 'delinquency_ratio', 'avg_dpd_per_delinquency']
+
+
+def read_chunks(path, chunk_size, skip_rows=0):
+    """Yield DataFrames of exactly chunk_size rows (the last may be shorter) from a CSV/Parquet file or store table"""
+    if is_table(path):
+        yield from Table(path).iter_frames(chunk_size, start=skip_rows)
+        return
+    if not path.endswith('.parquet'):
+        yield from pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1))
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Parquet batches follow row-group boundaries, so re-slice them to the requested chunk size
+    buffered, buffered_rows = [], 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        if skip_rows:
+            dropped = min(skip_rows, batch.num_rows)
+            batch, skip_rows = batch.slice(dropped), skip_rows - dropped
+        buffered.append(batch)
+        buffered_rows += batch.num_rows
+        while buffered_rows >= chunk_size:
+            table = pa.Table.from_batches(buffered)
+            yield table.slice(0, chunk_size).to_pandas()
+            remainder = table.slice(chunk_size)
+            buffered, buffered_rows = remainder.to_batches(), remainder.num_rows
+    if buffered_rows:
+        yield pa.Table.from_batches(buffered).to_pandas()
+
+
+def join_aligned(chunks, paths):
+    """Join same-length chunks of row-aligned files side by side, checking cust_id row for row"""
+    if len({len(chunk) for chunk in chunks}) > 1:
+        raise ValueError("Input files have different row counts")
+
+    joined = chunks[0].reset_index(drop=True)
+    for path, chunk in zip(paths[1:], chunks[1:]):
+        chunk = chunk.reset_index(drop=True)
+        if 'cust_id' in joined and 'cust_id' in chunk:
+            if not joined['cust_id'].equals(chunk['cust_id']):
+                raise ValueError(f"{path} is not row-aligned with {paths[0]} on cust_id")
+            chunk = chunk.drop(columns='cust_id')
+        joined = pd.concat([joined, chunk.drop(columns=joined.columns.intersection(chunk.columns))], axis=1)
+    return joined
+
+
+def joined_chunks(paths, chunk_size, skip_rows=0):
+    """Stream row-aligned input files side by side"""
+    readers = [read_chunks(path, chunk_size, skip_rows) for path in paths]
+    for chunks in itertools.zip_longest(*readers):
+        if any(chunk is None for chunk in chunks):
+            raise ValueError("Input files have different row counts")
+        yield join_aligned(chunks, paths)
+
+
+def csv_chunk_ranges(path, chunk_size):
+    """Header line and (start, end) byte ranges of consecutive chunk_size-row blocks of a CSV file.
+
+    Rows are split on raw newlines, so quoted fields must not contain line breaks.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        offset = f.tell()
+        boundaries = [offset]
+        rows_in_chunk = 0
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+            chunk_ends = newlines[chunk_size - rows_in_chunk - 1::chunk_size]
+            boundaries.extend((offset + chunk_ends + 1).tolist())
+            rows_in_chunk = (rows_in_chunk + len(newlines)) % chunk_size
+            offset += len(block)
+        if offset > boundaries[-1]:
+            boundaries.append(offset)
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def derive_features(df, defaults=None):
+    """Apply the notebook's cleaning rules and derived features; returns the compiled model's input columns"""
+    for name, value in (defaults or {}).items():
+        if name not in df:
+            df[name] = value
+
+    required = ['age', 'income', 'loan_amount', 'loan_tenure_months', 'number_of_open_accounts',
+                'credit_utilization_ratio', 'residence_type', 'loan_purpose', 'loan_type']
+    if 'delinquency_ratio' not in df:
+        required += ['delinquent_months', 'total_loan_months']
+    if 'avg_dpd_per_delinquency' not in df:
+        required += ['delinquent_months', 'total_dpd']
+    missing = sorted(set(required) - set(df.columns))
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)} "
+                         f"(add the loans file or fill them with --set name=value)")
+
+    df['residence_type'] = df['residence_type'].fillna(RESIDENCE_TYPE_MODE)
+    df['loan_purpose'] = df['loan_purpose'].replace('Personaal', 'Personal')
+
+    income = df['income'].to_numpy(dtype=float)
+    loan_amount = df['loan_amount'].to_numpy(dtype=float)
+    df['loan_to_income'] = np.round(np.divide(loan_amount, income, out=np.zeros(len(df)), where=income > 0), 2)
+
+    if 'delinquency_ratio' not in df:
+        delinquent_months = df['delinquent_months'].to_numpy(dtype=float)
+        total_loan_months = df['total_loan_months'].to_numpy(dtype=float)
+        df['delinquency_ratio'] = np.round(np.divide(delinquent_months * 100, total_loan_months,
+                                                     out=np.zeros(len(df)), where=total_loan_months > 0), 1)
+    if 'avg_dpd_per_delinquency' not in df:
+        delinquent_months = df['delinquent_months'].to_numpy(dtype=float)
+        total_dpd = df['total_dpd'].to_numpy(dtype=float)
+        df['avg_dpd_per_delinquency'] = np.round(np.divide(total_dpd, delinquent_months,
+                                                           out=np.zeros(len(df)), where=delinquent_months != 0), 1)
+
+    return {
+        'age': df['age'].to_numpy(),
+        'loan_tenure_months': df['loan_tenure_months'].to_numpy(),
+        'num_open_accounts': df['number_of_open_accounts'].to_numpy(),
+        'credit_utilization_ratio': df['credit_utilization_ratio'].to_numpy(),
+        'loan_to_income': df['loan_to_income'].to_numpy(),
+        'delinquency_ratio': df['delinquency_ratio'].to_numpy(),
+        'avg_dpd_per_delinquency': df['avg_dpd_per_delinquency'].to_numpy(),
+        'residence_type': df['residence_type'].to_numpy(),
+        'loan_purpose': df['loan_purpose'].to_numpy(),
+        'loan_type': df['loan_type'].to_numpy(),
+    }
+
+
+def score_chunk(df, defaults=None, compiled=None):
+    """Score one input chunk and return the output frame"""
+    columns = derive_features(df, defaults)
+    compiled = compiled or registry.compiled()
+    probability, credit_score, rating = scores_from_logits(scorer(compiled).logit_batch(columns))
+
+    output = pd.DataFrame({name: df[name].to_numpy() for name in ['cust_id'] + DERIVED_COLUMNS if name in df})
+    output['default_probability'] = probability
+    output['credit_score'] = credit_score
+    output['rating'] = rating
+    return output
+
+
+class Checkpoint:
+    """Progress marker written after every chunk so an interrupted run can resume"""
+
+    def __init__(self, path, inputs, chunk_size):
+        self.path = path
+        self.state = {'inputs': [os.path.abspath(p) for p in inputs], 'chunk_size': chunk_size,
+                      'chunks_done': 0, 'rows_done': 0, 'output_bytes': 0, 'complete': False}
+
+    def load(self):
+        with open(self.path) as f:
+            saved = json.load(f)
+        if saved['inputs'] != self.state['inputs'] or saved['chunk_size'] != self.state['chunk_size']:
+            raise ValueError(f"Checkpoint {self.path} was written for different inputs or chunk size")
+        self.state = saved
+
+    def save(self, **updates):
+        self.state.update(updates)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+def render_chunk(scored, chunk_index, output):
+    """Serialize one scored chunk: CSV bytes to append, or a Parquet part file written in place"""
+    if output.endswith('.parquet'):
+        os.makedirs(output, exist_ok=True)
+        scored.to_parquet(os.path.join(output, f'part-{chunk_index:05d}.parquet'), index=False)
+        return b''
+    return scored.to_csv(index=False, header=chunk_index == 0).encode()
+
+
+def serial_chunks(inputs, chunk_size, defaults, first_chunk, output):
+    """Read, score and render chunks in this process; yields (chunk_index, rows, payload)"""
+    compiled = registry.compiled()
+    chunks = joined_chunks(inputs, chunk_size, skip_rows=first_chunk * chunk_size)
+    for chunk_index, df in enumerate(chunks, start=first_chunk):
+        yield chunk_index, len(df), render_chunk(score_chunk(df, defaults, compiled), chunk_index, output)
+
+
+def _init_worker():
+    # Each worker compiles the model once; tasks then carry only byte ranges, never model arrays
+    registry.warm_up()
+
+
+def _score_task(chunk_index, sources, defaults, output):
+    # sources holds ('csv', path, header, start, end) byte ranges, ('table', path, start, end) row ranges
+    # of a memory-mapped store table, or ready DataFrames
+    chunks, paths = [], []
+    for source in sources:
+        if isinstance(source, pd.DataFrame):
+            chunks.append(source)
+            paths.append('<input>')
+        elif source[0] == 'table':
+            _, path, start, end = source
+            chunks.append(Table(path).to_frame(rows=slice(start, end)))
+            paths.append(path)
+        else:
+            _, path, header, start, end = source
+            with open(path, 'rb') as f:
+                f.seek(start)
+                chunks.append(pd.read_csv(io.BytesIO(header + f.read(end - start))))
+            paths.append(path)
+    df = join_aligned(chunks, paths)
+    return chunk_index, len(df), render_chunk(score_chunk(df, defaults), chunk_index, output)
+
+
+def input_ranges(path, chunk_size):
+    """Per-chunk task sources for one CSV file (byte ranges) or store table (row ranges)"""
+    if is_table(path):
+        rows = len(Table(path))
+        return [('table', path, start, min(start + chunk_size, rows)) for start in range(0, rows, chunk_size)]
+    header, ranges = csv_chunk_ranges(path, chunk_size)
+    return [('csv', path, header, start, end) for start, end in ranges]
+
+
+def parallel_tasks(inputs, chunk_size, first_chunk):
+    """Per-chunk task sources; CSV and store inputs are split up front so workers read them in parallel"""
+    if all(not path.endswith('.parquet') for path in inputs):
+        ranges = [input_ranges(path, chunk_size) for path in inputs]
+        if len({len(file_ranges) for file_ranges in ranges}) > 1:
+            raise ValueError("Input files have different row counts")
+        for chunk_index in range(first_chunk, len(ranges[0])):
+            yield chunk_index, [file_ranges[chunk_index] for file_ranges in ranges]
+    else:
+        # Parquet inputs are read here and shipped to the workers as frames
+        chunks = joined_chunks(inputs, chunk_size, skip_rows=first_chunk * chunk_size)
+        for chunk_index, df in enumerate(chunks, start=first_chunk):
+            yield chunk_index, [df]
+
+
+def parallel_chunks(inputs, chunk_size, defaults, first_chunk, output, workers):
+    """Score chunks across a process pool; yields (chunk_index, rows, payload) in input order"""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        in_flight = collections.deque()
+        for chunk_index, sources in parallel_tasks(inputs, chunk_size, first_chunk):
+            in_flight.append(pool.submit(_score_task, chunk_index, sources, defaults, output))
+            # Bound memory: keep at most two chunks per worker queued or unwritten
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def score_file(inputs, output, chunk_size=100000, defaults=None, resume=False, workers=1, log=sys.stderr):
+    """Stream inputs chunk by chunk, score them and write results incrementally; returns rows scored"""
+    checkpoint = Checkpoint(output.rstrip('/') + '.checkpoint.json', inputs, chunk_size)
+    resuming = resume and os.path.exists(checkpoint.path)
+    if resuming:
+        checkpoint.load()
+        if checkpoint.state['complete']:
+            print(f"{output} is already complete", file=log)
+            return 0
+        print(f"Resuming after chunk {checkpoint.state['chunks_done']} "
+              f"({checkpoint.state['rows_done']:,} rows)", file=log)
+
+    # Load the model before timing; forked workers inherit it already compiled
+    registry.warm_up()
+
+    first_chunk = checkpoint.state['chunks_done']
+    if workers > 1:
+        chunks = parallel_chunks(inputs, chunk_size, defaults, first_chunk, output, workers)
+    else:
+        chunks = serial_chunks(inputs, chunk_size, defaults, first_chunk, output)
+
+    # CSV output is one file; on resume anything written after the checkpoint is truncated away
+    csv_file = None
+    if not output.endswith('.parquet'):
+        csv_file = open(output, 'r+b' if resuming else 'wb')
+        csv_file.truncate(checkpoint.state['output_bytes'])
+        csv_file.seek(checkpoint.state['output_bytes'])
+
+    start = time.perf_counter()
+    rows_scored = 0
+    try:
+        for chunk_index, rows, payload in chunks:
+            if csv_file:
+                csv_file.write(payload)
+                csv_file.flush()
+            rows_scored += rows
+            checkpoint.save(chunks_done=chunk_index + 1, rows_done=checkpoint.state['rows_done'] + rows,
+                            output_bytes=csv_file.tell() if csv_file else 0)
+            elapsed = time.perf_counter() - start
+            print(f"chunk {chunk_index}: {checkpoint.state['rows_done']:,} rows done, "
+                  f"{rows_scored / elapsed:,.0f} rows/sec", file=log)
+        checkpoint.save(complete=True)
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows_scored:,} rows in {elapsed:.2f}s ({rows_scored / max(elapsed, 1e-9):,.0f} rows/sec)",
+          file=log)
+    return rows_scored
+
+
+def parse_defaults(pairs):
+    # --set name=value pairs; numbers become floats, anything else stays a string
+    defaults = {}
+    for pair in pairs or []:
+        name, _, value = pair.partition('=')
+        try:
+            defaults[name] = float(value)
+        except ValueError:
+            defaults[name] = value
+    return defaults
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a customer portfolio file in streaming chunks")
+    parser.add_argument('inputs', nargs='+',
+                        help="CSV/Parquet files or feature store tables that are row-aligned on cust_id, "
+                             "e.g. customers, loans and bureau")
+    parser.add_argument('-o', '--output', required=True,
+                        help="Output .csv file, or a .parquet directory of per-chunk part files")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--set', dest='defaults', action='append', metavar='NAME=VALUE',
+                        help="Constant value for an input column missing from the files")
+    parser.add_argument('--resume', action='store_true', help="Continue from the last checkpointed chunk")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Score chunks across this many processes (output order is unchanged)")
+    args = parser.parse_args()
+
+    try:
+        score_file(args.inputs, args.output, args.chunk_size, parse_defaults(args.defaults), args.resume,
+                   args.workers)
+    except ValueError as exc:
+        sys.exit(f"error: {exc}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import math
+import time
+
+import numpy as np
+
+import drift
+from hot_reload import ModelWatcher
+from prediction_helper import INPUT_FIELDS, predict_batch, registry
+from shadow import ShadowLog, ShadowScorer
+
+# Inputs that are passed as category labels rather than numbers
+CATEGORICAL_INPUTS = {'residence_type', 'loan_purpose', 'loan_type'}
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """Client error reported back as an HTTP 4xx response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_applicant(payload):
+    """Validate one JSON applicant and coerce its numeric fields"""
+    if not isinstance(payload, dict):
+        raise RequestError("Applicant must be a JSON object")
+    missing = [field for field in INPUT_FIELDS if field not in payload]
+    if missing:
+        raise RequestError(f"Missing fields: {', '.join(missing)}")
+
+    applicant = {}
+    for field in INPUT_FIELDS:
+        value = payload[field]
+        if field in CATEGORICAL_INPUTS:
+            applicant[field] = str(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            # JSON NaN and Infinity parse as floats but would be scored as a confident "Excellent"
+            try:
+                applicant[field] = float(value)
+            except OverflowError:
+                applicant[field] = math.inf
+            if not math.isfinite(applicant[field]):
+                raise RequestError(f"Field {field} must be a finite number")
+        else:
+            raise RequestError(f"Field {field} must be a number")
+    return applicant
+
+
+def score_columns(applicants, scorer=None):
+    """Score a list of parsed applicants in one vectorized call, through scorer when shadowing"""
+    columns = {field: [applicant[field] for applicant in applicants] for field in INPUT_FIELDS}
+    probabilities, scores, ratings = (scorer.predict_batch if scorer else predict_batch)(columns)
+    return [{'probability': float(p), 'credit_score': int(s), 'rating': r}
+            for p, s, r in zip(probabilities, scores, ratings)]
+
+
+class LatencyStats:
+    """Request latencies over a sliding window plus running throughput counters"""
+
+    def __init__(self, window=10000):
+        self.latencies = collections.deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.applicants = 0
+        self.batches = 0
+
+    def record(self, seconds, applicants=1):
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.applicants += applicants
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        latencies_ms = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            'requests': self.requests,
+            'applicants': self.applicants,
+            'batches': self.batches,
+            'avg_batch_size': self.applicants / self.batches if self.batches else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies_ms, 50)),
+            'latency_p99_ms': float(np.percentile(latencies_ms, 99)),
+            'throughput_rps': self.requests / elapsed,
+            'throughput_applicants_per_sec': self.applicants / elapsed,
+            'uptime_seconds': elapsed,
+        }
+
+
+class MicroBatcher:
+    """Gathers concurrent single-applicant requests for a few milliseconds and scores them together"""
+
+    def __init__(self, stats, max_batch=512, max_wait_ms=2.0, scorer=None, executor=None):
+        self.stats = stats
+        self.scorer = scorer
+        # Scoring runs here, off the event loop, so accepting and parsing requests continues meanwhile
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, applicant):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((applicant, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            pending = [await self.queue.get()]
+            # Give concurrent requests a short window to join, then take whatever has queued up
+            if self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)
+            while len(pending) < self.max_batch and not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+
+            self.stats.batches += 1
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, score_columns, [applicant for applicant, _ in pending], self.scorer)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 JSON server exposing /score, /score/batch, /stats, /drift and /health"""
+
+    def __init__(self, max_batch=512, max_wait_ms=2.0, watch_interval=2.0, challengers=None, shadow_log=None,
+                 shadow_budget_ms=None, drift_interval=None, drift_log=None):
+        self.stats = LatencyStats()
+        # challengers maps a name to an artifact path; they are shadow-scored, never served
+        self.scorer = None
+        if challengers:
+            for name, path in challengers.items():
+                registry.register(name, path)
+            self.scorer = ShadowScorer(challengers=challengers, log=ShadowLog(shadow_log),
+                                       budget_ms=shadow_budget_ms)
+        # One scoring thread: requests that arrive while it is busy queue up into the next batch
+        self.executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='scoring')
+        self.batcher = MicroBatcher(self.stats, max_batch=max_batch, max_wait_ms=max_wait_ms, scorer=self.scorer,
+                                    executor=self.executor)
+        self.watcher = ModelWatcher(interval=watch_interval) if watch_interval > 0 else None
+        # The baseline next to the artifact is read now, so a missing one fails at startup
+        self.drift = None
+        if drift_interval:
+            self.drift = drift.DriftMonitor(drift.load_baseline(drift.baseline_path()), interval=drift_interval,
+                                            log=drift_log, model_sha256=drift.file_sha256(registry.default_path))
+            if self.watcher:
+                # A hot-reloaded model is compared against its own baseline, not the old one's
+                self.watcher.on_swap.append(self.drift.model_swapped)
+
+    async def handle_score(self, payload):
+        return await self.batcher.submit(parse_applicant(payload))
+
+    async def handle_score_batch(self, payload):
+        # Accepts a list of applicant objects or {"applicants": [...]}
+        if isinstance(payload, dict):
+            payload = payload.get('applicants')
+        if not isinstance(payload, list):
+            raise RequestError("Batch body must be a list of applicants")
+        applicants = []
+        for i, item in enumerate(payload):
+            try:
+                applicants.append(parse_applicant(item))
+            except RequestError as exc:
+                raise RequestError(f"Applicant {i}: {exc}", status=exc.status)
+        self.stats.batches += 1
+        if not applicants:
+            return {'results': []}
+        results = await asyncio.get_running_loop().run_in_executor(self.executor, score_columns, applicants,
+                                                                   self.scorer)
+        return {'results': results}
+
+    async def dispatch(self, method, path, body):
+        if path == '/health':
+            return {'status': 'ok'}
+        if path == '/stats':
+            snapshot = self.stats.snapshot()
+            if self.watcher:
+                snapshot.update(model_reloads=self.watcher.reloads, model_reloads_rejected=self.watcher.rejected)
+            if self.scorer:
+                snapshot.update(self.scorer.stats())
+            if self.drift:
+                snapshot.update(drift_reports=self.drift.reports, drift_rows=self.drift.rows)
+            return snapshot
+        if path == '/drift':
+            if not self.drift:
+                raise RequestError("Drift monitoring is off (start with --drift-interval)", status=404)
+            return self.drift.snapshot()
+        if path not in ('/score', '/score/batch'):
+            raise RequestError(f"Unknown endpoint {path}", status=404)
+        if method != 'POST':
+            raise RequestError("Use POST", status=405)
+
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError("Body is not valid JSON")
+
+        start = time.perf_counter()
+        if path == '/score':
+            result = await self.handle_score(payload)
+            self.stats.record(time.perf_counter() - start)
+        else:
+            result = await self.handle_score_batch(payload)
+            self.stats.record(time.perf_counter() - start, applicants=len(result['results']))
+        return result
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, sep, value = line.decode('latin-1').partition(':')
+                        if not sep:
+                            raise ValueError(f"header line without a colon: {line!r}")
+                        headers[name.strip().lower()] = value.strip()
+
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(f"negative Content-Length {length}")
+                except ValueError:
+                    # The rest of the stream cannot be framed, so answer and close
+                    await self.respond(writer, 400, {'error': "Malformed request line or header"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {'error': "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, response = 200, await self.dispatch(method, target.split('?')[0], body)
+                except RequestError as exc:
+                    status, response = exc.status, {'error': str(exc)}
+                except Exception as exc:
+                    status, response = 500, {'error': str(exc)}
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                await self.respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def serve(self, host, port):
+        registry.warm_up()
+        # Installed after the warm-up so its applicant is not counted as traffic
+        if self.drift:
+            drift.install(self.drift)
+        if self.scorer:
+            for name in self.scorer.challengers:
+                registry.load(name)
+        if self.watcher:
+            self.watcher.start()
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Scoring service listening on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+            self.executor.shutdown()
+            if self.watcher:
+                self.watcher.stop()
+            if self.scorer:
+                self.scorer.log.close()
+            if self.drift:
+                drift.disable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP credit scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=512,
+                        help="Largest number of single requests scored in one call")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help="How long the micro-batcher waits for more requests")
+    parser.add_argument('--watch-interval', type=float, default=2.0,
+                        help="Seconds between checks of the model artifact for hot reload (0 disables)")
+    parser.add_argument('--challenger', action='append', default=[], metavar='NAME=PATH',
+                        help="Shadow-score every request with this model artifact as well (repeatable)")
+    parser.add_argument('--shadow-log', help="JSON lines file for challenger results (default stdout)")
+    parser.add_argument('--shadow-budget-ms', type=float,
+                        help="Average latency shadow scoring may add per batch; challengers are sampled to stay under it")
+    parser.add_argument('--drift-interval', type=float,
+                        help="Report input and score drift against the artifact's baseline every this many seconds")
+    parser.add_argument('--drift-log', help="JSON lines file for drift reports (default stdout)")
+    args = parser.parse_args()
+
+    challengers = {}
+    for spec in args.challenger:
+        name, sep, path = spec.partition('=')
+        if not sep or not name or not path:
+            parser.error(f"--challenger expects NAME=PATH, got {spec!r}")
+        challengers[name] = path
+
+    service = ScoringService(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                             watch_interval=args.watch_interval, challengers=challengers,
+                             shadow_log=args.shadow_log, shadow_budget_ms=args.shadow_budget_ms,
+                             drift_interval=args.drift_interval, drift_log=args.drift_log)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
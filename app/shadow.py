@@ -0,0 +1,141 @@
+import collections
+import json
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+import prediction_helper
+from prediction_helper import kernel_inputs, registry, scorer, scores_from_logits
+
+
+class ShadowLog:
+    """Writes challenger comparisons as JSON lines from a background thread
+
+    submit() never blocks the scoring path: when the writer falls behind and the queue is full the
+    batch is dropped and counted instead.
+    """
+
+    def __init__(self, path=None, maxsize=1024, stream=sys.stdout):
+        self.path = path
+        self.stream = stream
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name='shadow-log', daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        out = open(self.path, 'a') if self.path else self.stream
+        try:
+            while True:
+                record = self.queue.get()
+                if record is None:
+                    break
+                # One line per applicant, expanded here rather than on the scoring thread
+                timestamp, champion, challengers = record
+                probabilities, scores, ratings = champion
+                for i in range(len(scores)):
+                    line = {
+                        'ts': timestamp,
+                        'champion': {'probability': float(probabilities[i]), 'credit_score': int(scores[i]),
+                                     'rating': ratings[i]},
+                        'challengers': {name: {'probability': float(p[i]), 'credit_score': int(s[i]),
+                                               'rating': r[i], 'score_diff': int(s[i] - scores[i])}
+                                        for name, (p, s, r) in challengers.items()},
+                    }
+                    out.write(json.dumps(line) + '\n')
+                    self.written += 1
+                out.flush()
+        finally:
+            if self.path:
+                out.close()
+
+
+class ShadowScorer:
+    """Scores batches with the champion model and shadow-scores them with named challengers
+
+    Every model reads the same kernel inputs, built once per batch. Only champion results are
+    returned; challenger results go to the ShadowLog. A challenger that fails is counted in stats()
+    and never affects the champion's response. The time spent on challengers is tracked
+    separately, and when budget_ms is set the scorer shadows only every n-th batch, doubling n while
+    the recent added latency is over budget and halving it again once it is back under.
+    """
+
+    def __init__(self, champion=None, challengers=(), log=None, budget_ms=None, model_registry=registry,
+                 window=1000):
+        self.registry = model_registry
+        self.champion = champion
+        self.challengers = list(challengers)
+        self.log = log
+        self.budget_ms = budget_ms
+        self.added_ms = collections.deque(maxlen=window)
+        self.sample_every = 1
+        self.batches = 0
+        self.shadowed = 0
+        self.skipped = 0
+        self.errors = collections.Counter()  # challenger name -> failed batches
+        self.last_errors = {}
+
+    def predict_batch(self, inputs):
+        columns = kernel_inputs(inputs)
+        results = scores_from_logits(scorer(self.registry.compiled(self.champion)).logit_batch(columns))
+        if prediction_helper.drift_monitor is not None:
+            prediction_helper.drift_monitor.update(columns, results[1])
+        self.batches += 1
+        if not self.challengers:
+            return results
+        if self.batches % self.sample_every:
+            self.skipped += 1
+            return results
+
+        start = time.perf_counter()
+        challengers = {}
+        for name in self.challengers:
+            try:
+                challengers[name] = scores_from_logits(scorer(self.registry.compiled(name)).logit_batch(columns))
+            except Exception as exc:
+                # A broken artifact or schema mismatch must not fail the champion's response
+                self.errors[name] += 1
+                self.last_errors[name] = f"{type(exc).__name__}: {exc}"
+        if self.log is not None and challengers:
+            self.log.submit((time.time(), results, challengers))
+        added_ms = (time.perf_counter() - start) * 1000
+        self.added_ms.append(added_ms)
+        self.shadowed += 1
+
+        if self.budget_ms is not None:
+            recent = float(np.mean(list(self.added_ms)[-20:])) / self.sample_every
+            if recent > self.budget_ms:
+                self.sample_every *= 2
+            elif self.sample_every > 1 and recent * 2 <= self.budget_ms:
+                self.sample_every //= 2
+        return results
+
+    def stats(self):
+        added = np.array(self.added_ms) if self.added_ms else np.zeros(1)
+        stats = {
+            'shadow_challengers': self.challengers,
+            'shadow_batches': self.shadowed,
+            'shadow_skipped': self.skipped,
+            'shadow_sample_every': self.sample_every,
+            'shadow_added_p50_ms': float(np.percentile(added, 50)),
+            'shadow_added_p99_ms': float(np.percentile(added, 99)),
+            'shadow_errors': dict(self.errors),
+            'shadow_last_errors': dict(self.last_errors),
+        }
+        if self.log is not None:
+            stats.update(shadow_logged=self.log.written, shadow_dropped=self.log.dropped)
+        return stats
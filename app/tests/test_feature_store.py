@@ -0,0 +1,60 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import feature_store
+
+
+def write_dataset(directory, n_rows, seed=0):
+    # Customers in shuffled order, so ids are neither dense nor sorted by row
+    rng = np.random.default_rng(seed)
+    cust_ids = np.array([f'C{i:05d}' for i in range(1, n_rows + 1)])[rng.permutation(n_rows)]
+    pd.DataFrame({'cust_id': cust_ids, 'age': rng.integers(18, 100, n_rows),
+                  'residence_type': rng.choice(['Owned', 'Rented', None], n_rows)}).to_csv(
+        os.path.join(directory, 'customers.csv'), index=False)
+    pd.DataFrame({'cust_id': cust_ids[::-1], 'loan_amount': rng.integers(1000, 100000, n_rows)}).to_csv(
+        os.path.join(directory, 'loans.csv'), index=False)
+    return cust_ids
+
+
+@pytest.mark.parametrize('n_rows, chunk_size, kind', [(300, 1000, 'categorical'), (3000, 1000, 'string')])
+def test_id_columns_past_the_category_cap_are_stored_as_strings(tmp_path, n_rows, chunk_size, kind):
+    cust_ids = write_dataset(str(tmp_path), n_rows)
+    store_dir = str(tmp_path / 'store')
+    feature_store.ingest_dataset(str(tmp_path), store_dir, chunk_size)
+    with open(os.path.join(store_dir, 'customers', 'meta.json')) as f:
+        columns = json.load(f)['columns']
+    assert columns['cust_id']['kind'] == kind
+    assert columns['residence_type']['kind'] == 'categorical'
+
+    customers = feature_store.FeatureStore(store_dir)['customers']
+    assert customers.column('cust_id').tolist() == cust_ids.tolist()
+    expected = pd.read_csv(str(tmp_path / 'customers.csv'))['residence_type']
+    assert customers.column('residence_type').tolist() == expected.astype(object).where(expected.notna(), None).tolist()
+
+
+@pytest.mark.parametrize('n_rows, chunk_size', [(300, 1000), (3000, 1000), (3000, 100000)])
+def test_index_and_join_round_trip_every_id(tmp_path, n_rows, chunk_size):
+    cust_ids = write_dataset(str(tmp_path), n_rows)
+    store_dir = str(tmp_path / 'store')
+    feature_store.ingest_dataset(str(tmp_path), store_dir, chunk_size)
+    store = feature_store.FeatureStore(store_dir)
+    customers, loans = pd.read_csv(str(tmp_path / 'customers.csv')), pd.read_csv(str(tmp_path / 'loans.csv'))
+
+    index = store.index('customers')
+    assert [index.lookup(cust_id) for cust_id in cust_ids[:50]] == list(range(50))
+    np.testing.assert_array_equal(index.lookup_many(cust_ids), np.arange(n_rows))
+    assert index.lookup('C99999') == -1 and index.lookup('X00001') == -1
+    np.testing.assert_array_equal(index.lookup_many(['C99999', cust_ids[7], 'nope']), [-1, 7, -1])
+
+    view = store.joined()
+    for row in (0, n_rows // 2, n_rows - 1):
+        record = view.get(cust_ids[row])
+        assert record['age'] == customers['age'][row]
+        assert record['loan_amount'] == loans.set_index('cust_id')['loan_amount'][cust_ids[row]]
+    assert view.get('C99999') is None
+    frame = view.frame(cust_ids[::-1])
+    assert frame['cust_id'].tolist() == cust_ids[::-1].tolist()
@@ -0,0 +1,143 @@
+import os
+import shutil
+import threading
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+import artifact
+import hot_reload
+import prediction_helper
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def replace(path, data):
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+
+
+@pytest.fixture
+def columns():
+    return prediction_helper.kernel_inputs(hot_reload.GOLDEN_APPLICANTS)
+
+
+def test_bad_artifacts_are_rejected_and_polling_continues(tmp_path, columns):
+    path = str(tmp_path / 'model_data.joblib')
+    shutil.copy(prediction_helper.JOBLIB_MODEL_PATH, path)
+    with open(path, 'rb') as f:
+        good = f.read()
+    registry = prediction_helper.ModelRegistry(path)
+    original = registry.compiled().logit_batch(columns)
+    watcher = hot_reload.ModelWatcher(registry, interval=0.01, log=open(os.devnull, 'w')).start()
+    try:
+        # Cut-off pickles fail with ModuleNotFoundError, EOFError or IndexError; a foreign one with TypeError
+        bad_versions = [good[:len(good) // 2], good[:len(good) // 4], good[:100]]
+        foreign = str(tmp_path / 'foreign.joblib')
+        joblib.dump(['not', 'a', 'model'], foreign)
+        with open(foreign, 'rb') as f:
+            bad_versions.append(f.read())
+        for i, data in enumerate(bad_versions, 1):
+            replace(path, data)
+            assert wait_for(lambda: watcher.rejected == i), watcher.last_error
+            assert watcher._thread.is_alive()
+            np.testing.assert_array_equal(registry.compiled().logit_batch(columns), original)
+
+        # A later good deploy is still picked up
+        model_data = joblib.load(prediction_helper.JOBLIB_MODEL_PATH)
+        model_data['model'].intercept_ = model_data['model'].intercept_ + 0.25
+        joblib.dump(model_data, foreign)
+        with open(foreign, 'rb') as f:
+            replace(path, f.read())
+        assert wait_for(lambda: watcher.reloads == 1), watcher.last_error
+        np.testing.assert_allclose(registry.compiled().logit_batch(columns), original + 0.25)
+    finally:
+        watcher.stop()
+
+
+def test_readers_never_see_a_torn_model(tmp_path, columns):
+    versions = [str(tmp_path / 'a.json'), str(tmp_path / 'b.json')]
+    shutil.copy(prediction_helper.JSON_MODEL_PATH, versions[0])
+    shifted = artifact.load_artifact(versions[0])
+    shifted['model'].intercept_ = shifted['model'].intercept_ + 0.25
+    artifact.export_artifact(shifted, versions[1])
+    expected = [prediction_helper.ModelRegistry(v).compiled().logit_batch(columns) for v in versions]
+
+    path = str(tmp_path / 'model_data.json')
+    shutil.copy(versions[0], path)
+    registry = prediction_helper.ModelRegistry(path)
+    watcher = hot_reload.ModelWatcher(registry, interval=0.005, log=open(os.devnull, 'w')).start()
+    stop = threading.Event()
+    seen, torn = set(), []
+
+    def score():
+        while not stop.is_set():
+            x = registry.compiled().logit_batch(columns)
+            matches = [i for i, e in enumerate(expected) if np.array_equal(x, e)]
+            if matches:
+                seen.add(matches[0])
+            else:
+                torn.append(x)
+
+    threads = [threading.Thread(target=score) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for swap in range(1, 11):
+            with open(versions[swap % 2], 'rb') as f:
+                replace(path, f.read())
+            assert wait_for(lambda: watcher.reloads == swap), watcher.last_error
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        watcher.stop()
+
+    assert not torn
+    assert seen == {0, 1}
+    assert watcher.rejected == 0
+
+
+def test_tree_models_are_exported_and_loaded_as_challengers_only(tmp_path, columns):
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    from train import stages
+
+    champion = joblib.load(prediction_helper.JOBLIB_MODEL_PATH)
+    X = pd.DataFrame(prediction_helper.EstimatorModel(champion).feature_matrix(columns),
+                     columns=list(champion['features']))
+    forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, [0, 1, 0, 1, 0, 1])
+    output = str(tmp_path / 'model_data.joblib')
+    result = stages.export({'model': forest, 'auc': 0.5, 'gini': 0.0}, {'X_train': X},
+                           {'scaler': champion['scaler'], 'cols_to_scale': champion['cols_to_scale']}, output)
+    assert not result['champion']
+    assert result['joblib'] == str(tmp_path / 'model_data_challenger.joblib')
+    assert not os.path.exists(output) and not os.path.exists(str(tmp_path / 'model_data.json'))
+    challenger = prediction_helper.ModelRegistry(str(tmp_path / 'model_data_challenger.json')).compiled()
+    assert isinstance(challenger, prediction_helper.EstimatorModel)
+
+    # Copied over the served artifact by hand, it is still never swapped in
+    path = str(tmp_path / 'served.joblib')
+    shutil.copy(prediction_helper.JOBLIB_MODEL_PATH, path)
+    registry = prediction_helper.ModelRegistry(path)
+    original = registry.compiled().logit_batch(columns)
+    watcher = hot_reload.ModelWatcher(registry, interval=0.01, log=open(os.devnull, 'w')).start()
+    try:
+        with open(result['joblib'], 'rb') as f:
+            replace(path, f.read())
+        assert wait_for(lambda: watcher.rejected == 1), watcher.last_error
+        assert 'challenger' in watcher.last_error
+        np.testing.assert_array_equal(registry.compiled().logit_batch(columns), original)
+    finally:
+        watcher.stop()
@@ -0,0 +1,20 @@
+from score_cache import LRUCache
+
+
+def test_values_computed_across_an_invalidation_are_not_cached():
+    versions = ['v1']
+    cache = LRUCache(version=lambda: versions[-1], check_interval=0)
+    assert cache.get_or_compute('key', lambda: 'v1 score') == 'v1 score'
+    assert cache.get_or_compute('key', lambda: 'unused') == 'v1 score'
+
+    def swap_while_computing():
+        # The artifact changes and another lookup notices it before this compute finishes
+        versions.append('v2')
+        cache.get_or_compute('other', lambda: 'v2 score')
+        return 'v1 score'
+
+    cache.clear()
+    assert cache.get_or_compute('key', swap_while_computing) == 'v1 score'
+    assert cache.invalidations == 1
+    assert cache.get_or_compute('key', lambda: 'v2 score') == 'v2 score'
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,51 @@
+import pytest
+
+import hot_reload
+import prediction_helper
+
+GOLDEN_ROWS = [[hot_reload.GOLDEN_APPLICANTS[field][i] for field in prediction_helper.INPUT_FIELDS]
+               for i in range(len(hot_reload.GOLDEN_APPLICANTS['age']))]
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return prediction_helper.predict_batch(hot_reload.GOLDEN_APPLICANTS, explain=True)
+
+
+@pytest.mark.parametrize('i', range(len(GOLDEN_ROWS)))
+def test_predict_batch_matches_predict_exactly(batch, i):
+    probability, score, rating, explanation = prediction_helper.predict(*GOLDEN_ROWS[i], explain=True)
+    assert (batch[0][i], batch[1][i], batch[2][i]) == (probability, score, rating)
+    compiled = prediction_helper.registry.compiled()
+    assert dict(zip(compiled.factors, batch[3][i].tolist())) == pytest.approx(explanation['contributions'], rel=1e-12)
+    assert [reason for reason in batch[4][i] if reason is not None] == explanation['reasons']
+
+
+@pytest.mark.parametrize('i', range(len(GOLDEN_ROWS)))
+def test_predict_matches_the_sklearn_pipeline(i):
+    probability, score, rating = prediction_helper.predict(*GOLDEN_ROWS[i])
+    reference = prediction_helper.calculate_credit_score(prediction_helper.prepare_input(*GOLDEN_ROWS[i]))
+    assert (score, rating) == reference[1:]
+    assert probability == pytest.approx(reference[0], abs=1e-9)
+
+
+@pytest.mark.parametrize('age', [float('nan'), float('inf'), 30.5, 500])
+def test_lookup_tables_fall_back_to_the_weights_off_their_grid(age):
+    compiled = prediction_helper.registry.compiled()
+    values = dict(zip(prediction_helper.INPUT_FIELDS, GOLDEN_ROWS[0]))
+    values['loan_to_income'] = values['loan_amount'] / values['income']
+    values['age'] = age
+    columns = {name: [value] for name, value in values.items()}
+    expected = compiled.logit(values)
+    assert compiled.tables().logit(values) == pytest.approx(expected, rel=1e-6, nan_ok=True)
+    assert compiled.tables().logit_batch(columns)[0] == pytest.approx(expected, rel=1e-6, nan_ok=True)
+
+
+def test_every_scoring_path_uses_the_lookup_tables_when_enabled(monkeypatch):
+    monkeypatch.setattr(prediction_helper, 'PRECOMPUTE_TABLES', True)
+    plain = prediction_helper.predict_batch(hot_reload.GOLDEN_APPLICANTS)
+    explained = prediction_helper.predict_batch(hot_reload.GOLDEN_APPLICANTS, explain=True)
+    for i, row in enumerate(GOLDEN_ROWS):
+        probability, score, rating = prediction_helper.predict(*row)
+        assert (plain[0][i], plain[1][i], plain[2][i]) == (probability, score, rating)
+        assert (explained[0][i], explained[1][i], explained[2][i]) == (probability, score, rating)
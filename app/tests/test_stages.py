@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import prediction_helper
+from train import stages
+
+
+def test_contributions_are_measured_against_the_training_mean():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'age': rng.integers(18, 100, 500), 'number_of_open_accounts': rng.integers(0, 5, 500),
+                       'loan_to_income': rng.exponential(2.0, 500), 'default': rng.integers(0, 2, 500)})
+    scaled = stages.scale((df, df))
+    reference = stages.training_reference(scaled['X_train'].mean(), scaled['scaler'], scaled['cols_to_scale'])
+    assert reference == pytest.approx({'age': df['age'].mean(), 'loan_to_income': df['loan_to_income'].mean(),
+                                       'num_open_accounts': df['number_of_open_accounts'].mean()}, rel=1e-12)
+
+    # An applicant at the reference has no numeric contributions
+    compiled = prediction_helper.compile_model(dict(prediction_helper.registry.model_data(), reference=reference))
+    values = dict(compiled.reference, residence_type='Owned', loan_purpose='Home', loan_type='Secured')
+    contributions = compiled.contributions(values)
+    assert all(contributions[name] == 0 for name in reference)
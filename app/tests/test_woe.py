@@ -0,0 +1,20 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from train import woe
+
+
+def test_text_columns_read_from_csv_are_grouped_by_label():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'residence_type': rng.choice(['Owned', 'Rented', 'Mortgage'], 500),
+                          'age': rng.integers(18, 100, 500), 'default': rng.integers(0, 2, 500)})
+    # read_csv gives text columns pandas' string dtype on pandas 3, object before
+    df = pd.read_csv(io.StringIO(frame.to_csv(index=False)))
+
+    iv_values = woe.information_values(df[['residence_type', 'age']], df['default'])
+    _, expected = woe.calculate_woe_iv(df, 'residence_type', 'default')
+    assert abs(iv_values['residence_type'] - expected) < 1e-12
+    binned = pd.concat([pd.cut(df['age'], bins=10, labels=False), df['default']], axis=1)
+    assert abs(iv_values['age'] - woe.calculate_woe_iv(binned, 'age', 'default')[1]) < 1e-12
@@ -0,0 +1,34 @@
+"""Training pipeline extracted from credit_risk_mode_code.ipynb, run as a DAG of disk-cached stages"""
+import os
+
+from train import stages
+from train.pipeline import Pipeline, Stage
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(os.path.dirname(APP_DIR), 'dataset')
+CACHE_DIR = os.path.join(DATASET_DIR, 'train_cache')
+OUTPUT_PATH = os.path.join(APP_DIR, 'artifacts', 'model_data.joblib')
+
+
+def build_pipeline(dataset_dir=DATASET_DIR, cache_dir=CACHE_DIR, output=OUTPUT_PATH, **kwargs):
+    """The notebook's steps as stages; stage parameters can be overridden later with set_params"""
+    return Pipeline([
+        Stage('load', stages.load, params={name: os.path.join(dataset_dir, f'{table}.csv') for name, table in
+                                           (('customers', 'customers'), ('loans', 'loans'),
+                                            ('bureau', 'bureau_data'))},
+              file_params=('customers', 'loans', 'bureau')),
+        Stage('split', stages.split, deps=['load']),
+        Stage('clean', stages.clean, deps=['split']),
+        Stage('derive', stages.derive, deps=['clean']),
+        Stage('scale', stages.scale, deps=['derive']),
+        Stage('vif', stages.vif, deps=['scale']),
+        Stage('woe_iv', stages.woe_iv, deps=['vif', 'scale'], unkeyed=('workers',)),
+        Stage('encode', stages.encode, deps=['woe_iv', 'scale']),
+        Stage('resample', stages.resample, deps=['encode', 'scale']),
+        # The Optuna study and the shared fold data persist next to the cache, so tuning resumes
+        Stage('tune', stages.tune, deps=['resample'], unkeyed=('workers', 'storage', 'directory'),
+              params={'storage': os.path.join(cache_dir, 'optuna.db'), 'directory': os.path.join(cache_dir, 'folds')}),
+        Stage('fit', stages.fit, deps=['tune', 'resample', 'encode', 'scale']),
+        # Always rewritten, so the artifact on disk matches the pipeline even if it was replaced
+        Stage('export', stages.export, deps=['fit', 'encode', 'scale'], params={'output': output}, cache=False),
+    ], cache_dir, **kwargs)
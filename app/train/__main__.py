@@ -0,0 +1,60 @@
+import argparse
+import ast
+import sys
+import time
+
+from train import CACHE_DIR, DATASET_DIR, OUTPUT_PATH, build_pipeline
+
+
+def parse_override(spec):
+    # stage.param=value, with value read as a Python literal when it is one
+    target, sep, value = spec.partition('=')
+    stage, dot, param = target.partition('.')
+    if not sep or not dot:
+        raise argparse.ArgumentTypeError(f"expected stage.param=value, got {spec!r}")
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return stage, param, value
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m train',
+                                     description="Train the credit risk model through cached pipeline stages")
+    parser.add_argument('--dataset', default=DATASET_DIR, help="Directory with customers, loans and bureau_data CSVs")
+    parser.add_argument('--cache', default=CACHE_DIR, help="Directory holding cached stage outputs")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Where model_data.joblib is written")
+    parser.add_argument('--set', dest='overrides', action='append', default=[], type=parse_override,
+                        metavar='STAGE.PARAM=VALUE', help="Override a stage parameter, e.g. tune.n_trials=20")
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        help="Recompute a stage even if it is cached")
+    parser.add_argument('--until', default='export', metavar='STAGE', help="Stop after this stage")
+    parser.add_argument('--clean', action='store_true', help="Remove cache entries of stale stage versions")
+    args = parser.parse_args()
+
+    pipeline = build_pipeline(args.dataset, args.cache, args.output)
+    for stage, param, value in args.overrides:
+        if stage not in pipeline.stages:
+            parser.error(f"Unknown stage {stage!r}; stages are {', '.join(pipeline.stages)}")
+        pipeline.set_params(stage, **{param: value})
+    for stage in args.force + [args.until]:
+        if stage not in pipeline.stages:
+            parser.error(f"Unknown stage {stage!r}; stages are {', '.join(pipeline.stages)}")
+
+    start = time.perf_counter()
+    result = pipeline.run(args.until, force=args.force)
+    ran = sum(status == 'ran' for status, _ in pipeline.timings.values())
+    print(f"{ran} of {len(pipeline.timings)} stages ran in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    if args.until == 'export':
+        print(f"Test AUC {result['auc']:.4f}, Gini {result['gini']:.4f}")
+        print(f"Wrote {result['joblib']} (JSON artifact sha256 {result['sha256']})")
+        if not result['champion']:
+            print(f"Not a logistic model, so it is not served; shadow-score it with "
+                  f"scoring_service.py --challenger NAME={result['joblib']}")
+    if args.clean:
+        print(f"Removed {pipeline.clean()} stale cache entries", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
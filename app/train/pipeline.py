@@ -0,0 +1,151 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+
+import joblib
+
+
+class Stage:
+    """One step of the training DAG: func(*outputs of deps, **params)
+
+    Parameters named in file_params are paths; the content of those files, not just the path, is
+    part of the stage's cache key. Parameters named in unkeyed (worker counts, scratch locations)
+    change how a stage runs but not its result, and are left out of the key.
+    """
+
+    def __init__(self, name, func, deps=(), params=None, file_params=(), unkeyed=(), cache=True):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = dict(params or {})
+        self.file_params = tuple(file_params)
+        self.unkeyed = tuple(unkeyed)
+        self.cache = cache
+
+
+def source_of(func, _seen=None):
+    """Source of func plus every function of its own package it calls, so editing a helper invalidates too"""
+    seen = _seen if _seen is not None else set()
+    seen.add(func)
+    parts = [inspect.getsource(func)]
+    package = func.__module__.partition('.')[0]
+    for name in func.__code__.co_names:
+        helper = func.__globals__.get(name)
+        if inspect.isfunction(helper) and helper.__module__.partition('.')[0] == package and helper not in seen:
+            parts.append(source_of(helper, seen))
+    return '\n'.join(parts)
+
+
+def defaults_of(func):
+    return {name: parameter.default for name, parameter in inspect.signature(func).parameters.items()
+            if parameter.default is not inspect.Parameter.empty}
+
+
+def file_digest(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """Runs stages in dependency order, caching each output on disk under a key of its inputs
+
+    A stage's key hashes its name, the source of its function, its parameters, the content of its
+    input files and the keys of the stages it depends on. Changing any of them changes the key of
+    that stage and of everything downstream, so only those are recomputed; upstream outputs are read
+    back from the cache, and not even read when nothing downstream of them has to run.
+    """
+
+    def __init__(self, stages, cache_dir, log=sys.stderr):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.log = log
+        self._keys = {}
+        self._file_digests = {}
+        self.timings = {}  # stage -> ('ran' or 'cached', seconds) of the last run
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(missing)}")
+
+    def set_params(self, name, **params):
+        self.stages[name].params.update(params)
+        self._keys.clear()
+
+    def key(self, name, _visiting=()):
+        if name in self._keys:
+            return self._keys[name]
+        if name in _visiting:
+            raise ValueError(f"Stage dependency cycle through {name}")
+        stage = self.stages[name]
+        files = {}
+        for param in stage.file_params:
+            path = os.path.abspath(stage.params[param])
+            if path not in self._file_digests:
+                self._file_digests[path] = file_digest(path)
+            files[param] = self._file_digests[path]
+        payload = {
+            'stage': name,
+            'source': source_of(stage.func),
+            # Defaults count too, so editing a module constant used as one invalidates the stage
+            'params': {param: value for param, value in {**defaults_of(stage.func), **stage.params}.items()
+                       if param not in stage.file_params + stage.unkeyed},
+            'files': files,
+            'deps': [self.key(dep, _visiting + (name,)) for dep in stage.deps],
+        }
+        key = hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()[:16]
+        self._keys[name] = key
+        return key
+
+    def cache_path(self, name):
+        return os.path.join(self.cache_dir, name, self.key(name) + '.joblib')
+
+    def is_cached(self, name):
+        return self.stages[name].cache and os.path.exists(self.cache_path(name))
+
+    def run(self, target, force=()):
+        """Output of target, computing only the stages whose cache entry is missing or forced"""
+        self.timings = {}
+        return self._output(target, set(force), {})
+
+    def _output(self, name, force, outputs):
+        if name in outputs:
+            return outputs[name]
+        stage = self.stages[name]
+        path = self.cache_path(name)
+        start = time.perf_counter()
+        if stage.cache and name not in force and os.path.exists(path):
+            output = joblib.load(path)
+            status = 'cached'
+        else:
+            inputs = [self._output(dep, force, outputs) for dep in stage.deps]
+            start = time.perf_counter()
+            output = stage.func(*inputs, **stage.params)
+            if stage.cache:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                joblib.dump(output, path + '.tmp')
+                os.replace(path + '.tmp', path)
+            status = 'ran'
+        elapsed = time.perf_counter() - start
+        self.timings[name] = (status, elapsed)
+        print(f"{name:<10} {status:<6} {elapsed:8.2f}s  {self.key(name)}", file=self.log)
+        outputs[name] = output
+        return output
+
+    def clean(self):
+        """Delete cache entries that no longer match any current stage key; returns the number removed"""
+        removed = 0
+        for name in self.stages:
+            directory = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.listdir(directory):
+                if entry != self.key(name) + '.joblib':
+                    os.remove(os.path.join(directory, entry))
+                    removed += 1
+        return removed
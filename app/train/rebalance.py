@@ -0,0 +1,43 @@
+import numpy as np
+
+# Rebalancing methods of the resample stage; smote_tomek is the notebook's
+METHODS = ('smote_tomek', 'smote', 'undersample', 'weight')
+
+
+def undersample(X, y, random_state=42):
+    """Keep every row of the smallest class and an equal-sized random sample of each other class
+
+    Rows stay in their original order. There is no neighbour search, so the cost is linear in rows.
+    """
+    y_values = np.asarray(y)
+    classes, counts = np.unique(y_values, return_counts=True)
+    rng = np.random.default_rng(random_state)
+    keep = np.concatenate([rng.choice(np.flatnonzero(y_values == label), counts.min(), replace=False)
+                           for label in classes])
+    keep.sort()
+    return X.iloc[keep], y.iloc[keep]
+
+
+def rebalance(X, y, method='smote_tomek', random_state=42):
+    """Balance the classes of X, y; returns (X, y, balanced_by_weight)
+
+    smote_tomek  SMOTE oversampling, then Tomek link removal; k-NN over the minority class and then
+                 over every row, the slowest
+    smote        SMOTE oversampling alone, skipping the all-rows neighbour search for Tomek links
+    undersample  stratified subsample of the majority class down to the minority count
+    weight       no resampling; the data is returned as is and the model is fitted with balanced
+                 class weights instead (balanced_by_weight is True)
+    """
+    if method == 'smote_tomek':
+        from imblearn.combine import SMOTETomek
+
+        return SMOTETomek(random_state=random_state).fit_resample(X, y) + (False,)
+    if method == 'smote':
+        from imblearn.over_sampling import SMOTE
+
+        return SMOTE(random_state=random_state).fit_resample(X, y) + (False,)
+    if method == 'undersample':
+        return undersample(X, y, random_state) + (False,)
+    if method == 'weight':
+        return X, y, True
+    raise ValueError(f"Unknown rebalancing method {method!r}, expected one of {', '.join(METHODS)}")
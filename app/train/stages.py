@@ -0,0 +1,200 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from train import tuning
+from train.rebalance import rebalance
+from train.vif import drop_collinear, variance_inflation
+from train.woe import information_values
+
+# Columns dropped after feature derivation: identifiers, dates and the raw inputs of the ratios
+DROP_COLUMNS = ['cust_id', 'loan_id', 'disbursal_date', 'installment_start_dt', 'loan_amount', 'income',
+                'total_loan_months', 'delinquent_months', 'total_dpd']
+
+# Loan amount components the notebook drops for their high VIF
+VIF_DROP = ['sanction_amount', 'processing_fee', 'gst', 'net_disbursement', 'principal_outstanding']
+
+# Misspelt category labels and their correction
+LABEL_FIXES = {'loan_purpose': {'Personaal': 'Personal'}}
+
+
+def load(customers, loans, bureau):
+    """Read the three dataset CSVs and merge them on cust_id"""
+    df = pd.merge(pd.read_csv(customers), pd.read_csv(loans), on='cust_id')
+    df = pd.merge(df, pd.read_csv(bureau), on='cust_id')
+    df['default'] = df['default'].astype(int)
+    return df
+
+
+def split(df, test_size=0.25, random_state=42):
+    """Stratified train/test split of the merged data"""
+    from sklearn.model_selection import train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(df.drop('default', axis='columns'), df['default'],
+                                                        stratify=df['default'], test_size=test_size,
+                                                        random_state=random_state)
+    return pd.concat([X_train, y_train], axis='columns'), pd.concat([X_test, y_test], axis='columns')
+
+
+def clean_frame(df, mode_residence, max_fee_ratio=0.03, label_fixes=LABEL_FIXES):
+    """The per-frame part of clean, given the training mode of residence_type"""
+    df = df[df.processing_fee / df.loan_amount < max_fee_ratio].copy()
+    df['residence_type'] = df['residence_type'].fillna(mode_residence)
+    for column, fixes in label_fixes.items():
+        df[column] = df[column].replace(fixes)
+    return df
+
+
+def clean(data, max_fee_ratio=0.03, label_fixes=LABEL_FIXES):
+    """Fill residence_type with the training mode, drop implausible processing fees and fix labels"""
+    df_train, df_test = data
+    mode_residence = df_train.residence_type.mode()[0]
+    return tuple(clean_frame(df, mode_residence, max_fee_ratio, label_fixes) for df in (df_train, df_test))
+
+
+def derive_frame(df, drop_columns=DROP_COLUMNS):
+    """The per-frame part of derive"""
+    df = df.copy()
+    df['loan_to_income'] = round(df['loan_amount'] / df['income'], 2)
+    df['delinquency_ratio'] = (df['delinquent_months'] * 100 / df['total_loan_months']).round(1)
+    df['avg_dpd_per_delinquency'] = np.where(df['delinquent_months'] != 0,
+                                             (df['total_dpd'] / df['delinquent_months']).round(1), 0)
+    return df.drop(drop_columns, axis='columns')
+
+
+def derive(data, drop_columns=DROP_COLUMNS):
+    """Add loan_to_income, delinquency_ratio and avg_dpd_per_delinquency, then drop their raw inputs"""
+    return tuple(derive_frame(df, drop_columns) for df in data)
+
+
+def scale(data):
+    """MinMax-scale every numeric column on the training split"""
+    from sklearn.preprocessing import MinMaxScaler
+
+    df_train, df_test = data
+    X_train, y_train = df_train.drop('default', axis='columns'), df_train['default']
+    X_test, y_test = df_test.drop('default', axis='columns'), df_test['default']
+
+    cols_to_scale = X_train.select_dtypes(['int64', 'float64']).columns
+    scaler = MinMaxScaler()
+    X_train[cols_to_scale] = scaler.fit_transform(X_train[cols_to_scale])
+    X_test[cols_to_scale] = scaler.transform(X_test[cols_to_scale])
+    return {'X_train': X_train, 'y_train': y_train, 'X_test': X_test, 'y_test': y_test,
+            'scaler': scaler, 'cols_to_scale': cols_to_scale}
+
+
+def vif(scaled, drop=VIF_DROP, threshold=None, centered=False):
+    """Drop the collinear loan amount components and report the VIF of the remaining numeric columns
+
+    With a threshold, numeric columns are then dropped one at a time, highest VIF first, until none
+    is above it. centered=False matches the notebook's statsmodels call.
+    """
+    X_train = scaled['X_train'].drop(drop, axis='columns')
+    numeric_columns = X_train.select_dtypes(['int64', 'float64']).columns
+    if threshold is None:
+        return {'X_train': X_train, 'vif': variance_inflation(X_train[numeric_columns], centered), 'dropped': []}
+    kept, dropped = drop_collinear(X_train[numeric_columns], threshold, centered)
+    return {'X_train': X_train.drop([column for column, _ in dropped], axis='columns'), 'vif': kept,
+            'dropped': dropped}
+
+
+def woe_iv(reduced, scaled, bins=10, binning='width', min_iv=0.02, workers=None):
+    """Information value of every feature (numeric ones binned, see woe.information_values); keeps those above min_iv"""
+    iv_values = information_values(reduced['X_train'], scaled['y_train'], bins=bins, binning=binning, workers=workers)
+    return {'iv': iv_values, 'selected': [feature for feature, iv in iv_values.items() if iv > min_iv]}
+
+
+def encode(selection, scaled):
+    """One-hot encode the selected features; the test split gets exactly the training columns"""
+    X_train = pd.get_dummies(scaled['X_train'][selection['selected']], drop_first=True)
+    X_test = pd.get_dummies(scaled['X_test'][selection['selected']], drop_first=True)
+    return {'X_train': X_train, 'X_test': X_test.reindex(columns=X_train.columns, fill_value=False)}
+
+
+def resample(encoded, scaled, method='smote_tomek', random_state=42):
+    """Balance the training classes, with SMOTETomek by default (see rebalance.rebalance for the fast paths)"""
+    X_train, y_train, balanced = rebalance(encoded['X_train'], scaled['y_train'], method, random_state)
+    return {'X_train': X_train, 'y_train': y_train, 'balanced': balanced}
+
+
+def tune(resampled, model='logistic', n_trials=50, cv=3, seed=42, prune=True, workers=None, storage=None,
+         directory=None):
+    """Optuna search by cross-validated macro F1 (see tuning.tune); resumes the study kept in storage"""
+    return tuning.tune(resampled['X_train'], resampled['y_train'], model=model, n_trials=n_trials, cv=cv,
+                       workers=workers, storage=storage, directory=directory, seed=seed, prune=prune,
+                       balanced=resampled.get('balanced', False))
+
+
+def fit(tuned, resampled, encoded, scaled):
+    """Fit the tuned model on the resampled data and evaluate it on the test split"""
+    from sklearn.metrics import classification_report, roc_auc_score
+
+    model = tuning.build_estimator(tuned.get('model', 'logistic'), tuned['params'])
+    model.fit(resampled['X_train'], resampled['y_train'])
+    probabilities = model.predict_proba(encoded['X_test'])[:, 1]
+    auc = roc_auc_score(scaled['y_test'], probabilities)
+    return {
+        'model': model,
+        'report': classification_report(scaled['y_test'], model.predict(encoded['X_test'])),
+        'auc': auc,
+        'gini': 2 * auc - 1,
+    }
+
+
+def export(fitted, encoded, scaled, output):
+    """Write model_data.joblib in the layout prediction_helper loads, plus its JSON artifact
+
+    Only a logistic model becomes the served champion: the app's reason codes and counterfactuals need
+    its folded weights. Any other model is written next to it as <name>_challenger.joblib instead, to be
+    shadow-scored with scoring_service.py --challenger.
+    """
+    model_data = {
+        'model': fitted['model'],
+        'features': encoded['X_train'].columns,
+        'scaler': scaled['scaler'],
+        'cols_to_scale': scaled['cols_to_scale'],
+        'reference': training_reference(encoded['X_train'].mean(), scaled['scaler'], scaled['cols_to_scale']),
+    }
+    champion = hasattr(fitted['model'], 'coef_')
+    if not champion:
+        output = os.path.splitext(output)[0] + '_challenger.joblib'
+    return {'joblib': output, 'champion': champion, 'sha256': save_model_data(model_data, output),
+            'auc': fitted['auc'], 'gini': fitted['gini']}
+
+
+def training_reference(means, scaler, cols_to_scale):
+    """Training-population mean of each numeric model input in raw units, keyed as the scoring kernel's inputs
+
+    means maps encoded columns to their mean over the scaled training rows. MinMax scaling is linear, so
+    a scaled mean maps back through the scaler exactly. Explanations measure contributions against it.
+    """
+    from prediction_helper import NUMERIC_FEATURES
+
+    positions = {col: i for i, col in enumerate(cols_to_scale)}
+    reference = {}
+    for col, mean in means.items():
+        if col in NUMERIC_FEATURES:
+            if col in positions:
+                mean = (mean - scaler.min_[positions[col]]) / scaler.scale_[positions[col]]
+            reference[NUMERIC_FEATURES[col]] = float(mean)
+    return reference
+
+
+def save_model_data(model_data, output):
+    """Dump model_data to output and keep its JSON artifact in step; returns the artifact's sha256"""
+    import joblib
+
+    from artifact import export_artifact, export_pickle_reference
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    # Renamed over the served file, so a watcher polling mid-write never reads half a pickle
+    tmp_path = output + '.tmp'
+    joblib.dump(model_data, tmp_path)
+    os.replace(tmp_path, output)
+    # prediction_helper serves model_data.json when it exists, so keep it in step with the pickle. Tree
+    # models have no JSON form; theirs points at the pickle and checks its hash on load
+    json_path = os.path.splitext(output)[0] + '.json'
+    if hasattr(model_data['model'], 'coef_'):
+        return export_artifact(model_data, json_path)
+    return export_pickle_reference(model_data, json_path, output)
@@ -0,0 +1,327 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_store import STORE_DIR, FeatureStore
+from train import OUTPUT_PATH
+from train.stages import (DROP_COLUMNS, LABEL_FIXES, VIF_DROP, clean_frame, derive_frame, save_model_data,
+                          training_reference)
+from train.woe import bin_codes, count_tables, width_edges, woe_table
+
+# Customers read from the store per chunk
+CHUNK_ROWS = 200000
+
+# Rows of the encoded matrix per block in each solver pass
+BLOCK_ROWS = 65536
+
+SOLVERS = ('lbfgs', 'sgd')
+
+
+def holdout_mask(rows, test_size=0.25, seed=42):
+    """Test rows picked by a hash of their row number, so the split does not depend on the chunking"""
+    # splitmix64 finalizer; uint64 arrays wrap on overflow as the hash needs
+    x = (rows.astype(np.uint64) + np.uint64(seed)) * np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(float) / 2 ** 53 < test_size
+
+
+def _splits(view, chunk_size, test_size, seed):
+    # Raw (train, test) frames of each chunk of customers
+    offset = 0
+    for df in view.iter_frames(chunk_size):
+        test = holdout_mask(np.arange(offset, offset + len(df)), test_size, seed)
+        offset += len(df)
+        df['default'] = df['default'].astype(int)
+        yield df[~test], df[test]
+
+
+def _prepared(df, mode_residence, drop_columns):
+    df = derive_frame(clean_frame(df, mode_residence), drop_columns)
+    return df.drop('default', axis='columns'), df['default'].to_numpy()
+
+
+def scan(view, chunk_size=CHUNK_ROWS, test_size=0.25, seed=42, drop_columns=DROP_COLUMNS):
+    """First pass: the MinMax scaler, category levels, residence_type mode and class counts of the training rows"""
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler()
+    residence_counts = pd.Series(dtype=float)
+    levels, class_counts = {}, np.zeros(2, dtype=np.int64)
+    cols_to_scale = missing_residence = None
+    for df_train, _ in _splits(view, chunk_size, test_size, seed):
+        # clean takes the mode over the training rows before the fee filter
+        residence_counts = residence_counts.add(df_train['residence_type'].value_counts(), fill_value=0)
+        X, y = _prepared(df_train, np.nan, drop_columns)
+        if cols_to_scale is None:
+            cols_to_scale = X.select_dtypes(['int64', 'float64']).columns
+        scaler.partial_fit(X[cols_to_scale])
+        for column in X.columns.difference(cols_to_scale, sort=False):
+            levels.setdefault(column, set()).update(X[column].dropna().unique())
+        missing_residence = missing_residence or X['residence_type'].isna().any()
+        class_counts += np.bincount(y, minlength=2)
+
+    # Labels sorted as get_dummies orders them
+    mode_residence = residence_counts.sort_index().idxmax()
+    if missing_residence:
+        levels['residence_type'].add(mode_residence)
+    return {'scaler': scaler, 'cols_to_scale': cols_to_scale, 'mode_residence': mode_residence,
+            'levels': {column: sorted(labels) for column, labels in levels.items()}, 'class_counts': class_counts}
+
+
+def _codes(X, scanned, columns, bins):
+    # Bin or category codes and level count of each column, binned on the scaled values exactly as the
+    # in-memory woe_iv stage; yielded one column at a time for count_tables
+    scaler, positions = scanned['scaler'], {col: i for i, col in enumerate(scanned['cols_to_scale'])}
+    for column in columns:
+        if column in scanned['levels']:
+            yield (pd.Categorical(X[column], categories=scanned['levels'][column]).codes.astype(np.intp),
+                   len(scanned['levels'][column]))
+        else:
+            i = positions[column]
+            lowest, highest = (np.array([scaler.data_min_[i], scaler.data_max_[i]]) * scaler.scale_[i]
+                               + scaler.min_[i])
+            yield bin_codes(X[column].to_numpy(dtype=float), width_edges(lowest, highest, bins))
+
+
+def select(view, scanned, chunk_size=CHUNK_ROWS, test_size=0.25, seed=42, drop_columns=DROP_COLUMNS, drop=VIF_DROP,
+           bins=10, min_iv=0.02):
+    """Second pass: information values from bin counts summed over chunks; keeps features above min_iv"""
+    columns = totals = None
+    for df_train, _ in _splits(view, chunk_size, test_size, seed):
+        X, y = _prepared(df_train, scanned['mode_residence'], drop_columns)
+        X[scanned['cols_to_scale']] = scanned['scaler'].transform(X[scanned['cols_to_scale']])
+        X = X.drop(drop, axis='columns')
+        columns = list(X.columns)
+        tables = count_tables(_codes(X, scanned, columns, bins), y)
+        totals = tables if totals is None else [(total + t, events + e)
+                                                for (total, events), (t, e) in zip(totals, tables)]
+    iv_values = {column: float(np.nansum(woe_table(total, events)['iv'].to_numpy()))
+                 for column, (total, events) in zip(columns, totals)}
+    return {'iv': iv_values, 'selected': [feature for feature, iv in iv_values.items() if iv > min_iv]}
+
+
+def encoded_features(selected, levels):
+    """Column names of get_dummies(drop_first=True) on the selected features: numeric ones first, then dummies"""
+    numeric = [column for column in selected if column not in levels]
+    dummies = [f'{column}_{label}' for column in selected if column in levels for label in levels[column][1:]]
+    return pd.Index(numeric + dummies)
+
+
+def _encode_frame(X, scanned, selected):
+    X = X.copy()
+    X[scanned['cols_to_scale']] = scanned['scaler'].transform(X[scanned['cols_to_scale']])
+    numeric = [column for column in selected if column not in scanned['levels']]
+    blocks = [X[numeric].to_numpy(dtype=float)]
+    for column in selected:
+        if column in scanned['levels']:
+            # Labels unseen in training (or the first, dropped one) encode as all zeros
+            codes = pd.Categorical(X[column], categories=scanned['levels'][column]).codes
+            block = np.zeros((len(X), len(scanned['levels'][column])))
+            block[codes >= 0, codes[codes >= 0]] = 1
+            blocks.append(block[:, 1:])
+    return np.hstack(blocks)
+
+
+def encode(view, scanned, selected, directory, chunk_size=CHUNK_ROWS, test_size=0.25, seed=42,
+           drop_columns=DROP_COLUMNS):
+    """Third pass: scaled, one-hot encoded train and test rows appended to raw float64 files under directory
+
+    Returns the train and test matrices and labels as read-only memmaps.
+    """
+    paths = {name: os.path.join(directory, f'{name}.bin') for name in ('X_train', 'y_train', 'X_test', 'y_test')}
+    for path in paths.values():
+        open(path, 'wb').close()
+    rows = {'train': 0, 'test': 0}
+    for frames in _splits(view, chunk_size, test_size, seed):
+        for split, df in zip(('train', 'test'), frames):
+            X, y = _prepared(df, scanned['mode_residence'], drop_columns)
+            with open(paths[f'X_{split}'], 'ab') as f:
+                f.write(_encode_frame(X, scanned, selected).tobytes())
+            with open(paths[f'y_{split}'], 'ab') as f:
+                f.write(y.astype(np.int8).tobytes())
+            rows[split] += len(y)
+
+    n_features = len(encoded_features(selected, scanned['levels']))
+    arrays = {}
+    for split in ('train', 'test'):
+        shape = (rows[split], n_features)
+        arrays[f'X_{split}'] = (np.memmap(paths[f'X_{split}'], dtype=float, mode='r', shape=shape)
+                                if rows[split] else np.empty(shape))
+        arrays[f'y_{split}'] = np.fromfile(paths[f'y_{split}'], dtype=np.int8)
+    return arrays
+
+
+def class_weights(class_counts, class_weight='balanced'):
+    """Per-class sample weights; 'balanced' as in scikit-learn, since out-of-core rows cannot be resampled"""
+    if class_weight is None:
+        return np.ones(2)
+    if class_weight == 'balanced':
+        return class_counts.sum() / (2 * np.maximum(class_counts, 1))
+    return np.array([class_weight.get(0, 1.0), class_weight.get(1, 1.0)])
+
+
+def fit_lbfgs(X, y, weights, C=1.0, max_iter=1000, tol=1e-4, block_rows=BLOCK_ROWS):
+    """L-BFGS on LogisticRegression's objective, each loss and gradient evaluation one blockwise pass over X
+
+    Minimizes the sample-weighted mean log loss plus the L2 penalty scikit-learn's lbfgs solver uses,
+    so it reaches the same optimum as LogisticRegression(C=C).fit(X, y) without loading X.
+    Returns coef, intercept and the number of iterations.
+    """
+    from scipy.optimize import minimize
+    from scipy.special import expit
+
+    n_features = X.shape[1]
+    total = weights[y].sum()
+
+    def loss_grad(params):
+        coef, intercept = params[:n_features], params[n_features]
+        loss, grad = 0.0, np.zeros(n_features + 1)
+        for start in range(0, len(y), block_rows):
+            block, labels = X[start:start + block_rows], y[start:start + block_rows]
+            sample_weight = weights[labels]
+            z = block @ coef + intercept
+            loss += sample_weight @ (np.logaddexp(0, z) - labels * z)
+            residual = sample_weight * (expit(z) - labels)
+            grad[:n_features] += block.T @ residual
+            grad[n_features] += residual.sum()
+        grad[:n_features] += coef / C
+        return (loss + coef @ coef / (2 * C)) / total, grad / total
+
+    result = minimize(loss_grad, np.zeros(n_features + 1), jac=True, method='L-BFGS-B',
+                      options={'maxiter': max_iter, 'maxls': 50, 'gtol': tol, 'ftol': 64 * np.finfo(float).eps})
+    return result.x[:n_features], result.x[n_features:], result.nit
+
+
+def fit_sgd(X, y, weights, C=1.0, epochs=5, seed=42, block_rows=BLOCK_ROWS):
+    """SGDClassifier(loss='log_loss').partial_fit over shuffled blocks of X, epochs passes in all"""
+    from sklearn.linear_model import SGDClassifier
+
+    # alpha multiplies the mean loss's penalty, 1 / C the summed loss's
+    model = SGDClassifier(loss='log_loss', alpha=1 / (C * len(y)), average=True, random_state=seed)
+    rng = np.random.default_rng(seed)
+    starts = np.arange(0, len(y), block_rows)
+    for _ in range(epochs):
+        for start in rng.permutation(starts):
+            order = rng.permutation(min(block_rows, len(y) - start))
+            block, labels = X[start:start + block_rows][order], y[start:start + block_rows][order]
+            model.partial_fit(block, labels, classes=np.array([0, 1]), sample_weight=weights[labels])
+    return model
+
+
+def _logistic_model(coef, intercept, features, C, class_weight, n_iter):
+    # A LogisticRegression in the state fit would leave it, so model_data is what the in-memory pipeline writes
+    from sklearn.linear_model import LogisticRegression
+
+    model = LogisticRegression(C=C, class_weight=class_weight)
+    model.coef_ = np.asarray(coef, dtype=float).reshape(1, -1)
+    model.intercept_ = np.asarray(intercept, dtype=float).reshape(1)
+    model.classes_ = np.array([0, 1])
+    model.n_features_in_ = len(features)
+    model.feature_names_in_ = np.asarray(features, dtype=object)
+    model.n_iter_ = np.array([n_iter])
+    return model
+
+
+def evaluate(coef, intercept, X, y, block_rows=BLOCK_ROWS):
+    """AUC and Gini of a linear model on the held-out rows, scored blockwise"""
+    from sklearn.metrics import roc_auc_score
+
+    coef = np.ravel(coef)
+    scores = np.concatenate([np.asarray(X[start:start + block_rows]) @ coef
+                             for start in range(0, len(y), block_rows)] or [np.empty(0)]) + np.ravel(intercept)[0]
+    auc = roc_auc_score(y, scores)
+    return {'auc': auc, 'gini': 2 * auc - 1}
+
+
+def train_streaming(store_dir=STORE_DIR, output=OUTPUT_PATH, solver='lbfgs', C=1.0, class_weight='balanced',
+                    features=None, min_iv=0.02, bins=10, chunk_size=CHUNK_ROWS, test_size=0.25, seed=42,
+                    max_iter=1000, tol=1e-4, epochs=5, directory=None, log=sys.stderr):
+    """Train the logistic model out of core from the columnar store and write model_data as the pipeline does
+
+    Chunks of the joined customers are cleaned and derived as in the pipeline's stages. A first pass
+    learns the MinMax scaler, category levels and class counts; a second the information values
+    (skipped when features are given); a third writes the scaled, one-hot encoded rows to disk under
+    directory (a temporary one by default). The model is then fitted by fit_lbfgs or fit_sgd from that
+    file, with class weights in place of SMOTETomek. Memory use is bounded by chunk_size and
+    block_rows, not the number of customers.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {', '.join(SOLVERS)}")
+    view = FeatureStore(store_dir).joined()
+    split_params = {'chunk_size': chunk_size, 'test_size': test_size, 'seed': seed}
+
+    def timed(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        if log:
+            print(f"{name}: {time.perf_counter() - start:.2f}s", file=log)
+        return result
+
+    scanned = timed('scan', scan, view, **split_params)
+    if features:
+        # Checked now rather than failing inside encode after two more passes over the store
+        known = list(scanned['cols_to_scale']) + list(scanned['levels'])
+        unknown = [feature for feature in features if feature not in known]
+        if unknown:
+            raise ValueError(f"Unknown features {', '.join(unknown)}; the store provides {', '.join(known)}")
+    selected = features or timed('select', select, view, scanned, min_iv=min_iv, bins=bins, **split_params)['selected']
+    feature_names = encoded_features(selected, scanned['levels'])
+    weights = class_weights(scanned['class_counts'], class_weight)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = directory or tmp_dir
+        os.makedirs(directory, exist_ok=True)
+        data = timed('encode', encode, view, scanned, selected, directory, **split_params)
+        if solver == 'lbfgs':
+            coef, intercept, n_iter = timed('fit', fit_lbfgs, data['X_train'], data['y_train'], weights, C, max_iter,
+                                            tol)
+            model = _logistic_model(coef, intercept, feature_names, C, class_weight, n_iter)
+        else:
+            model = timed('fit', fit_sgd, data['X_train'], data['y_train'], weights, C, epochs, seed)
+            n_iter = epochs
+        metrics = evaluate(model.coef_, model.intercept_, data['X_test'], data['y_test'])
+        rows = len(data['y_train'])
+        means = dict(zip(feature_names, data['X_train'].mean(axis=0).tolist())) if rows else {}
+        del data  # release the memmaps before the directory is removed
+
+    model_data = {'model': model, 'features': feature_names, 'scaler': scanned['scaler'],
+                  'cols_to_scale': scanned['cols_to_scale'],
+                  'reference': training_reference(means, scanned['scaler'], scanned['cols_to_scale'])}
+    return {'joblib': output, 'sha256': save_model_data(model_data, output), 'rows': rows, 'iterations': n_iter,
+            'features': list(feature_names), **metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m train.streaming',
+                                     description="Train the logistic model out of core from the columnar store")
+    parser.add_argument('--store', default=STORE_DIR, help="Feature store built by feature_store.py")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Where model_data.joblib is written")
+    parser.add_argument('--solver', choices=SOLVERS, default='lbfgs')
+    parser.add_argument('--C', type=float, default=1.0, help="Inverse L2 regularization strength")
+    parser.add_argument('--epochs', type=int, default=5, help="Passes over the training rows with --solver sgd")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_ROWS, help="Customers read from the store at a time")
+    parser.add_argument('--features', nargs='+', help="Features to use instead of selecting them by IV")
+    parser.add_argument('--directory', help="Keep the encoded training rows here instead of a temporary directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        result = train_streaming(args.store, args.output, solver=args.solver, C=args.C, features=args.features,
+                                 chunk_size=args.chunk_size, epochs=args.epochs, directory=args.directory)
+    except ValueError as exc:
+        parser.exit(1, f"error: {exc}\n")
+    print(f"Trained on {result['rows']:,} rows in {time.perf_counter() - start:.2f}s "
+          f"({result['iterations']} {'iterations' if args.solver == 'lbfgs' else 'epochs'})", file=sys.stderr)
+    print(f"Test AUC {result['auc']:.4f}, Gini {result['gini']:.4f}")
+    print(f"Wrote {result['joblib']}" + (f" (JSON artifact sha256 {result['sha256']})" if result['sha256'] else ''))
+
+
+if __name__ == '__main__':
+    main()
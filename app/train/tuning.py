@@ -0,0 +1,243 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Models with a search space, as tuned in the notebook
+MODELS = ('logistic', 'xgboost')
+
+# Trial states that count towards n_trials; trials a killed run left RUNNING never finish
+FINISHED_STATES = ('COMPLETE', 'PRUNED')
+
+
+def logistic_params(trial, fixed=None):
+    # Parameters in fixed are not searched
+    params = {
+        'C': trial.suggest_float('C', 1e-4, 1e4, log=True),
+        'solver': trial.suggest_categorical('solver', ['lbfgs', 'liblinear', 'saga', 'newton-cg']),
+        'tol': trial.suggest_float('tol', 1e-6, 1e-1, log=True),
+    }
+    if 'class_weight' not in (fixed or {}):
+        params['class_weight'] = trial.suggest_categorical('class_weight', [None, 'balanced'])
+    return {**params, **(fixed or {})}
+
+
+def xgboost_params(trial, fixed=None):
+    params = {
+        'lambda': trial.suggest_float('lambda', 1e-3, 10.0, log=True),
+        'alpha': trial.suggest_float('alpha', 1e-3, 10.0, log=True),
+        'subsample': trial.suggest_float('subsample', 0.4, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.4, 1.0),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'eta': trial.suggest_float('eta', 0.01, 0.3),
+        'gamma': trial.suggest_float('gamma', 0, 10),
+        'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
+        'max_delta_step': trial.suggest_int('max_delta_step', 0, 10),
+    }
+    if 'scale_pos_weight' not in (fixed or {}):
+        params['scale_pos_weight'] = trial.suggest_float('scale_pos_weight', 1, 10)
+    return {**params, **(fixed or {})}
+
+
+def balanced_params(model, y):
+    """Parameters weighting the classes of y equally, in place of resampling them"""
+    y = np.asarray(y)
+    if model == 'logistic':
+        return {'class_weight': 'balanced'}
+    return {'scale_pos_weight': float((y == 0).sum() / max((y == 1).sum(), 1))}
+
+
+def build_estimator(model, params, search=False):
+    """Estimator for a model name and tuned parameters; search=True adds the settings used while tuning"""
+    if model == 'logistic':
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(**params, **({'max_iter': 10000} if search else {}))
+    if model == 'xgboost':
+        from xgboost import XGBClassifier
+
+        # One thread per trial: trials, not boosting rounds, are spread over the cores
+        return XGBClassifier(objective='binary:logistic', eval_metric='logloss', verbosity=0, booster='gbtree',
+                             **params, **({'n_jobs': 1} if search else {}))
+    raise ValueError(f"Unknown model {model!r}, expected one of {', '.join(MODELS)}")
+
+
+class FoldData:
+    """Training data laid out on disk so every cross-validation split is a contiguous memmap slice
+
+    Rows are written grouped by StratifiedKFold test fold, followed by a second copy of all but the
+    last fold. Fold k's test rows are then rows[start_k:end_k] and its training rows the next
+    n - n_k rows, both zero-copy views of one file that every worker maps instead of receiving or
+    copying its own data.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'folds.json')) as f:
+            self.bounds = json.load(f)['bounds']
+        self.X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+        self.y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
+
+    @classmethod
+    def write(cls, X, y, directory, cv=3):
+        """Write X, y for cv folds under directory (named by content, so reruns reuse it)"""
+        from sklearn.model_selection import StratifiedKFold
+
+        X = np.ascontiguousarray(X, dtype=float)
+        y = np.ascontiguousarray(y)
+        # Hashed through the buffer: tobytes() would make a full copy of X just to name the directory
+        digest = hashlib.sha256(memoryview(X).cast('B'))
+        digest.update(memoryview(y).cast('B'))
+        digest.update(str(cv).encode())
+        directory = os.path.join(directory, digest.hexdigest()[:16])
+        if os.path.exists(os.path.join(directory, 'folds.json')):
+            return cls(directory)
+
+        # Same folds as cross_val_score(cv=cv) on a classifier
+        folds = [test for _, test in StratifiedKFold(n_splits=cv).split(X, y)]
+        order = np.concatenate(folds + folds[:-1])
+        bounds = np.concatenate([[0], np.cumsum([len(test) for test in folds])]).tolist()
+        os.makedirs(directory, exist_ok=True)
+        for name, values in (('X', X), ('y', y)):
+            out = np.lib.format.open_memmap(os.path.join(directory, name + '.npy'), mode='w+', dtype=values.dtype,
+                                            shape=(len(order),) + values.shape[1:])
+            for start in range(0, len(order), 65536):
+                out[start:start + 65536] = values[order[start:start + 65536]]
+            out.flush()
+            del out
+        # Written last: its presence marks the arrays as complete
+        with open(os.path.join(directory, 'folds.json'), 'w') as f:
+            json.dump({'bounds': bounds, 'rows': len(X)}, f)
+        return cls(directory)
+
+    def split(self, fold):
+        start, end = self.bounds[fold], self.bounds[fold + 1]
+        n_rows = self.bounds[-1]
+        train = slice(end, end + n_rows - (end - start))
+        return self.X[train], self.y[train], self.X[start:end], self.y[start:end]
+
+    @property
+    def n_folds(self):
+        return len(self.bounds) - 1
+
+
+def _objective(trial, model, data, fixed):
+    import optuna
+    from sklearn.metrics import f1_score
+
+    params = (logistic_params if model == 'logistic' else xgboost_params)(trial, fixed)
+    scores = []
+    for fold in range(data.n_folds):
+        X_train, y_train, X_test, y_test = data.split(fold)
+        estimator = build_estimator(model, params, search=True).fit(X_train, y_train)
+        scores.append(f1_score(y_test, estimator.predict(X_test), average='macro'))
+        # Intermediate score after each fold lets the pruner stop trials that are already behind
+        trial.report(float(np.mean(scores)), fold)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+    return float(np.mean(scores))
+
+
+def _run_worker(model, data_dir, storage, study_name, n_trials, seed, prune, fixed):
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    data = FoldData(data_dir)
+    study = optuna.load_study(study_name=study_name, storage=study_storage(storage),
+                              sampler=optuna.samplers.TPESampler(seed=seed), pruner=_pruner(prune))
+    states = _finished_states()
+    if len(study.get_trials(deepcopy=False, states=states)) >= n_trials:
+        return
+    # Stops every worker once the study as a whole, including earlier runs, has n_trials finished trials
+    done = optuna.study.MaxTrialsCallback(n_trials, states=states)
+    study.optimize(lambda trial: _objective(trial, model, data, fixed), callbacks=[done])
+
+
+def _finished_states():
+    import optuna
+
+    return tuple(optuna.trial.TrialState[state] for state in FINISHED_STATES)
+
+
+def _fail_stale_trials(storage, study_name):
+    # Called before any worker starts, so every RUNNING trial was left behind by a killed run
+    import optuna
+
+    study_id = storage.get_study_id_from_name(study_name)
+    for trial in storage.get_all_trials(study_id, deepcopy=False, states=(optuna.trial.TrialState.RUNNING,)):
+        trial_id = storage.get_trial_id_from_study_id_trial_number(study_id, trial.number)
+        storage.set_trial_state_values(trial_id, state=optuna.trial.TrialState.FAIL)
+
+
+def _pruner(prune):
+    import optuna
+
+    return optuna.pruners.MedianPruner(n_startup_trials=5) if prune else optuna.pruners.NopPruner()
+
+
+def study_storage(path):
+    """Optuna storage in the SQLite file at path, set up for several local worker processes"""
+    import sqlite3
+
+    import optuna
+
+    path = os.path.abspath(path)
+
+    def connect():
+        # Writers queue on the lock instead of failing; WAL lets readers proceed meanwhile, and
+        # synchronous=NORMAL skips the fsync per commit that otherwise dominates short trials
+        connection = sqlite3.connect(path, timeout=60)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    return optuna.storages.RDBStorage(f'sqlite:///{path}', engine_kwargs={'creator': connect})
+
+
+def tune(X, y, model='logistic', n_trials=50, cv=3, workers=None, storage=None, directory=None, seed=42,
+         prune=True, study_name=None, balanced=False):
+    """Optuna search of model on X, y by cross-validated macro F1, resumable and spread over processes
+
+    The study lives in the SQLite file storage; a study of the same name there is resumed and only
+    the missing trials are run. Trials a killed run left unfinished are marked failed and rerun.
+    Each of the workers processes runs trials against the shared study and one FoldData copy of
+    X, y under directory. Unpromising trials are pruned after their first folds with a median rule
+    unless prune is False. With balanced, class weights are fixed to balance the classes (for data
+    that was not resampled) instead of searched. Returns the best parameters and score with trial
+    counts.
+    """
+    import tempfile
+
+    import optuna
+
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}, expected one of {', '.join(MODELS)}")
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = directory or tmp_dir
+        storage = storage or os.path.join(directory, 'optuna.db')
+        os.makedirs(os.path.dirname(os.path.abspath(storage)), exist_ok=True)
+        data = FoldData.write(X, y, directory, cv)
+        fixed = balanced_params(model, y) if balanced else {}
+        study_name = study_name or f"{model}{'-balanced' if balanced else ''}-{os.path.basename(data.directory)}"
+        study_db = study_storage(storage)
+        optuna.create_study(study_name=study_name, storage=study_db, direction='maximize', load_if_exists=True)
+        _fail_stale_trials(study_db, study_name)
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _run_worker(model, data.directory, storage, study_name, n_trials, seed, prune, fixed)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                futures = [pool.submit(_run_worker, model, data.directory, storage, study_name, n_trials, seed + i,
+                                       prune, fixed) for i in range(workers)]
+                for future in futures:
+                    future.result()
+
+        study = optuna.load_study(study_name=study_name, storage=study_storage(storage))
+        states = [trial.state for trial in study.trials]
+        return {'model': model, 'params': {**study.best_params, **fixed}, 'f1_macro': study.best_value,
+                'complete': states.count(optuna.trial.TrialState.COMPLETE),
+                'pruned': states.count(optuna.trial.TrialState.PRUNED)}
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Rows per block when accumulating the cross-product matrix, bounding the temporary copies
+CHUNK_ROWS = 262144
+
+# Added to the diagonal when the correlation matrix is exactly singular, so perfectly collinear
+# columns come out with huge rather than undefined VIFs
+SINGULAR_RIDGE = 1e-12
+
+# Downdating the inverse after dropping a near-singular column cancels catastrophically; past this
+# VIF the inverse of the remaining columns is recomputed instead
+REFRESH_VIF = 1e6
+
+
+def correlation_matrix(X, centered=True, chunk_rows=CHUNK_ROWS):
+    """Correlation matrix of the columns of X, accumulated block by block from X'X
+
+    With centered=False the columns are not demeaned, giving the cosine similarities implied by
+    statsmodels' variance_inflation_factor on raw columns without a constant, which is how the
+    notebook called it (statsmodels before 0.15 did not standardize). Returns the matrix over
+    columns with a nonzero norm after centering and the mask of those columns.
+    """
+    values = np.asarray(X, dtype=float)
+    means = values.mean(axis=0) if centered else np.zeros(values.shape[1])
+    gram = np.zeros((values.shape[1], values.shape[1]))
+    for start in range(0, len(values), chunk_rows):
+        block = values[start:start + chunk_rows] - means
+        gram += block.T @ block
+    norms = np.sqrt(np.diag(gram))
+    varying = norms > 0
+    gram = gram[np.ix_(varying, varying)]
+    return gram / np.outer(norms[varying], norms[varying]), varying
+
+
+def _inverse(matrix):
+    try:
+        return np.linalg.inv(matrix)
+    except np.linalg.LinAlgError:
+        return np.linalg.inv(matrix + SINGULAR_RIDGE * np.eye(len(matrix)))
+
+
+def variance_inflation(X, centered=True):
+    """VIF of every column of X at once: the diagonal of the inverse correlation matrix
+
+    centered=True gives the textbook VIF (current statsmodels' default); centered=False reproduces
+    the notebook's calculate_vif. Columns with no norm get an infinite VIF: constant columns when
+    centered, only all-zero ones when not (a nonzero constant column then has a finite VIF).
+    """
+    correlation, varying = correlation_matrix(X, centered)
+    vif = np.full(len(varying), np.inf)
+    vif[varying] = np.diag(_inverse(correlation))
+    return pd.Series(vif, index=X.columns, name='VIF')
+
+
+def drop_collinear(X, threshold=10.0, centered=True):
+    """Repeatedly drop the column with the highest VIF until every VIF is at most threshold
+
+    Returns the VIFs of the kept columns and the dropped columns with the VIF they had when dropped,
+    in drop order. Columns with no norm (constant when centered, all-zero when not) are dropped
+    first, with an infinite VIF.
+    """
+    correlation, varying = correlation_matrix(X, centered)
+    # Zero-norm columns carry no information and have no defined VIF; they go first
+    kept, dropped = eliminate(correlation, list(X.columns[varying]), threshold)
+    return kept, [(column, np.inf) for column in X.columns[~varying]] + dropped
+
+
+def eliminate(correlation, columns, threshold=10.0):
+    """drop_collinear on an already computed correlation matrix of columns
+
+    The inverse correlation matrix is computed once and then downdated as each column is removed
+    (the inverse of a principal submatrix follows from a rank-one update of the full inverse), so
+    each drop costs O(k^2) rather than another inversion.
+    """
+    columns = list(columns)
+    dropped = []
+    remaining = np.arange(len(columns))
+    inverse = _inverse(correlation)
+
+    while columns:
+        vif = np.diag(inverse)
+        worst = int(vif.argmax())
+        if vif[worst] <= threshold:
+            break
+        dropped.append((columns.pop(worst), float(vif[worst])))
+        keep = np.arange(len(vif)) != worst
+        remaining = remaining[keep]
+        if vif[worst] > REFRESH_VIF:
+            inverse = _inverse(correlation[np.ix_(remaining, remaining)])
+        else:
+            pivot = inverse[keep, worst]
+            inverse = inverse[np.ix_(keep, keep)] - np.outer(pivot, pivot) / inverse[worst, worst]
+
+    return pd.Series(np.diag(inverse), index=columns, name='VIF'), dropped